@@ -0,0 +1,190 @@
+from __future__ import annotations
+
+import json
+import os
+import re
+import warnings
+from collections import deque
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+DEFAULT_QUERY_DICTIONARY_PATH = (
+    Path(__file__).resolve().parents[1] / "data" / "query_dictionaries.json"
+)
+QUERY_DICTIONARY_PATH = os.getenv(
+    "QUERY_DICTIONARY_PATH", str(DEFAULT_QUERY_DICTIONARY_PATH)
+)
+
+try:
+    QUERY_ANALYSIS_CACHE_SIZE = max(0, int(os.getenv("QUERY_ANALYSIS_CACHE_SIZE", "4096")))
+except ValueError:
+    warnings.warn("Invalid QUERY_ANALYSIS_CACHE_SIZE provided; falling back to 4096.")
+    QUERY_ANALYSIS_CACHE_SIZE = 4096
+
+WORD_RE = re.compile(r"\w")
+
+
+@dataclass(frozen=True)
+class QueryDictionaries:
+    """Synonym expansions and jurisdiction aliases, in file order."""
+
+    synonyms: Dict[str, List[str]]
+    jurisdictions: Dict[str, List[str]]
+
+
+@lru_cache(maxsize=None)
+def load_query_dictionaries(path: str = QUERY_DICTIONARY_PATH) -> QueryDictionaries:
+    with open(path, "r", encoding="utf-8") as fh:
+        raw = json.load(fh)
+
+    def section(name: str) -> Dict[str, List[str]]:
+        entries = raw.get(name) or {}
+        if not isinstance(entries, dict):
+            raise ValueError(f"{path}: '{name}' must map terms to lists of strings.")
+        return {str(key).lower(): [str(value) for value in values] for key, values in entries.items()}
+
+    return QueryDictionaries(synonyms=section("synonyms"), jurisdictions=section("jurisdictions"))
+
+
+class PatternMatcher:
+    """Aho–Corasick automaton reporting every pattern that occurs in a text.
+
+    Matching is plain substring search (like ``pattern in text``), so the cost
+    per text is linear in its length however many patterns are loaded.
+    """
+
+    def __init__(self, patterns: Iterable[str]) -> None:
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[Tuple[str, ...]] = [()]
+        for pattern in patterns:
+            if pattern:
+                self._add(pattern)
+        self._link()
+
+    def _add(self, pattern: str) -> None:
+        state = 0
+        for char in pattern:
+            following = self._goto[state].get(char)
+            if following is None:
+                following = len(self._goto)
+                self._goto[state][char] = following
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append(())
+            state = following
+        if pattern not in self._output[state]:
+            self._output[state] += (pattern,)
+
+    def _link(self) -> None:
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, following in self._goto[state].items():
+                queue.append(following)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                link = self._goto[fallback].get(char, 0)
+                self._fail[following] = link if link != following else 0
+                self._output[following] += self._output[self._fail[following]]
+
+    def find(self, text: str) -> frozenset:
+        """Distinct patterns occurring anywhere in ``text``."""
+        found = set()
+        state = 0
+        for char in text:
+            while state and char not in self._goto[state]:
+                state = self._fail[state]
+            state = self._goto[state].get(char, 0)
+            if self._output[state]:
+                found.update(self._output[state])
+        return frozenset(found)
+
+
+class QueryAnalyzer:
+    """Dictionaries compiled once into a single matcher over synonyms and aliases."""
+
+    def __init__(self, dictionaries: QueryDictionaries) -> None:
+        self.synonyms = dictionaries.synonyms
+        self.jurisdictions = dictionaries.jurisdictions
+        # Dictionary order decides ties, as in the original loops.
+        self._synonym_order = {phrase: index for index, phrase in enumerate(self.synonyms)}
+        self._alias_owner: Dict[str, str] = {}
+        self._jurisdiction_order = {key: index for index, key in enumerate(self.jurisdictions)}
+        for key, aliases in self.jurisdictions.items():
+            for alias in aliases:
+                self._alias_owner.setdefault(alias.lower(), key)
+        self.matcher = PatternMatcher(list(self.synonyms) + list(self._alias_owner))
+
+    def analyze(self, query: str) -> "AnalyzedQuery":
+        query = query or ""
+        normalized = query.lower()
+        matches = self.matcher.find(normalized)
+
+        tokens = query.split()
+        # Pure punctuation tokens produce empty tsqueries, so drop them up front.
+        base_terms = tuple(term for term in tokens if WORD_RE.search(term))
+        lowered = {term.lower() for term in base_terms}
+        term_groups: List[Tuple[str, ...]] = [
+            (term, *self.synonyms.get(term.lower(), ())) for term in base_terms
+        ]
+        if base_terms:
+            # Phrase-level expansions, unless the phrase was an explicit token.
+            phrases = sorted(
+                (match for match in matches if match in self._synonym_order and match not in lowered),
+                key=self._synonym_order.__getitem__,
+            )
+            term_groups.extend(tuple(self.synonyms[phrase]) for phrase in phrases)
+
+        owners = {self._alias_owner[match] for match in matches if match in self._alias_owner}
+        jurisdiction = min(owners, key=self._jurisdiction_order.__getitem__) if owners else None
+
+        return AnalyzedQuery(
+            text=query,
+            normalized=normalized,
+            base_terms=base_terms,
+            term_groups=tuple(term_groups),
+            phrase=" ".join(tokens) if len(tokens) >= 2 else None,
+            jurisdiction=jurisdiction,
+        )
+
+
+@dataclass(frozen=True)
+class AnalyzedQuery:
+    """Everything the rankers and the booster derive from the raw query text."""
+
+    text: str
+    normalized: str
+    base_terms: Tuple[str, ...]
+    # Keyword groups: each base term with its synonyms, then phrase expansions.
+    term_groups: Tuple[Tuple[str, ...], ...]
+    # Whitespace-collapsed query for phrase search; None for single words.
+    phrase: Optional[str]
+    # Canonical jurisdiction named in the query, used by the ranking boost.
+    jurisdiction: Optional[str]
+
+
+@lru_cache(maxsize=1)
+def get_query_analyzer() -> QueryAnalyzer:
+    return QueryAnalyzer(load_query_dictionaries())
+
+
+@lru_cache(maxsize=QUERY_ANALYSIS_CACHE_SIZE)
+def analyze_query(query: str) -> AnalyzedQuery:
+    """Memoised analysis shared by every ranker and the booster of a request."""
+    return get_query_analyzer().analyze(query)
+
+
+def build_analyzer(
+    synonyms: Mapping[str, Sequence[str]], jurisdictions: Mapping[str, Sequence[str]]
+) -> QueryAnalyzer:
+    """Analyzer over in-memory dictionaries (tests, benchmarks)."""
+    return QueryAnalyzer(
+        QueryDictionaries(
+            synonyms={key.lower(): list(values) for key, values in synonyms.items()},
+            jurisdictions={key.lower(): list(values) for key, values in jurisdictions.items()},
+        )
+    )
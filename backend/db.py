@@ -1,12 +1,19 @@
 from __future__ import annotations
 
 import os
+import re
 import warnings
-from contextlib import contextmanager
+from contextlib import asynccontextmanager, contextmanager
+from typing import Any, AsyncIterator, Callable, Optional
 
 from dotenv import load_dotenv
 from sqlalchemy import create_engine, text
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import NullPool
+
+from .jurisdictions import jurisdiction_keys
+from .utils.text_clean import build_snippet
 
 
 load_dotenv()
@@ -42,12 +49,221 @@ if PGVECTOR_METRIC not in SUPPORTED_METRICS:
     )
     PGVECTOR_METRIC = "cosine"
 
-engine = create_engine(DB_URL, future=True, pool_pre_ping=True)
+SUPPORTED_VECTOR_INDEXES = {"hnsw", "ivfflat", "none"}
+# ANN index storage: full float32 ``vector`` or a half-precision ``halfvec``
+# expression index over the same column (rows stay float32 for rescoring).
+SUPPORTED_VECTOR_STORAGE = {"vector", "halfvec"}
+
+
+def _env_int(name: str, default: int, minimum: int = 1) -> int:
+    try:
+        value = int(os.getenv(name, str(default)))
+        if value < minimum:
+            raise ValueError
+        return value
+    except ValueError:
+        warnings.warn(f"Invalid {name} provided; falling back to {default}.")
+        return default
+
+
+def _env_flag(name: str, default: bool = False) -> bool:
+    return os.getenv(name, "1" if default else "0").strip().lower() in {"1", "true", "yes", "on"}
+
+
+PGVECTOR_INDEX = os.getenv("PGVECTOR_INDEX", "hnsw").lower()
+if PGVECTOR_INDEX not in SUPPORTED_VECTOR_INDEXES:
+    warnings.warn(
+        f"Unsupported PGVECTOR_INDEX '{PGVECTOR_INDEX}', defaulting to 'hnsw'."
+    )
+    PGVECTOR_INDEX = "hnsw"
+
+PGVECTOR_HNSW_M = _env_int("PGVECTOR_HNSW_M", 16)
+PGVECTOR_HNSW_EF_CONSTRUCTION = _env_int("PGVECTOR_HNSW_EF_CONSTRUCTION", 64)
+# IVFFlat centroids are trained at build time, so ensure_vector_index only
+# builds it once the table has embeddings and seed_loader rebuilds it.
+PGVECTOR_IVFFLAT_LISTS = _env_int("PGVECTOR_IVFFLAT_LISTS", 100)
+
+PGVECTOR_STORAGE = os.getenv("PGVECTOR_STORAGE", "vector").lower()
+if PGVECTOR_STORAGE not in SUPPORTED_VECTOR_STORAGE:
+    warnings.warn(
+        f"Unsupported PGVECTOR_STORAGE '{PGVECTOR_STORAGE}', defaulting to 'vector'."
+    )
+    PGVECTOR_STORAGE = "vector"
+
+# Quantized first stages shortlist ``k * VECTOR_RESCORE_FACTOR`` rows, which
+# are then rescored against the float32 embeddings.
+VECTOR_RESCORE_FACTOR = _env_int("VECTOR_RESCORE_FACTOR", 4)
+
+# Connection pooling, shared by the sync and async engines (each process, and
+# each engine, gets its own pool). Behind pgbouncer set DB_PGBOUNCER=1: the
+# bouncer does the pooling, so connections are not held here, and psycopg's
+# named prepared statements are off unless DB_PREPARE_THRESHOLD says otherwise
+# (pgbouncer >= 1.21 with max_prepared_statements can serve them).
+DB_PGBOUNCER = _env_flag("DB_PGBOUNCER")
+DB_POOL_SIZE = _env_int("DB_POOL_SIZE", 10)
+DB_MAX_OVERFLOW = _env_int("DB_MAX_OVERFLOW", 10, minimum=0)
+DB_POOL_TIMEOUT = _env_int("DB_POOL_TIMEOUT", 30)
+# Recycle before server / bouncer idle timeouts close connections (-1 = never).
+DB_POOL_RECYCLE = _env_int("DB_POOL_RECYCLE", 1800, minimum=-1)
+DB_POOL_PRE_PING = _env_flag("DB_POOL_PRE_PING", default=True)
+
+# psycopg prepares a statement server-side once the same SQL text has run this
+# many times on a connection, so repeated searches skip parse and planning.
+# 0 prepares on first use; "none" disables server-side preparation.
+_prepare_threshold_raw = os.getenv(
+    "DB_PREPARE_THRESHOLD", "none" if DB_PGBOUNCER else "2"
+).strip().lower()
+try:
+    DB_PREPARE_THRESHOLD: Optional[int] = (
+        None if _prepare_threshold_raw == "none" else max(0, int(_prepare_threshold_raw))
+    )
+except ValueError:
+    warnings.warn("Invalid DB_PREPARE_THRESHOLD provided; falling back to 2.")
+    DB_PREPARE_THRESHOLD = 2
+
+
+def engine_options(prepare_threshold: Optional[int] = DB_PREPARE_THRESHOLD) -> dict:
+    """Keyword arguments for ``create_engine`` / ``create_async_engine``."""
+    options: dict = {"connect_args": {"prepare_threshold": prepare_threshold}}
+    if DB_PGBOUNCER:
+        options["poolclass"] = NullPool
+        return options
+    options.update(
+        pool_size=DB_POOL_SIZE,
+        max_overflow=DB_MAX_OVERFLOW,
+        pool_timeout=DB_POOL_TIMEOUT,
+        pool_recycle=DB_POOL_RECYCLE,
+        pool_pre_ping=DB_POOL_PRE_PING,
+    )
+    return options
+
+
+# Text search configuration used for the weighted ``search_tsv`` column. The
+# corpus mixes Arabic and English, so the language-neutral ``simple`` parser is
+# the default. The value is baked into a generated column, so changing it only
+# affects tables created afterwards.
+PG_TS_CONFIG = os.getenv("PG_TS_CONFIG", "simple").lower()
+if not re.fullmatch(r"[a-z_]+", PG_TS_CONFIG):
+    warnings.warn(
+        f"Invalid PG_TS_CONFIG '{PG_TS_CONFIG}', defaulting to 'simple'."
+    )
+    PG_TS_CONFIG = "simple"
+
+# Half-open [effective_from, effective_to) period; NULL effective_to is open-ended.
+# An effective_to before effective_from (legacy rows) yields an empty period
+# instead of making daterange() fail the whole ADD COLUMN.
+EFFECTIVE_PERIOD_EXPRESSION = (
+    "daterange(effective_from, "
+    "CASE WHEN effective_to < effective_from THEN effective_from ELSE effective_to END, '[)')"
+)
+
+SEARCH_TSV_EXPRESSION = (
+    f"setweight(to_tsvector('{PG_TS_CONFIG}'::regconfig, coalesce(title, '')), 'A') || "
+    f"setweight(to_tsvector('{PG_TS_CONFIG}'::regconfig, coalesce(path, '')), 'B') || "
+    f"setweight(to_tsvector('{PG_TS_CONFIG}'::regconfig, coalesce(text_content, '')), 'C')"
+)
+
+
+def vector_index_name(
+    index: Optional[str] = None, storage: Optional[str] = None, metric: Optional[str] = None
+) -> str:
+    """Index name encoding everything baked into it, so a config change builds a new one.
+
+    That includes the build parameters (``m`` / ``ef_construction`` for HNSW,
+    ``lists`` for IVFFlat): ``CREATE INDEX IF NOT EXISTS`` would otherwise keep
+    an index built with the old ones.
+    """
+    index = index or PGVECTOR_INDEX
+    storage = storage or PGVECTOR_STORAGE
+    metric = metric or PGVECTOR_METRIC
+    params = ""
+    if index == "hnsw":
+        params = f"_m{PGVECTOR_HNSW_M}_ef{PGVECTOR_HNSW_EF_CONSTRUCTION}"
+    elif index == "ivfflat":
+        params = f"_lists{PGVECTOR_IVFFLAT_LISTS}"
+    suffix = "_halfvec" if storage == "halfvec" else ""
+    return f"idx_vector_embedding_{index}_{metric}{params}{suffix}"
+
+
+def vector_index_ddl(
+    index: Optional[str] = None, storage: Optional[str] = None, metric: Optional[str] = None
+) -> str:
+    """ANN index statement for ``legal_slice.vector_embedding`` (may be empty)."""
+    index = index or PGVECTOR_INDEX
+    storage = storage or PGVECTOR_STORAGE
+    metric = metric or PGVECTOR_METRIC
+    opclass = SUPPORTED_METRICS[metric]
+    column = "vector_embedding"
+    if storage == "halfvec":
+        opclass = opclass.replace("vector_", "halfvec_", 1)
+        column = f"(vector_embedding::halfvec({PGVECTOR_DIM}))"
+    name = vector_index_name(index, storage, metric)
+    if index == "hnsw":
+        return (
+            f"CREATE INDEX IF NOT EXISTS {name} ON legal_slice "
+            f"USING hnsw ({column} {opclass}) "
+            f"WITH (m = {PGVECTOR_HNSW_M}, ef_construction = {PGVECTOR_HNSW_EF_CONSTRUCTION});"
+        )
+    if index == "ivfflat":
+        return (
+            f"CREATE INDEX IF NOT EXISTS {name} ON legal_slice "
+            f"USING ivfflat ({column} {opclass}) "
+            f"WITH (lists = {PGVECTOR_IVFFLAT_LISTS});"
+        )
+    return ""
+
+
+def ensure_vector_index(conn, rebuild: bool = False) -> None:
+    """Create the configured ANN index and drop ones built for another config.
+
+    HNSW needs no training and is created right away. IVFFlat trains its
+    centroids on the rows present at build time, so it is only created once
+    the table holds embeddings, and ``rebuild`` (passed by ``seed_loader``
+    after writing vectors) re-trains an existing one with ``REINDEX``.
+    """
+    wanted = vector_index_name() if PGVECTOR_INDEX != "none" else None
+    existing = set(
+        conn.execute(
+            text(
+                "SELECT indexname FROM pg_indexes "
+                "WHERE tablename = 'legal_slice' AND indexname LIKE 'idx\\_vector\\_embedding\\_%'"
+            )
+        ).scalars()
+    )
+    for name in sorted(existing - {wanted}):
+        conn.execute(text(f"DROP INDEX IF EXISTS {name}"))
+    if wanted is None:
+        return
+    if PGVECTOR_INDEX == "ivfflat":
+        if wanted in existing:
+            if rebuild:
+                conn.execute(text(f"REINDEX INDEX {wanted}"))
+            return
+        has_vectors = conn.execute(
+            text("SELECT EXISTS (SELECT 1 FROM legal_slice WHERE vector_embedding IS NOT NULL)")
+        ).scalar()
+        if not has_vectors:
+            return
+    conn.execute(text(vector_index_ddl()))
+
+
+engine = create_engine(DB_URL, future=True, **engine_options())
 SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False, future=True)
 
+# The API request path runs on psycopg's async driver, so a slow query parks a
+# coroutine instead of a threadpool worker. DDL, seeding and scripts keep the
+# sync engine above.
+async_engine = create_async_engine(DB_URL, **engine_options())
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine, autoflush=False, expire_on_commit=False
+)
+
 DATABASE_DDL = f"""
 CREATE EXTENSION IF NOT EXISTS vector;
 
+-- Lets GiST index slice ids next to validity ranges.
+CREATE EXTENSION IF NOT EXISTS btree_gist;
+
 CREATE TABLE IF NOT EXISTS legal_slice (
   id TEXT PRIMARY KEY,
   level TEXT NOT NULL,
@@ -79,21 +295,170 @@ CREATE TABLE IF NOT EXISTS legal_slice (
   state TEXT NOT NULL,
   effective_from DATE NOT NULL,
   effective_to DATE,
-  vector_embedding vector({PGVECTOR_DIM})
+  vector_embedding vector({PGVECTOR_DIM}),
+  search_tsv tsvector GENERATED ALWAYS AS ({SEARCH_TSV_EXPRESSION}) STORED,
+  jurisdiction_keys TEXT[] NOT NULL DEFAULT '{{}}',
+  effective_period daterange GENERATED ALWAYS AS ({EFFECTIVE_PERIOD_EXPRESSION}) STORED,
+  snippet TEXT,
+  row_fingerprint TEXT
 );
 
+-- Upgrade path for tables created before the full-text column existed.
+ALTER TABLE legal_slice ADD COLUMN IF NOT EXISTS search_tsv tsvector
+  GENERATED ALWAYS AS ({SEARCH_TSV_EXPRESSION}) STORED;
+
+-- Lowercased level/name/emirate/freezone plus canonical aliases, written at
+-- ingest (see jurisdictions.jurisdiction_keys); init_db backfills old rows once.
+ALTER TABLE legal_slice ADD COLUMN IF NOT EXISTS jurisdiction_keys TEXT[] NOT NULL DEFAULT '{{}}';
+
+ALTER TABLE legal_slice ADD COLUMN IF NOT EXISTS effective_period daterange
+  GENERATED ALWAYS AS ({EFFECTIVE_PERIOD_EXPRESSION}) STORED;
+
+-- Citation snippet cut at ingest (utils.text_clean.build_snippet), so /search
+-- never reads text_content; init_db backfills old rows once.
+ALTER TABLE legal_slice ADD COLUMN IF NOT EXISTS snippet TEXT;
+
+-- Hash of everything seed_loader writes for a slice except the vector, so a
+-- metadata-only change is detected even when text_hash is unchanged.
+ALTER TABLE legal_slice ADD COLUMN IF NOT EXISTS row_fingerprint TEXT;
+
 CREATE INDEX IF NOT EXISTS idx_jurisdiction ON legal_slice(level, name, emirate, freezone);
 CREATE INDEX IF NOT EXISTS idx_state ON legal_slice(state);
 CREATE INDEX IF NOT EXISTS idx_topics ON legal_slice USING GIN (topics);
 CREATE INDEX IF NOT EXISTS idx_effective ON legal_slice (effective_from, effective_to);
+CREATE INDEX IF NOT EXISTS idx_search_tsv ON legal_slice USING GIN (search_tsv);
+CREATE INDEX IF NOT EXISTS idx_jurisdiction_keys ON legal_slice USING GIN (jurisdiction_keys);
+CREATE INDEX IF NOT EXISTS idx_effective_period ON legal_slice USING GIST (effective_period);
+
+-- Point-in-time history of a slice; valid_period runs from one version's date
+-- to the next (the last one is bounded by the slice's effective_to).
+CREATE TABLE IF NOT EXISTS legal_slice_version (
+  slice_id TEXT NOT NULL REFERENCES legal_slice(id) ON DELETE CASCADE,
+  version_id TEXT NOT NULL,
+  event TEXT NOT NULL,
+  event_date DATE NOT NULL,
+  by_instrument TEXT,
+  by_url TEXT,
+  valid_period daterange NOT NULL,
+  PRIMARY KEY (slice_id, version_id)
+);
+
+CREATE INDEX IF NOT EXISTS idx_slice_version_period
+  ON legal_slice_version USING GIST (slice_id, valid_period);
+
+-- One-off data migrations already applied (see run_once).
+CREATE TABLE IF NOT EXISTS schema_migration (
+  name TEXT PRIMARY KEY,
+  applied_at TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+
+CREATE TABLE IF NOT EXISTS corpus_version (
+  id SMALLINT PRIMARY KEY DEFAULT 1 CHECK (id = 1),
+  version BIGINT NOT NULL DEFAULT 0,
+  updated_at TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+
+INSERT INTO corpus_version (id, version) VALUES (1, 0) ON CONFLICT (id) DO NOTHING;
 """
 
 
 def init_db() -> None:
     """Run the mandatory DDL ahead of serving traffic."""
     with engine.begin() as conn:
-        for statement in filter(None, DATABASE_DDL.strip().split(";\n\n")):
+        for statement in filter(None, DATABASE_DDL.strip().rstrip(";").split(";\n\n")):
             conn.execute(text(statement + ";"))
+        ensure_vector_index(conn)
+        # Rows written since these columns exist get them at ingest (ORM
+        # defaults, seed_loader), so the full-table backfills run only once.
+        run_once(conn, "backfill_jurisdiction_keys", backfill_jurisdiction_keys)
+        run_once(conn, "backfill_snippets", backfill_snippets)
+
+
+def run_once(conn, name: str, migration: Callable[[Any], Any]) -> bool:
+    """Apply ``migration(conn)`` unless ``schema_migration`` records ``name``.
+
+    The marker row is inserted in the caller's transaction, so a concurrent
+    ``init_db`` waits on it and then skips; a failed migration rolls it back.
+    """
+    claimed = conn.execute(
+        text(
+            "INSERT INTO schema_migration (name) VALUES (:name) "
+            "ON CONFLICT (name) DO NOTHING RETURNING name"
+        ),
+        {"name": name},
+    ).scalar()
+    if claimed is None:
+        return False
+    migration(conn)
+    return True
+
+
+def backfill_jurisdiction_keys(conn) -> int:
+    """Fill ``jurisdiction_keys`` for rows written before the column existed."""
+    combos = conn.execute(
+        text(
+            "SELECT DISTINCT level, name, emirate, freezone FROM legal_slice "
+            "WHERE jurisdiction_keys = '{}'"
+        )
+    ).all()
+    updated = 0
+    for level, name, emirate, freezone in combos:
+        result = conn.execute(
+            text(
+                "UPDATE legal_slice SET jurisdiction_keys = :keys "
+                "WHERE jurisdiction_keys = '{}' AND level = :level AND name = :name "
+                "AND emirate IS NOT DISTINCT FROM :emirate "
+                "AND freezone IS NOT DISTINCT FROM :freezone"
+            ),
+            {
+                "keys": jurisdiction_keys(level, name, emirate, freezone),
+                "level": level,
+                "name": name,
+                "emirate": emirate,
+                "freezone": freezone,
+            },
+        )
+        updated += result.rowcount
+    return updated
+
+
+SNIPPET_BACKFILL_BATCH = 1000
+
+
+def backfill_snippets(conn) -> int:
+    """Fill ``snippet`` for rows written before the column existed."""
+    updated = 0
+    while True:
+        rows = conn.execute(
+            text("SELECT id, text_content FROM legal_slice WHERE snippet IS NULL LIMIT :n"),
+            {"n": SNIPPET_BACKFILL_BATCH},
+        ).all()
+        if not rows:
+            return updated
+        conn.execute(
+            text("UPDATE legal_slice SET snippet = :snippet WHERE id = :id"),
+            [{"id": slice_id, "snippet": build_snippet(content)} for slice_id, content in rows],
+        )
+        updated += len(rows)
+
+
+def get_corpus_version(session: Session) -> int:
+    """Return the stamp bumped whenever the legal_slice corpus is reloaded."""
+    version = session.execute(
+        text("SELECT version FROM corpus_version WHERE id = 1")
+    ).scalar()
+    return int(version or 0)
+
+
+def bump_corpus_version(session: Session) -> int:
+    """Advance the corpus version inside the caller's transaction."""
+    version = session.execute(
+        text(
+            "UPDATE corpus_version SET version = version + 1, updated_at = now() "
+            "WHERE id = 1 RETURNING version"
+        )
+    ).scalar()
+    return int(version or 0)
 
 
 @contextmanager
@@ -103,3 +468,9 @@ def get_session():
         yield session
     finally:
         session.close()
+
+
+@asynccontextmanager
+async def get_async_session() -> AsyncIterator[AsyncSession]:
+    async with AsyncSessionLocal() as session:
+        yield session
@@ -0,0 +1,261 @@
+from __future__ import annotations
+
+import abc
+import hashlib
+import multiprocessing
+import os
+import threading
+import warnings
+from concurrent.futures import Future, ProcessPoolExecutor
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Sequence, Type
+
+import numpy as np
+
+from .db import PGVECTOR_DIM
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        value = int(os.getenv(name, str(default)))
+        if value <= 0:
+            raise ValueError
+        return value
+    except ValueError:
+        warnings.warn(f"Invalid {name} provided; falling back to {default}.")
+        return default
+
+
+EMBEDDING_PROVIDER = os.getenv("EMBEDDING_PROVIDER", "hash").lower()
+EMBEDDING_MODEL = os.getenv("EMBEDDING_MODEL")
+EMBEDDING_DEVICE = os.getenv("EMBEDDING_DEVICE", "cpu")
+EMBEDDING_BATCH_SIZE = _env_int("EMBEDDING_BATCH_SIZE", 256)
+EMBEDDING_WORKERS = _env_int("EMBEDDING_WORKERS", 1)
+
+
+class EmbeddingProvider(abc.ABC):
+    """Turns text into ``dim``-sized float32 vectors, one row per input.
+
+    Subclasses implement :meth:`embed_batch`; :meth:`embed_many` slices the
+    input into ``batch_size`` chunks and, with ``workers > 1``, spreads them
+    over a process pool whose workers each build their own provider.
+    Workers start from a forkserver (spawn where unavailable), never as a
+    fork of the caller, which may hold threads, locks or open connections.
+    """
+
+    name = "base"
+
+    def __init__(self, dim: int = PGVECTOR_DIM, batch_size: int = 256, workers: int = 1) -> None:
+        self.dim = dim
+        self.batch_size = batch_size
+        self.workers = workers
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._pool_lock = threading.Lock()
+
+    def options(self) -> Dict[str, Any]:
+        """Constructor arguments used to rebuild this provider in a worker."""
+        return {"dim": self.dim, "batch_size": self.batch_size, "workers": 1}
+
+    @abc.abstractmethod
+    def embed_batch(self, texts: Sequence[str]) -> np.ndarray:
+        """Embed one chunk of at most ``batch_size`` texts."""
+
+    def embed_many(self, texts: Sequence[str]) -> np.ndarray:
+        texts = list(texts)
+        if not texts:
+            return np.zeros((0, self.dim), dtype=np.float32)
+        chunks = [
+            texts[start : start + self.batch_size]
+            for start in range(0, len(texts), self.batch_size)
+        ]
+        if self.workers > 1 and len(chunks) > 1:
+            parts = list(self._get_pool().map(_embed_in_worker, chunks))
+        else:
+            parts = [self.embed_batch(chunk) for chunk in chunks]
+        return np.vstack(parts)
+
+    def submit_many(
+        self, texts: Sequence[str], finish: Optional[Callable[[np.ndarray], Any]] = None
+    ) -> "Future[Any]":
+        """``embed_many`` as a future, computed by one pool worker.
+
+        Callers keep several batches in flight to use every worker; with
+        ``workers == 1`` the batch is embedded inline and the future is done.
+        ``finish``, a module-level (picklable) function, post-processes the
+        matrix in the same worker.
+        """
+        texts = list(texts)
+        if self.workers > 1 and texts:
+            return self._get_pool().submit(_embed_many_in_worker, texts, finish)
+        future: "Future[Any]" = Future()
+        try:
+            matrix = self.embed_many(texts)
+            future.set_result(finish(matrix) if finish is not None else matrix)
+        except Exception as exc:
+            future.set_exception(exc)
+        return future
+
+    def embed(self, text: str) -> np.ndarray:
+        return self.embed_many([text])[0]
+
+    def close(self) -> None:
+        with self._pool_lock:
+            if self._pool is not None:
+                self._pool.shutdown()
+                self._pool = None
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        with self._pool_lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=_pool_context(),
+                    initializer=_init_worker,
+                    initargs=(self.name, self.options()),
+                )
+            return self._pool
+
+
+class HashEmbeddingProvider(EmbeddingProvider):
+    """Deterministic SHA-256 placeholder; the default and the test stand-in."""
+
+    name = "hash"
+
+    def __init__(self, dim: int = PGVECTOR_DIM, batch_size: int = 256, workers: int = 1) -> None:
+        super().__init__(dim=dim, batch_size=batch_size, workers=workers)
+        self._digest_size = hashlib.sha256().digest_size
+        # Column i of an embedding repeats digest byte i % 32.
+        self._tile_index = np.arange(dim) % self._digest_size
+
+    def embed_batch(self, texts: Sequence[str]) -> np.ndarray:
+        matrix = np.zeros((len(texts), self.dim), dtype=np.float32)
+        present = [index for index, text in enumerate(texts) if text]
+        if not present:
+            return matrix
+        digests = b"".join(
+            hashlib.sha256(texts[index].encode("utf-8")).digest() for index in present
+        )
+        values = np.frombuffer(digests, dtype=np.uint8).reshape(
+            len(present), self._digest_size
+        )
+        # byte / 255 - 0.5 == (2 * byte - 255) / 510. Squaring and summing the
+        # odd integers is exact and order independent, so a text embeds
+        # identically whatever batch it is part of. The sum is never zero.
+        centred = 2 * values[:, self._tile_index].astype(np.int64) - 255
+        norms = np.sqrt((centred * centred).sum(axis=1, keepdims=True))
+        matrix[present] = (centred / norms).astype(np.float32)
+        return matrix
+
+
+class SentenceTransformerProvider(EmbeddingProvider):
+    """Locally stored sentence-transformers model (optional dependency)."""
+
+    name = "sentence-transformers"
+
+    def __init__(
+        self,
+        dim: int = PGVECTOR_DIM,
+        batch_size: int = 256,
+        workers: int = 1,
+        model: Optional[str] = None,
+        device: str = "cpu",
+    ) -> None:
+        super().__init__(dim=dim, batch_size=batch_size, workers=workers)
+        if not model:
+            raise RuntimeError("EMBEDDING_MODEL must point at a local model directory.")
+        try:
+            from sentence_transformers import SentenceTransformer
+        except ImportError as exc:
+            raise RuntimeError(
+                "EMBEDDING_PROVIDER=sentence-transformers requires `pip install sentence-transformers`."
+            ) from exc
+        self.model = model
+        self.device = device
+        self._model_cls = SentenceTransformer
+        self._model: Optional[Any] = None
+        if workers <= 1:
+            self._load_model()
+
+    def _load_model(self) -> Any:
+        # With ``workers > 1`` only the pool workers load the weights.
+        if self._model is None:
+            model = self._model_cls(self.model, device=self.device)
+            model_dim = model.get_sentence_embedding_dimension()
+            if model_dim != self.dim:
+                raise RuntimeError(
+                    f"Embedding model dimension {model_dim} does not match PGVECTOR_DIM={self.dim}."
+                )
+            self._model = model
+        return self._model
+
+    def options(self) -> Dict[str, Any]:
+        return {**super().options(), "model": self.model, "device": self.device}
+
+    def embed_batch(self, texts: Sequence[str]) -> np.ndarray:
+        vectors = self._load_model().encode(
+            list(texts),
+            batch_size=self.batch_size,
+            convert_to_numpy=True,
+            normalize_embeddings=True,
+            show_progress_bar=False,
+        )
+        return np.asarray(vectors, dtype=np.float32)
+
+
+PROVIDERS: Dict[str, Type[EmbeddingProvider]] = {
+    HashEmbeddingProvider.name: HashEmbeddingProvider,
+    SentenceTransformerProvider.name: SentenceTransformerProvider,
+}
+
+
+def create_provider(name: Optional[str] = None, **overrides: Any) -> EmbeddingProvider:
+    """Build a provider from the environment, with keyword overrides."""
+    name = (name or EMBEDDING_PROVIDER).lower()
+    provider_cls = PROVIDERS.get(name)
+    if provider_cls is None:
+        # A silent fallback would mix vectors from different models in one
+        # table, so an unknown provider is a hard error.
+        raise RuntimeError(
+            f"Unknown EMBEDDING_PROVIDER '{name}'. Available: {sorted(PROVIDERS)}"
+        )
+    options: Dict[str, Any] = {
+        "dim": PGVECTOR_DIM,
+        "batch_size": EMBEDDING_BATCH_SIZE,
+        "workers": EMBEDDING_WORKERS,
+    }
+    if provider_cls is SentenceTransformerProvider:
+        options.update(model=EMBEDDING_MODEL, device=EMBEDDING_DEVICE)
+    options.update(overrides)
+    return provider_cls(**options)
+
+
+@lru_cache(maxsize=1)
+def get_embedding_provider() -> EmbeddingProvider:
+    """Process-wide provider selected by ``EMBEDDING_PROVIDER``."""
+    return create_provider()
+
+
+_worker_provider: Optional[EmbeddingProvider] = None
+
+
+def _pool_context() -> multiprocessing.context.BaseContext:
+    method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+    return multiprocessing.get_context(method)
+
+
+def _init_worker(name: str, options: Dict[str, Any]) -> None:
+    global _worker_provider
+    _worker_provider = PROVIDERS[name](**options)
+
+
+def _embed_in_worker(texts: List[str]) -> np.ndarray:
+    assert _worker_provider is not None, "worker initialiser did not run"
+    return _worker_provider.embed_batch(texts)
+
+
+def _embed_many_in_worker(
+    texts: List[str], finish: Optional[Callable[[np.ndarray], Any]] = None
+) -> Any:
+    assert _worker_provider is not None, "worker initialiser did not run"
+    matrix = _worker_provider.embed_many(texts)
+    return finish(matrix) if finish is not None else matrix
@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+from typing import Dict, List, Optional
+
+from .analysis import load_query_dictionaries
+
+# Canonical jurisdiction key -> spellings seen in queries and source metadata,
+# loaded from the shared query dictionary file.
+JURISDICTION_KEYWORDS = load_query_dictionaries().jurisdictions
+
+JURISDICTION_ALIASES: Dict[str, str] = {
+    alias: canonical
+    for canonical, aliases in JURISDICTION_KEYWORDS.items()
+    for alias in aliases
+}
+
+
+def canonical_jurisdiction(value: Optional[str]) -> Optional[str]:
+    """Lowercase ``value`` and resolve known aliases (``"UAE"`` -> ``"federal"``)."""
+    key = " ".join((value or "").split()).lower()
+    if not key:
+        return None
+    return JURISDICTION_ALIASES.get(key, key)
+
+
+def jurisdiction_keys(
+    level: Optional[str],
+    name: Optional[str],
+    emirate: Optional[str] = None,
+    freezone: Optional[str] = None,
+) -> List[str]:
+    """Keys stored in ``legal_slice.jurisdiction_keys`` for one slice.
+
+    Each non-empty field contributes its lowercased value and, when that value
+    is a known alias, its canonical key, so a filter only has to look up
+    ``canonical_jurisdiction(filter)``.
+    """
+    keys: List[str] = []
+    for value in (level, name, emirate, freezone):
+        raw = " ".join((value or "").split()).lower()
+        for key in (raw, JURISDICTION_ALIASES.get(raw)):
+            if key and key not in keys:
+                keys.append(key)
+    return keys
@@ -1,19 +1,43 @@
 from __future__ import annotations
 
+import json
 import os
-from typing import Generator
+import warnings
+from typing import AsyncIterator, Dict, Iterator, Optional, Sequence, Union
 
-from fastapi import Depends, FastAPI, HTTPException
+from fastapi import Depends, FastAPI, Header, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
-from sqlalchemy.orm import Session
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
 
-from .db import get_session, init_db
+from . import search
+from .db import async_engine, get_async_session, get_session, init_db
 from .models import LegalSlice as LegalSliceModel
-from .rag import run_answer, run_search
+from .models import LegalSliceVersion as LegalSliceVersionModel
+from .rag import (
+    CORPUS_VERSION,
+    RESULT_CACHE,
+    InvalidCursor,
+    run_answer_async,
+    run_search_async,
+    run_search_batch_async,
+)
+from .serialization import (
+    FastJSONResponse,
+    citation_payload,
+    effective_to,
+    legal_slice_payload,
+    search_response_payload,
+)
 from .schema import (
     AnswerResponse,
+    BatchSearchRequest,
+    BatchSearchResponse,
     Effective,
+    GetByIdsRequest,
+    GetByIdsResponse,
     Instrument,
     Jurisdiction,
     LegalSlice,
@@ -22,15 +46,19 @@ from .schema import (
     Source,
     Structure,
     StructureLocators,
+    VersionItem,
 )
 
 
-def get_db() -> Generator[Session, None, None]:
-    with get_session() as session:
+async def get_db() -> AsyncIterator[AsyncSession]:
+    async with get_async_session() as session:
         yield session
 
 
-def orm_to_schema(record: LegalSliceModel) -> LegalSlice:
+def orm_to_schema(
+    record: LegalSliceModel,
+    versions: Optional[Sequence[LegalSliceVersionModel]] = None,
+) -> LegalSlice:
     locators = StructureLocators(
         part=record.part,
         chapter=record.chapter,
@@ -58,7 +86,7 @@ def orm_to_schema(record: LegalSliceModel) -> LegalSlice:
     )
     effective = Effective(
         from_date=record.effective_from.isoformat(),
-        to_date=record.effective_to.isoformat() if record.effective_to else None,
+        to_date=effective_to(record).isoformat() if record.effective_to else None,
         basis=None,
     )
 
@@ -83,7 +111,16 @@ def orm_to_schema(record: LegalSliceModel) -> LegalSlice:
         topics=record.topics or [],
         state=record.state,
         effective=effective,
-        versions=[],
+        versions=[
+            VersionItem(
+                version_id=version.version_id,
+                event=version.event,
+                date=version.event_date.isoformat(),
+                by_instrument=version.by_instrument,
+                by_url=version.by_url,
+            )
+            for version in (record.versions if versions is None else versions)
+        ],
     )
 
 
@@ -93,6 +130,16 @@ app = FastAPI(title="UAE Legal Agent API", version="0.1.0")
 @app.on_event("startup")
 def _startup() -> None:
     init_db()
+    if search.VECTOR_SEARCH_BACKEND == "numpy":
+        from .vector_index import get_vector_index
+
+        with get_session() as session:
+            get_vector_index(session)
+
+
+@app.on_event("shutdown")
+async def _shutdown() -> None:
+    await async_engine.dispose()
 
 
 frontend_origin = os.getenv("FRONTEND_ORIGIN", "http://localhost:3001")
@@ -128,31 +175,166 @@ def healthz() -> JSONResponse:
     return JSONResponse({"status": "ok"})
 
 
+@app.get("/cache/stats", include_in_schema=False)
+def cache_stats() -> JSONResponse:
+    return JSONResponse(RESULT_CACHE.stats())
+
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+
+def _ndjson_lines(response: SearchResponse) -> Iterator[str]:
+    """One citation per line, then a trailer carrying the paging cursor."""
+    for citation in response.items:
+        # Same bytes as ``citation.json(ensure_ascii=False)``.
+        yield json.dumps(citation_payload(citation), ensure_ascii=False) + "\n"
+    trailer = {"query": response.query, "next_cursor": response.next_cursor}
+    yield json.dumps(trailer, ensure_ascii=False) + "\n"
+
+
 @app.post("/search", response_model=SearchResponse)
-def search_endpoint(
+async def search_endpoint(
     payload: SearchRequest,
-    session: Session = Depends(get_db),
-) -> SearchResponse:
-    return run_search(session, payload)
+    session: AsyncSession = Depends(get_db),
+    accept: Optional[str] = Header(default=None),
+) -> Union[FastJSONResponse, StreamingResponse]:
+    try:
+        response = await run_search_async(session, payload)
+    except InvalidCursor as exc:
+        raise HTTPException(status_code=422, detail=str(exc))
+    if accept and NDJSON_MEDIA_TYPE in accept:
+        # Ranking (the only database work) is done; streaming never holds the session.
+        return StreamingResponse(_ndjson_lines(response), media_type=NDJSON_MEDIA_TYPE)
+    # ``response_model`` documents the body; the payload skips re-validation.
+    return FastJSONResponse(search_response_payload(response))
+
+
+@app.post("/search/batch", response_model=BatchSearchResponse)
+async def search_batch_endpoint(
+    payload: BatchSearchRequest,
+    session: AsyncSession = Depends(get_db),
+) -> BatchSearchResponse:
+    try:
+        results = await run_search_batch_async(session, payload.requests)
+        return BatchSearchResponse(results=results)
+    except InvalidCursor as exc:
+        raise HTTPException(status_code=422, detail=str(exc))
+
+
+try:
+    GET_BY_ID_CACHE_MAX_AGE = max(0, int(os.getenv("GET_BY_ID_CACHE_MAX_AGE", "300")))
+except ValueError:
+    warnings.warn("Invalid GET_BY_ID_CACHE_MAX_AGE provided; falling back to 300.")
+    GET_BY_ID_CACHE_MAX_AGE = 300
+
+
+def slice_etag(text_hash: str, corpus_version: int, as_of=None) -> str:
+    """Strong validator for one ``/get_by_id`` representation.
+
+    ``text_hash`` pins the article text; the corpus version covers metadata and
+    version history, which change only when ``seed_loader`` reloads.
+    """
+    tag = f"{text_hash}.{corpus_version}"
+    if as_of:
+        tag += f".{as_of.isoformat()}"
+    return '"' + tag.replace('"', "") + '"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """``If-None-Match`` uses weak comparison (RFC 9110 13.1.2)."""
+    if not if_none_match:
+        return False
+    candidates = {value.strip() for value in if_none_match.split(",")}
+    if "*" in candidates:
+        return True
+    return etag in {value[2:] if value.startswith("W/") else value for value in candidates}
+
+
+def _cache_headers(etag: str) -> Dict[str, str]:
+    return {
+        "ETag": etag,
+        "Cache-Control": f"public, max-age={GET_BY_ID_CACHE_MAX_AGE}, must-revalidate",
+    }
 
 
 @app.get("/get_by_id/{slice_id}", response_model=LegalSlice)
-def get_by_id(
+async def get_by_id(
     slice_id: str,
-    session: Session = Depends(get_db),
-) -> LegalSlice:
-    record = session.get(LegalSliceModel, slice_id)
+    as_of: Optional[str] = None,
+    session: AsyncSession = Depends(get_db),
+    if_none_match: Optional[str] = Header(default=None),
+) -> Response:
+    try:
+        point_in_time = search.parse_as_of(as_of)
+    except ValueError:
+        raise HTTPException(status_code=422, detail="Invalid as_of date")
+    version = await session.run_sync(CORPUS_VERSION.current)
+    if if_none_match:
+        # Revalidation only needs the hash, not the row.
+        text_hash = (
+            await session.execute(
+                select(LegalSliceModel.text_hash).where(LegalSliceModel.id == slice_id)
+            )
+        ).scalar()
+        if text_hash is None:
+            raise HTTPException(status_code=404, detail="Legal slice not found")
+        etag = slice_etag(text_hash, version, point_in_time)
+        if etag_matches(if_none_match, etag):
+            return Response(status_code=304, headers=_cache_headers(etag))
+
+    # Async sessions cannot lazy-load, so the version history comes eagerly.
+    record = await session.get(
+        LegalSliceModel, slice_id, options=[selectinload(LegalSliceModel.versions)]
+    )
     if not record:
         raise HTTPException(status_code=404, detail="Legal slice not found")
-    return orm_to_schema(record)
+    versions = None
+    if point_in_time:
+        # Only the version in force on ``as_of`` (GiST range lookup).
+        versions = await search.slice_versions_async(session, slice_id, point_in_time)
+    return FastJSONResponse(
+        legal_slice_payload(record, versions),
+        headers=_cache_headers(slice_etag(record.text_hash, version, point_in_time)),
+    )
+
+
+@app.post("/get_by_ids", response_model=GetByIdsResponse)
+async def get_by_ids(
+    payload: GetByIdsRequest,
+    session: AsyncSession = Depends(get_db),
+) -> FastJSONResponse:
+    try:
+        point_in_time = search.parse_as_of(payload.as_of)
+    except ValueError:
+        raise HTTPException(status_code=422, detail="Invalid as_of date")
+    ids = list(dict.fromkeys(payload.ids))
+    records = await search.fetch_slices_async(session, ids, with_versions=point_in_time is None)
+    in_force = (
+        await search.versions_in_force_async(session, [record.id for record in records], point_in_time)
+        if point_in_time
+        else {}
+    )
+    found = {record.id for record in records}
+    return FastJSONResponse(
+        {
+            "items": [
+                legal_slice_payload(record, in_force[record.id] if point_in_time else None)
+                for record in records
+            ],
+            "missing": [slice_id for slice_id in ids if slice_id not in found],
+        }
+    )
 
 
 @app.post("/answer", response_model=AnswerResponse)
-def answer_endpoint(
+async def answer_endpoint(
     payload: SearchRequest,
-    session: Session = Depends(get_db),
+    session: AsyncSession = Depends(get_db),
 ) -> AnswerResponse:
-    return run_answer(session, payload)
+    try:
+        return await run_answer_async(session, payload)
+    except InvalidCursor as exc:
+        raise HTTPException(status_code=422, detail=str(exc))
 
 from pydantic import BaseModel
 import httpx
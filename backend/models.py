@@ -4,11 +4,37 @@ from datetime import date
 from typing import List, Optional
 
 from pgvector.sqlalchemy import Vector
-from sqlalchemy import Date, Integer, String, Text
-from sqlalchemy.dialects.postgresql import ARRAY
-from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
+from sqlalchemy import Computed, Date, ForeignKey, Integer, String, Text
+from sqlalchemy.dialects.postgresql import ARRAY, DATERANGE, TSVECTOR, Range
+from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
+from sqlalchemy.types import UserDefinedType
 
-from .db import PGVECTOR_DIM
+from .db import EFFECTIVE_PERIOD_EXPRESSION, PGVECTOR_DIM, SEARCH_TSV_EXPRESSION
+from .jurisdictions import jurisdiction_keys
+from .utils.text_clean import build_snippet
+
+
+class HalfVector(UserDefinedType):
+    """pgvector ``halfvec``; only used as a cast target for the quantized index."""
+
+    cache_ok = True
+
+    def __init__(self, dim: Optional[int] = None) -> None:
+        self.dim = dim
+
+    def get_col_spec(self, **kw) -> str:
+        return "HALFVEC" if self.dim is None else f"HALFVEC({self.dim})"
+
+
+def _default_jurisdiction_keys(context) -> List[str]:
+    params = context.get_current_parameters()
+    return jurisdiction_keys(
+        params.get("level"), params.get("name"), params.get("emirate"), params.get("freezone")
+    )
+
+
+def _default_snippet(context) -> str:
+    return build_snippet(context.get_current_parameters().get("text_content"))
 
 
 class Base(DeclarativeBase):
@@ -43,11 +69,53 @@ class LegalSlice(Base):
     item: Mapped[Optional[str]] = mapped_column(String, nullable=True)
     text_content: Mapped[str] = mapped_column(Text, nullable=False)
     text_hash: Mapped[str] = mapped_column(String, nullable=False)
+    snippet: Mapped[Optional[str]] = mapped_column(Text, nullable=True, default=_default_snippet)
+    # Written by seed_loader; NULL for rows written elsewhere.
+    row_fingerprint: Mapped[Optional[str]] = mapped_column(String, nullable=True)
     primary_lang: Mapped[str] = mapped_column(String, nullable=False)
     topics: Mapped[Optional[List[str]]] = mapped_column(ARRAY(String), nullable=True)
+    jurisdiction_keys: Mapped[List[str]] = mapped_column(
+        ARRAY(String), nullable=False, default=_default_jurisdiction_keys
+    )
     state: Mapped[str] = mapped_column(String, nullable=False)
     effective_from: Mapped[date] = mapped_column(Date, nullable=False)
     effective_to: Mapped[Optional[date]] = mapped_column(Date, nullable=True)
     vector_embedding: Mapped[Optional[List[float]]] = mapped_column(
         Vector(PGVECTOR_DIM), nullable=True
     )
+    # Maintained by Postgres from title/path/text_content; never written by the
+    # application and deferred so ORM loads do not ship it over the wire.
+    search_tsv: Mapped[Optional[str]] = mapped_column(
+        TSVECTOR,
+        Computed(SEARCH_TSV_EXPRESSION, persisted=True),
+        nullable=True,
+        deferred=True,
+    )
+    # Generated from effective_from/effective_to and GiST indexed for ``as_of``.
+    effective_period: Mapped[Optional[Range[date]]] = mapped_column(
+        DATERANGE,
+        Computed(EFFECTIVE_PERIOD_EXPRESSION, persisted=True),
+        nullable=True,
+        deferred=True,
+    )
+    versions: Mapped[List["LegalSliceVersion"]] = relationship(
+        back_populates="slice",
+        cascade="all, delete-orphan",
+        order_by="LegalSliceVersion.event_date",
+    )
+
+
+class LegalSliceVersion(Base):
+    __tablename__ = "legal_slice_version"
+
+    slice_id: Mapped[str] = mapped_column(
+        String, ForeignKey("legal_slice.id", ondelete="CASCADE"), primary_key=True
+    )
+    version_id: Mapped[str] = mapped_column(String, primary_key=True)
+    event: Mapped[str] = mapped_column(String, nullable=False)
+    event_date: Mapped[date] = mapped_column(Date, nullable=False)
+    by_instrument: Mapped[Optional[str]] = mapped_column(String, nullable=True)
+    by_url: Mapped[Optional[str]] = mapped_column(String, nullable=True)
+    valid_period: Mapped[Range[date]] = mapped_column(DATERANGE, nullable=False)
+
+    slice: Mapped[LegalSlice] = relationship(back_populates="versions")
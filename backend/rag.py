@@ -1,11 +1,31 @@
 from __future__ import annotations
 
-from typing import List, Tuple
+import base64
+import binascii
+import json
+import os
+import warnings
+from typing import (
+    Awaitable,
+    Callable,
+    Dict,
+    Hashable,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+    TypeVar,
+)
 
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from . import search
-from .models import LegalSlice
+from .cache import CorpusVersionTracker, TTLCache
+from .db import get_corpus_version
+from .jurisdictions import canonical_jurisdiction
+from .search import SliceCandidate
 from .schema import (
     AnswerResponse,
     Citation,
@@ -13,16 +33,79 @@ from .schema import (
     SearchResponse,
     StructureLocators,
 )
-from .utils.text_clean import truncate_for_snippet
 
 DISCLAIMER = (
     "信息检索工具，非法律意见；以官方文本为准（DIFC/ADGM 英文为权威；联邦英文多为参考译文）"
 )
 
 
-def build_citation(slice_obj: LegalSlice) -> Citation:
-    snippet = truncate_for_snippet(slice_obj.text_content, max_chars=200)
-    locators = StructureLocators(
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, str(default)))
+    except ValueError:
+        warnings.warn(f"Invalid {name} provided; falling back to {default}.")
+        return default
+
+
+# SEARCH_CACHE_SIZE=0 disables result caching entirely.
+RESULT_CACHE = TTLCache(
+    maxsize=int(_env_float("SEARCH_CACHE_SIZE", 1024)),
+    ttl=_env_float("SEARCH_CACHE_TTL", 300.0),
+)
+CORPUS_VERSION = CorpusVersionTracker(
+    get_corpus_version,
+    interval=_env_float("SEARCH_CACHE_VERSION_CHECK", 5.0),
+)
+
+ResponseT = TypeVar("ResponseT")
+
+DEFAULT_PAGE_SIZE = 8
+
+# /search ranks only as deep as the page being served needs: the first
+# page's ``page_size + 1`` rows rounded up to this bucket, doubling as the
+# cursor moves past it. Every page of one depth re-ranks the same order.
+SEARCH_RANKING_BUCKET = max(1, int(_env_float("SEARCH_RANKING_BUCKET", 16)))
+
+
+class InvalidCursor(ValueError):
+    """Raised when a search cursor cannot be decoded."""
+
+
+class SearchCursor(NamedTuple):
+    """Keyset position after the last row of a page."""
+
+    tier: int
+    score: float
+    id: str
+    offset: int
+    depth: int
+
+    def key(self) -> Tuple[int, float, str]:
+        return (self.tier, -self.score, self.id)
+
+
+def encode_cursor(cursor: SearchCursor) -> str:
+    raw = json.dumps(list(cursor), separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(token: Optional[str]) -> Optional[SearchCursor]:
+    if not token:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        tier, score, slice_id, offset, depth = json.loads(raw)
+        cursor = SearchCursor(int(tier), float(score), str(slice_id), int(offset), int(depth))
+    except (binascii.Error, ValueError, TypeError) as exc:
+        raise InvalidCursor("Invalid search cursor") from exc
+    if cursor.offset < 1 or cursor.depth <= cursor.offset:
+        raise InvalidCursor("Invalid search cursor")
+    return cursor
+
+
+def build_citation(slice_obj: SliceCandidate) -> Citation:
+    # Rows come from validated ingest, so skip per-hit model validation.
+    locators = StructureLocators.construct(
         part=slice_obj.part,
         chapter=slice_obj.chapter,
         section=slice_obj.section,
@@ -31,35 +114,276 @@ def build_citation(slice_obj: LegalSlice) -> Citation:
         clause=slice_obj.clause,
         item=slice_obj.item,
     )
-    return Citation(
+    return Citation.construct(
         id=slice_obj.id,
         instrument_title=slice_obj.title,
         structure_path=slice_obj.path,
         structure_locators=locators,
         source_url=slice_obj.url,
         gazette=slice_obj.gazette,
-        snippet=snippet,
+        snippet=slice_obj.snippet or "",
     )
 
 
-def _materialise(
-    ranked_results: List[Tuple[LegalSlice, float]]
-) -> List[LegalSlice]:
-    """Extract ORM entities from scoring tuples."""
-    return [record for record, _ in ranked_results]
+def _filter_key(payload: SearchRequest) -> Tuple[Hashable, ...]:
+    as_of = search.parse_as_of(payload.as_of)
+    return (
+        canonical_jurisdiction(payload.jurisdiction),
+        tuple(sorted(set(payload.topics or []))),
+        as_of.isoformat() if as_of else None,
+    )
 
 
-def run_search(session: Session, payload: SearchRequest) -> SearchResponse:
-    filters = search.to_filters(
+def _cache_key(kind: str, payload: SearchRequest) -> Hashable:
+    return (
+        kind,
+        # Exact text: embeddings are case and whitespace sensitive, so a
+        # normalised key could serve a differently ranked query's results.
+        payload.query,
+        *_filter_key(payload),
+        payload.ef_search,
+        payload.probes,
+        payload.page_size or DEFAULT_PAGE_SIZE,
+        payload.cursor,
+    )
+
+
+def _cached(
+    kind: str,
+    session: Session,
+    payload: SearchRequest,
+    compute: Callable[[], ResponseT],
+) -> ResponseT:
+    if not RESULT_CACHE.enabled:
+        return compute()
+
+    RESULT_CACHE.sync_version(CORPUS_VERSION.current(session))
+    key = _cache_key(kind, payload)
+    cached = RESULT_CACHE.get(key)
+    if cached is None:
+        cached = compute()
+        RESULT_CACHE.set(key, cached)
+    return cached
+
+
+async def _cached_async(
+    kind: str,
+    session: AsyncSession,
+    payload: SearchRequest,
+    compute: Callable[[], Awaitable[ResponseT]],
+) -> ResponseT:
+    if not RESULT_CACHE.enabled:
+        return await compute()
+
+    RESULT_CACHE.sync_version(await session.run_sync(CORPUS_VERSION.current))
+    key = _cache_key(kind, payload)
+    cached = RESULT_CACHE.get(key)
+    if cached is None:
+        cached = await compute()
+        RESULT_CACHE.set(key, cached)
+    return cached
+
+
+def _filters(payload: SearchRequest) -> search.SearchFilters:
+    return search.to_filters(
         jurisdiction=payload.jurisdiction,
         topics=payload.topics,
         as_of=payload.as_of,
     )
-    ranked = search.hybrid_search(session, payload.query, filters, limit=8)
-    ranked = search.boost_ranked_results(ranked, payload.query)
-    slices = _materialise(ranked)
-    citations = [build_citation(item) for item in slices]
-    return SearchResponse(query=payload.query, items=citations)
+
+
+def _ranking_depth(payload: SearchRequest) -> int:
+    """Rows to rank for the page ``payload`` asks for.
+
+    Pages reuse their cursor's depth while the page fits in it, so a cursor
+    chain keeps one order. Past it, the depth doubles from
+    ``SEARCH_RANKING_BUCKET`` until it covers ``offset + page_size + 1`` rows.
+    """
+    position = decode_cursor(payload.cursor)
+    offset = position.offset if position is not None else 0
+    needed = offset + (payload.page_size or DEFAULT_PAGE_SIZE) + 1
+    if position is not None and needed <= position.depth:
+        return position.depth
+    depth = SEARCH_RANKING_BUCKET
+    while depth < needed:
+        depth *= 2
+    return depth
+
+
+def _page(
+    payload: SearchRequest, ranked: Sequence[Tuple[SliceCandidate, float]], depth: int
+) -> SearchResponse:
+    """Cut the page after ``payload.cursor`` from the rows ranked to ``depth``."""
+    page_size = payload.page_size or DEFAULT_PAGE_SIZE
+    position = decode_cursor(payload.cursor)
+    tiered = search.tiered_ranked_results(ranked, payload.query)
+    offset = 0
+    if position is not None:
+        offset = position.offset
+        if position.depth == depth:
+            after = position.key()
+            tiered = [row for row in tiered if (row[2], -row[1], row[0].id) > after]
+        else:
+            # Deeper ranking, different scores: continue by position.
+            tiered = tiered[offset:]
+
+    page = tiered[:page_size]
+    next_cursor = None
+    if len(tiered) > page_size:
+        last_slice, last_score, last_tier = page[-1]
+        next_cursor = encode_cursor(
+            SearchCursor(last_tier, last_score, last_slice.id, offset + len(page), depth)
+        )
+    citations = [build_citation(slice_obj) for slice_obj, _, _ in page]
+    return SearchResponse.construct(query=payload.query, items=citations, next_cursor=next_cursor)
+
+
+def _search(
+    session: Session,
+    payload: SearchRequest,
+    vector_results: Optional[List[Tuple[SliceCandidate, float]]] = None,
+) -> SearchResponse:
+    depth = _ranking_depth(payload)
+    ranked = search.hybrid_search(
+        session,
+        payload.query,
+        _filters(payload),
+        limit=depth,
+        ef_search=payload.ef_search,
+        probes=payload.probes,
+        vector_results=vector_results,
+    )
+    return _page(payload, ranked, depth)
+
+
+async def _search_async(
+    session: AsyncSession,
+    payload: SearchRequest,
+    vector_results: Optional[List[Tuple[SliceCandidate, float]]] = None,
+) -> SearchResponse:
+    depth = _ranking_depth(payload)
+    ranked = await search.hybrid_search_async(
+        session,
+        payload.query,
+        _filters(payload),
+        limit=depth,
+        ef_search=payload.ef_search,
+        probes=payload.probes,
+        vector_results=vector_results,
+    )
+    return _page(payload, ranked, depth)
+
+
+def run_search(session: Session, payload: SearchRequest) -> SearchResponse:
+    return _cached("search", session, payload, lambda: _search(session, payload))
+
+
+async def run_search_async(session: AsyncSession, payload: SearchRequest) -> SearchResponse:
+    return await _cached_async("search", session, payload, lambda: _search_async(session, payload))
+
+
+class _BatchPlan:
+    """Cache lookups, de-duplication and grouping shared by both batch paths.
+
+    Requests are grouped by filters, ANN settings and ranking depth, so each
+    group's vector stage can be one ``search.batch_vector_search`` statement.
+    """
+
+    def __init__(self, payloads: Sequence[SearchRequest], version: Optional[int]) -> None:
+        self.payloads = payloads
+        self.responses: List[Optional[SearchResponse]] = [None] * len(payloads)
+        keys = [_cache_key("search", payload) for payload in payloads]
+        if version is not None:
+            RESULT_CACHE.sync_version(version)
+            for index, key in enumerate(keys):
+                cached = RESULT_CACHE.get(key)
+                if cached is not None:
+                    self.responses[index] = cached
+
+        # Identical requests (same cache key) are computed once.
+        self.pending: Dict[Hashable, List[int]] = {}
+        for index, response in enumerate(self.responses):
+            if response is None:
+                self.pending.setdefault(keys[index], []).append(index)
+
+        groups: Dict[Hashable, List[Hashable]] = {}
+        for key, indexes in self.pending.items():
+            payload = payloads[indexes[0]]
+            group = (
+                _filter_key(payload),
+                payload.ef_search,
+                payload.probes,
+                _ranking_depth(payload),
+            )
+            groups.setdefault(group, []).append(key)
+        self.groups = list(groups.values())
+
+    def leaders(self, group_keys: Sequence[Hashable]) -> List[SearchRequest]:
+        return [self.payloads[self.pending[key][0]] for key in group_keys]
+
+    def vector_stage(self, leaders: Sequence[SearchRequest]) -> Optional[Dict]:
+        """``batch_vector_search`` arguments, or None in fused mode, which
+        ranks everything, vectors included, in one statement."""
+        if search.HYBRID_SEARCH_MODE == "fused":
+            return None
+        return dict(
+            queries=[payload.query for payload in leaders],
+            filters=_filters(leaders[0]),
+            k=search.hybrid_stage_sizes(_ranking_depth(leaders[0]))[1],
+            ef_search=leaders[0].ef_search,
+            probes=leaders[0].probes,
+        )
+
+    def store(self, key: Hashable, response: SearchResponse) -> None:
+        if RESULT_CACHE.enabled:
+            RESULT_CACHE.set(key, response)
+        for index in self.pending[key]:
+            self.responses[index] = response
+
+    def results(self) -> List[SearchResponse]:
+        return [response for response in self.responses if response is not None]
+
+
+def run_search_batch(
+    session: Session, payloads: Sequence[SearchRequest]
+) -> List[SearchResponse]:
+    """Answer many searches, sharing one embedding pass and vector query.
+
+    Cached requests are served from ``RESULT_CACHE``; phrase and keyword
+    ranking still run per request. Responses come back in input order.
+    """
+    version = CORPUS_VERSION.current(session) if RESULT_CACHE.enabled else None
+    plan = _BatchPlan(payloads, version)
+    for group_keys in plan.groups:
+        leaders = plan.leaders(group_keys)
+        stage = plan.vector_stage(leaders)
+        if stage is None:
+            vector_hits: List[Optional[List[Tuple[SliceCandidate, float]]]] = [None] * len(leaders)
+        else:
+            vector_hits = list(search.batch_vector_search(session, **stage))
+        for key, payload, hits in zip(group_keys, leaders, vector_hits):
+            plan.store(key, _search(session, payload, vector_results=hits))
+    return plan.results()
+
+
+async def run_search_batch_async(
+    session: AsyncSession, payloads: Sequence[SearchRequest]
+) -> List[SearchResponse]:
+    """``run_search_batch`` on an ``AsyncSession``."""
+    version = (
+        await session.run_sync(CORPUS_VERSION.current) if RESULT_CACHE.enabled else None
+    )
+    plan = _BatchPlan(payloads, version)
+    for group_keys in plan.groups:
+        leaders = plan.leaders(group_keys)
+        stage = plan.vector_stage(leaders)
+        if stage is None:
+            vector_hits: List[Optional[List[Tuple[SliceCandidate, float]]]] = [None] * len(leaders)
+        else:
+            vector_hits = list(await search.batch_vector_search_async(session, **stage))
+        for key, payload, hits in zip(group_keys, leaders, vector_hits):
+            plan.store(key, await _search_async(session, payload, vector_results=hits))
+    return plan.results()
 
 
 def synthesise_answer(payload: SearchRequest, citations: List[Citation]) -> str:
@@ -76,7 +400,7 @@ def synthesise_answer(payload: SearchRequest, citations: List[Citation]) -> str:
     return f"根据所检索到的官方条文（非法律意见），{joined}"
 
 
-def run_answer(session: Session, payload: SearchRequest) -> AnswerResponse:
+def _answer(session: Session, payload: SearchRequest) -> AnswerResponse:
     response = run_search(session, payload)
     answer_text = synthesise_answer(payload, response.items)
     return AnswerResponse(
@@ -84,3 +408,20 @@ def run_answer(session: Session, payload: SearchRequest) -> AnswerResponse:
         items=response.items,
         disclaimer=DISCLAIMER,
     )
+
+
+def run_answer(session: Session, payload: SearchRequest) -> AnswerResponse:
+    return _cached("answer", session, payload, lambda: _answer(session, payload))
+
+
+async def _answer_async(session: AsyncSession, payload: SearchRequest) -> AnswerResponse:
+    response = await run_search_async(session, payload)
+    return AnswerResponse(
+        answer=synthesise_answer(payload, response.items),
+        items=response.items,
+        disclaimer=DISCLAIMER,
+    )
+
+
+async def run_answer_async(session: AsyncSession, payload: SearchRequest) -> AnswerResponse:
+    return await _cached_async("answer", session, payload, lambda: _answer_async(session, payload))
@@ -1,8 +1,9 @@
 from __future__ import annotations
 
+from datetime import date
 from typing import List, Optional, Literal
 
-from pydantic import BaseModel, HttpUrl
+from pydantic import BaseModel, HttpUrl, conint, conlist, validator
 
 
 JurisdictionLevel = Literal["federal", "emirate", "freezone"]
@@ -53,6 +54,13 @@ class Effective(BaseModel):
         Literal["gazette_publication", "explicit_article", "commencement_order"]
     ] = None
 
+    @validator("to_date")
+    def _ends_after_start(cls, to_date: Optional[str], values: dict) -> Optional[str]:
+        from_date = values.get("from_date")
+        if to_date and from_date and date.fromisoformat(to_date) < date.fromisoformat(from_date):
+            raise ValueError("to_date must not be earlier than from_date")
+        return to_date
+
 
 class VersionItem(BaseModel):
     version_id: str
@@ -82,6 +90,10 @@ class SearchRequest(BaseModel):
     jurisdiction: Optional[str] = None  # e.g., "federal", "Dubai", "DIFC"
     topics: Optional[List[str]] = None
     as_of: Optional[str] = None  # YYYY-MM-DD
+    ef_search: Optional[conint(ge=1, le=1000)] = None  # HNSW recall/latency knob
+    probes: Optional[conint(ge=1, le=32768)] = None  # IVFFlat lists to visit
+    page_size: Optional[conint(ge=1, le=100)] = None  # default 8
+    cursor: Optional[str] = None  # next_cursor of the previous page
 
 
 class Citation(BaseModel):
@@ -97,6 +109,25 @@ class Citation(BaseModel):
 class SearchResponse(BaseModel):
     query: str
     items: List[Citation]
+    next_cursor: Optional[str] = None
+
+
+class BatchSearchRequest(BaseModel):
+    requests: conlist(SearchRequest, min_items=1, max_items=256)
+
+
+class BatchSearchResponse(BaseModel):
+    results: List[SearchResponse]  # same order as BatchSearchRequest.requests
+
+
+class GetByIdsRequest(BaseModel):
+    ids: conlist(str, min_items=1, max_items=200)
+    as_of: Optional[str] = None  # YYYY-MM-DD; keep only versions in force then
+
+
+class GetByIdsResponse(BaseModel):
+    items: List[LegalSlice]  # request order, duplicates collapsed
+    missing: List[str] = []
 
 
 class AnswerResponse(BaseModel):
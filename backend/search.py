@@ -1,59 +1,238 @@
 from __future__ import annotations
 
-import hashlib
-import math
-import re
+import asyncio
+import logging
+import os
+import threading
+import warnings
+from concurrent.futures import ThreadPoolExecutor, wait
 from dataclasses import dataclass
+from functools import lru_cache
 from datetime import date
-from typing import Iterable, List, Optional, Sequence, Tuple
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
 
 import numpy as np
 from dateutil import parser as date_parser
-from sqlalchemy import String, and_, case, func, literal, or_, select
-from sqlalchemy.orm import Session
+from sqlalchemy import (
+    REAL,
+    Date,
+    Float,
+    Integer,
+    String,
+    and_,
+    any_,
+    bindparam,
+    cast,
+    func,
+    literal,
+    column,
+    select,
+    text,
+    true,
+    union,
+    union_all,
+)
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import ClauseElement
+from sqlalchemy.orm import Session, aliased, selectinload
 from sqlalchemy.dialects import postgresql
 
-from .db import PGVECTOR_DIM, PGVECTOR_METRIC
-from .models import LegalSlice
+from pgvector.sqlalchemy import Vector
+from pgvector.utils import to_db
 
+from .db import (
+    PG_TS_CONFIG,
+    PGVECTOR_DIM,
+    PGVECTOR_METRIC,
+    PGVECTOR_STORAGE,
+    VECTOR_RESCORE_FACTOR,
+)
+from .analysis import analyze_query, load_query_dictionaries
+from .embeddings import get_embedding_provider
+from .jurisdictions import canonical_jurisdiction
+from .models import HalfVector, LegalSlice, LegalSliceVersion
+
+
+logger = logging.getLogger(__name__)
 
 EMBED_DIM = PGVECTOR_DIM
 
-# Simple query expansion map to bridge common user terminology to the language
-# present in the source statutes. This keeps placeholder embeddings useful for
-# production-like demos without pulling in a heavier NLP stack.
-QUERY_SYNONYMS = {
-    "anti-doping": [
-        "anti doping",
-        "prohibited substances",
-        "horse racing",
-        "equestrian sports",
-        "controlled substances",
-    ],
-    "anti doping": [
-        "prohibited substances",
-        "horse racing",
-        "equestrian sports",
-        "controlled substances",
-    ],
-    "doping": [
-        "prohibited substances",
-        "banned substances",
-        "horse racing",
-        "equestrian sports",
-    ],
-}
-
-JURISDICTION_KEYWORDS = {
-    "abu dhabi": ["abu dhabi", "abudhabi"],
-    "dubai": ["dubai"],
-    "sharjah": ["sharjah"],
-    "ajman": ["ajman"],
-    "umm al quwain": ["umm al quwain", "umm-al-quwain", "uaq"],
-    "ras al khaimah": ["ras al khaimah", "rak"],
-    "fujairah": ["fujairah"],
-    "federal": ["federal", "uae"],
-}
+try:
+    QUERY_EMBED_CACHE_SIZE = max(0, int(os.getenv("QUERY_EMBED_CACHE_SIZE", "4096")))
+except ValueError:
+    warnings.warn("Invalid QUERY_EMBED_CACHE_SIZE provided; falling back to 4096.")
+    QUERY_EMBED_CACHE_SIZE = 4096
+
+# Slice states eligible for retrieval; every search path filters on these.
+SEARCHABLE_STATES = ["in_force", "amended"]
+
+# ts_rank_cd weights in {D, C, B, A} order: text (C), path (B) and title (A)
+# keep the 1:2:3 ratio of the old ILIKE CASE scoring, and the scale factor keeps
+# keyword scores in the same range for hybrid fusion.
+KEYWORD_RANK_WEIGHTS = [0.0, 1.0 / 3.0, 2.0 / 3.0, 1.0]
+KEYWORD_SCORE_SCALE = 3.0
+
+# ``pgvector`` ranks in Postgres; ``numpy`` ranks against the in-process
+# VectorIndex built from legal_slice at startup.
+VECTOR_SEARCH_BACKENDS = {"pgvector", "numpy"}
+VECTOR_SEARCH_BACKEND = os.getenv("VECTOR_SEARCH_BACKEND", "pgvector").lower()
+if VECTOR_SEARCH_BACKEND not in VECTOR_SEARCH_BACKENDS:
+    warnings.warn(
+        f"Unsupported VECTOR_SEARCH_BACKEND '{VECTOR_SEARCH_BACKEND}', defaulting to 'pgvector'."
+    )
+    VECTOR_SEARCH_BACKEND = "pgvector"
+
+# ``sequential`` runs each ranker as its own query and fuses in Python;
+# ``fused`` runs all rankers plus reciprocal-rank fusion in one SQL statement;
+# ``concurrent`` runs the three rankers in parallel on separate connections.
+HYBRID_SEARCH_MODES = {"sequential", "fused", "concurrent"}
+HYBRID_SEARCH_MODE = os.getenv("HYBRID_SEARCH_MODE", "sequential").lower()
+if HYBRID_SEARCH_MODE not in HYBRID_SEARCH_MODES:
+    warnings.warn(
+        f"Unsupported HYBRID_SEARCH_MODE '{HYBRID_SEARCH_MODE}', defaulting to 'sequential'."
+    )
+    HYBRID_SEARCH_MODE = "sequential"
+
+try:
+    HYBRID_RRF_K = int(os.getenv("HYBRID_RRF_K", "60"))
+except ValueError:
+    warnings.warn("Invalid HYBRID_RRF_K provided; falling back to 60.")
+    HYBRID_RRF_K = 60
+
+try:
+    HYBRID_STAGE_TIMEOUT = float(os.getenv("HYBRID_STAGE_TIMEOUT", "2.0"))
+except ValueError:
+    warnings.warn("Invalid HYBRID_STAGE_TIMEOUT provided; falling back to 2.0.")
+    HYBRID_STAGE_TIMEOUT = 2.0
+
+try:
+    HYBRID_MAX_WORKERS = max(1, int(os.getenv("HYBRID_MAX_WORKERS", "12")))
+except ValueError:
+    warnings.warn("Invalid HYBRID_MAX_WORKERS provided; falling back to 12.")
+    HYBRID_MAX_WORKERS = 12
+
+_stage_executor: Optional[ThreadPoolExecutor] = None
+_stage_executor_lock = threading.Lock()
+
+# Per-ranker RRF weights mirroring the priors of the sequential fusion
+# (phrase 3.0, vector 1.2, keyword 0.8).
+FUSED_RANKER_WEIGHTS = {"phrase": 3.0, "vector": 1.2, "keyword": 0.8}
+
+# Results served by the default per-ranker depths (phrase 6, vector 8, keyword
+# 16). Ranker depth, and with it the fused order, stays fixed for any limit in
+# this window; larger limits rank in power-of-two tiers beyond it.
+HYBRID_STAGE_WINDOW = 16
+
+# Query expansion map bridging common user terminology to the language of the
+# source statutes; loaded from ``data/query_dictionaries.json``.
+QUERY_SYNONYMS = load_query_dictionaries().synonyms
+
+
+class SliceCandidate(NamedTuple):
+    """Column projection of ``legal_slice`` carried through ranking.
+
+    Holds only what fusion, boosting and citations read, so search never
+    hydrates ``vector_embedding`` and ``text_content`` never leaves the
+    database: citations use the ``snippet`` stored at ingest.
+    """
+
+    id: str
+    level: str
+    name: str
+    emirate: Optional[str]
+    freezone: Optional[str]
+    year: int
+    title: str
+    path: str
+    part: Optional[str]
+    chapter: Optional[str]
+    section: Optional[str]
+    article: Optional[str]
+    rule: Optional[str]
+    clause: Optional[str]
+    item: Optional[str]
+    url: str
+    gazette: Optional[str]
+    snippet: Optional[str]
+
+
+def _candidate_columns() -> List:
+    return [
+        LegalSlice.id,
+        LegalSlice.level,
+        LegalSlice.name,
+        LegalSlice.emirate,
+        LegalSlice.freezone,
+        LegalSlice.year,
+        LegalSlice.title,
+        LegalSlice.path,
+        LegalSlice.part,
+        LegalSlice.chapter,
+        LegalSlice.section,
+        LegalSlice.article,
+        LegalSlice.rule,
+        LegalSlice.clause,
+        LegalSlice.item,
+        LegalSlice.url,
+        LegalSlice.gazette,
+        LegalSlice.snippet,
+    ]
+
+
+def _candidate_rows(rows) -> List[Tuple[SliceCandidate, float]]:
+    """Split ``(*candidate_columns, score)`` rows into candidate/score pairs."""
+    return [(SliceCandidate._make(row[:-1]), row[-1]) for row in rows]
+
+
+def fetch_slices(
+    session: Session, ids: Sequence[str], with_versions: bool = False
+) -> List[LegalSlice]:
+    """Load full ORM rows for the final ids, preserving their order.
+
+    One ``id = ANY(:ids)`` query whatever the number of ids; ``with_versions``
+    loads every slice's history in one more query.
+    """
+    if not ids:
+        return []
+    stmt = select(LegalSlice).where(
+        LegalSlice.id == any_(cast(literal(list(ids)), postgresql.ARRAY(String())))
+    )
+    if with_versions:
+        stmt = stmt.options(selectinload(LegalSlice.versions))
+    records = session.scalars(stmt).all()
+    by_id = {record.id: record for record in records}
+    return [by_id[slice_id] for slice_id in ids if slice_id in by_id]
+
+
+def versions_in_force(
+    session: Session, slice_ids: Sequence[str], as_of: date
+) -> Dict[str, List[LegalSliceVersion]]:
+    """``slice_versions(..., as_of)`` for many slices in one GiST-backed query."""
+    stmt = (
+        select(LegalSliceVersion)
+        .where(
+            LegalSliceVersion.slice_id == any_(cast(literal(list(slice_ids)), postgresql.ARRAY(String()))),
+            LegalSliceVersion.valid_period.contains(cast(literal(as_of), Date())),
+        )
+        .order_by(LegalSliceVersion.slice_id, LegalSliceVersion.event_date)
+    )
+    grouped: Dict[str, List[LegalSliceVersion]] = {slice_id: [] for slice_id in slice_ids}
+    for version in session.scalars(stmt):
+        grouped[version.slice_id].append(version)
+    return grouped
+
+
+def slice_versions(
+    session: Session, slice_id: str, as_of: Optional[date] = None
+) -> List[LegalSliceVersion]:
+    """Version history of a slice, or only the version in force on ``as_of``."""
+    stmt = select(LegalSliceVersion).where(LegalSliceVersion.slice_id == slice_id)
+    if as_of:
+        stmt = stmt.where(
+            LegalSliceVersion.valid_period.contains(cast(literal(as_of), Date()))
+        )
+    return list(session.scalars(stmt.order_by(LegalSliceVersion.event_date)))
 
 
 @dataclass
@@ -69,97 +248,245 @@ def parse_as_of(as_of: Optional[str]) -> Optional[date]:
     return date_parser.isoparse(as_of).date()
 
 
+def embed_many(texts: Sequence[str]) -> np.ndarray:
+    """Embed a batch with the configured provider, shape ``(n, EMBED_DIM)``."""
+    return get_embedding_provider().embed_many(texts)
+
+
 def embed(text: str) -> np.ndarray:
-    """Deterministic placeholder embedding based on hashing."""
-    if not text:
-        return np.zeros(EMBED_DIM, dtype=np.float32)
-    digest = hashlib.sha256(text.encode("utf-8")).digest()
-    values = np.frombuffer(digest, dtype=np.uint8).astype(np.float32)
-    repeats = math.ceil(EMBED_DIM / values.size)
-    tiled = np.tile(values, repeats)[:EMBED_DIM]
-    normalized = (tiled / 255.0) - 0.5
-    norm = np.linalg.norm(normalized)
-    if norm == 0:
-        return normalized
-    return normalized / norm
+    """Embed a single text with the configured provider."""
+    return get_embedding_provider().embed(text)
 
 
-def _build_filtered_query(
-    filters: SearchFilters,
-) -> List:
-    conditions: List = [LegalSlice.state.in_(["in_force", "amended"])]
-
-    if filters.jurisdiction:
-        value = filters.jurisdiction.strip().lower()
-        if value:
-            conditions.append(
-                or_(
-                    func.lower(LegalSlice.level) == value,
-                    func.lower(LegalSlice.name) == value,
-                    func.lower(LegalSlice.emirate) == value,
-                    func.lower(LegalSlice.freezone) == value,
-                )
-            )
+@lru_cache(maxsize=QUERY_EMBED_CACHE_SIZE)
+def _cached_query_embedding(query: str) -> np.ndarray:
+    vector = embed(query)
+    vector.setflags(write=False)
+    return vector
+
 
+def embed_query(query: str) -> np.ndarray:
+    """Memoised query embedding; the returned array is read-only."""
+    return _cached_query_embedding(query)
+
+
+# Which optional filters a statement carries: (jurisdiction, topics, as_of).
+FilterShape = Tuple[bool, bool, bool]
+
+
+def _filter_params(filters: SearchFilters) -> Tuple[FilterShape, dict]:
+    """Split ``filters`` into a statement shape and its bind values."""
+    params: dict = {}
+    jurisdiction = canonical_jurisdiction(filters.jurisdiction)
+    if jurisdiction:
+        params["filter_jurisdiction_keys"] = [jurisdiction]
     if filters.topics:
-        typed_topics = literal(filters.topics, postgresql.ARRAY(String()))
+        params["filter_topics"] = list(filters.topics)
+    if filters.as_of:
+        params["filter_as_of"] = filters.as_of
+    shape = (
+        "filter_jurisdiction_keys" in params,
+        "filter_topics" in params,
+        "filter_as_of" in params,
+    )
+    return shape, params
+
+
+def _filter_conditions(shape: FilterShape) -> List:
+    """Filter conditions over named bind parameters (see ``_filter_params``)."""
+    has_jurisdiction, has_topics, has_as_of = shape
+    conditions: List = [LegalSlice.state.in_(SEARCHABLE_STATES)]
+
+    if has_jurisdiction:
+        # ``@>`` on the GIN-indexed key array; ``= ANY`` could not use it.
+        key = bindparam("filter_jurisdiction_keys", type_=postgresql.ARRAY(String()))
+        conditions.append(LegalSlice.jurisdiction_keys.contains(key))
+
+    if has_topics:
+        typed_topics = bindparam("filter_topics", type_=postgresql.ARRAY(String()))
         conditions.append(LegalSlice.topics.contains(typed_topics))
 
-    if filters.as_of:
-        conditions.append(LegalSlice.effective_from <= filters.as_of)
-        conditions.append(
-            or_(
-                LegalSlice.effective_to.is_(None),
-                LegalSlice.effective_to > filters.as_of,
-            )
-        )
+    if has_as_of:
+        as_of = cast(bindparam("filter_as_of", type_=Date()), Date())
+        conditions.append(_in_force_condition(as_of))
 
     return conditions
 
 
-def _metric_expression(query_vector: List[float]):
+def _in_force_condition(as_of) -> ClauseElement:
+    """Slices in force on ``as_of``.
+
+    A slice with version history is in force while a version other than a
+    repeal covers the day; slices without versions fall back to their
+    ``effective_period``. Each side is its own branch of a ``UNION`` so the
+    planner can drive it from a GiST index (``(slice_id, valid_period)`` and
+    ``effective_period``) instead of probing every candidate row.
+    """
+    versioned = select(LegalSliceVersion.slice_id).where(
+        LegalSliceVersion.valid_period.contains(as_of),
+        LegalSliceVersion.event != "repealed",
+    )
+    unversioned = aliased(LegalSlice, name="unversioned")
+    effective = select(unversioned.id).where(
+        unversioned.effective_period.contains(as_of),
+        ~select(LegalSliceVersion.slice_id)
+        .where(LegalSliceVersion.slice_id == unversioned.id)
+        .exists(),
+    )
+    return LegalSlice.id.in_(union(versioned, effective))
+
+
+def _build_filtered_query(
+    filters: SearchFilters,
+) -> List:
+    shape, params = _filter_params(filters)
+    return [condition.params(params) for condition in _filter_conditions(shape)]
+
+
+def _metric_expression(query_vector: List[float], column=None):
+    column = LegalSlice.vector_embedding if column is None else column
     if PGVECTOR_METRIC == "euclidean":
-        return LegalSlice.vector_embedding.l2_distance(query_vector).label("distance"), "asc"
+        return column.l2_distance(query_vector).label("distance"), "asc"
     if PGVECTOR_METRIC == "ip":
-        return (
-            LegalSlice.vector_embedding.max_inner_product(query_vector).label("similarity"),
-            "desc",
-        )
+        # ``<#>`` yields the negative inner product; ANN indexes only serve it
+        # in ascending order.
+        return column.max_inner_product(query_vector).label("distance"), "asc"
     # default cosine
-    return LegalSlice.vector_embedding.cosine_distance(query_vector).label("distance"), "asc"
+    return column.cosine_distance(query_vector).label("distance"), "asc"
+
+
+def _halfvec_measure(query_vector):
+    """Distance over ``vector_embedding::halfvec``, served by the halfvec index.
+
+    ``query_vector`` is a list of floats or a vector-typed SQL expression.
+    """
+    operator = {"euclidean": "<->", "ip": "<#>"}.get(PGVECTOR_METRIC, "<=>")
+    halfvec = HalfVector(PGVECTOR_DIM)
+    column = cast(LegalSlice.vector_embedding, halfvec)
+    if not isinstance(query_vector, ClauseElement):
+        query_vector = literal(query_vector, Vector(PGVECTOR_DIM))
+    return column.op(operator, return_type=Float())(cast(query_vector, halfvec))
 
 
 def _score_from_measure(value: float) -> float:
     if PGVECTOR_METRIC == "euclidean":
         return 1.0 / (1.0 + float(value))
     if PGVECTOR_METRIC == "ip":
-        return float(value)
+        return -float(value)
     # cosine
     return 1.0 - float(value)
 
 
-def vector_search(
-    session: Session, query: str, filters: SearchFilters, k: int = 8
-) -> Sequence[Tuple[LegalSlice, float]]:
-    query_vector = embed(query).tolist()
+# pgvector's default ``hnsw.ef_search``. An HNSW scan returns at most this
+# many rows, so deeper vector stages raise it for their transaction.
+HNSW_DEFAULT_EF_SEARCH = 40
+
+
+def apply_ann_settings(
+    session: Session,
+    ef_search: Optional[int] = None,
+    probes: Optional[int] = None,
+    k: Optional[int] = None,
+) -> None:
+    """Scope HNSW/IVFFlat recall knobs to the current transaction.
+
+    ``k`` is the number of rows the ANN scan must produce; ``ef_search`` is
+    raised to at least that, otherwise HNSW would silently return fewer.
+    """
+    if k is not None and k > (ef_search or HNSW_DEFAULT_EF_SEARCH):
+        ef_search = k
+    if ef_search is not None:
+        session.execute(text(f"SET LOCAL hnsw.ef_search = {int(ef_search)}"))
+    if probes is not None:
+        session.execute(text(f"SET LOCAL ivfflat.probes = {int(probes)}"))
+
+
+def build_vector_statement(
+    query_vector: List[float],
+    conditions: Sequence,
+    k: int,
+    storage: Optional[str] = None,
+    rescore_factor: int = VECTOR_RESCORE_FACTOR,
+):
+    """Top-``k`` nearest slices, via a halfvec shortlist when ``storage`` says so.
+
+    ``query_vector`` and ``k`` may be bind parameters (see ``_vector_template``).
+    """
     measure_column, ordering = _metric_expression(query_vector)
-    stmt = (
-        select(LegalSlice, measure_column)
-        .where(LegalSlice.vector_embedding.is_not(None))
-        .limit(k)
-    )
-    conditions = _build_filtered_query(filters)
-    if conditions:
-        stmt = stmt.where(and_(*conditions))
+    if (storage or PGVECTOR_STORAGE) == "halfvec":
+        # First stage walks the half-precision index for a wider shortlist;
+        # the outer query rescores it against the float32 column.
+        shortlist = (
+            select(LegalSlice.id)
+            .where(LegalSlice.vector_embedding.is_not(None), *conditions)
+            .order_by(_halfvec_measure(query_vector).asc())
+            .limit(k * rescore_factor)
+            .subquery("shortlist")
+        )
+        stmt = (
+            select(*_candidate_columns(), measure_column)
+            .join(shortlist, LegalSlice.id == shortlist.c.id)
+            .limit(k)
+        )
+    else:
+        stmt = (
+            select(*_candidate_columns(), measure_column)
+            .where(LegalSlice.vector_embedding.is_not(None))
+            .limit(k)
+        )
+        if conditions:
+            stmt = stmt.where(and_(*conditions))
 
     if ordering == "desc":
-        stmt = stmt.order_by(measure_column.desc())
-    else:
-        stmt = stmt.order_by(measure_column.asc())
+        return stmt.order_by(measure_column.desc(), LegalSlice.id)
+    return stmt.order_by(measure_column.asc(), LegalSlice.id)
+
+
+def _ann_depth(k: int) -> int:
+    """Rows the ANN index scan of ``build_vector_statement`` must yield."""
+    return k * VECTOR_RESCORE_FACTOR if PGVECTOR_STORAGE == "halfvec" else k
+
+
+# Search statements are built once per shape and reused, so a request only
+# binds values: SQLAlchemy skips construction, cache-key generation and
+# compilation, and the identical SQL text lets psycopg prepare it server-side
+# (``DB_PREPARE_THRESHOLD``).
+@lru_cache(maxsize=None)
+def _vector_template(shape: FilterShape, storage: str):
+    return build_vector_statement(
+        bindparam("query_vector", type_=Vector(PGVECTOR_DIM)),
+        _filter_conditions(shape),
+        bindparam("k", type_=Integer()),
+        storage=storage,
+    )
 
-    rows = session.execute(stmt).all()
-    results: List[Tuple[LegalSlice, float]] = []
-    for slice_obj, measurement in rows:
+
+def vector_search(
+    session: Session,
+    query: str,
+    filters: SearchFilters,
+    k: int = 8,
+    ef_search: Optional[int] = None,
+    probes: Optional[int] = None,
+    query_vector: Optional[np.ndarray] = None,
+) -> Sequence[Tuple[SliceCandidate, float]]:
+    """Top-``k`` slices nearest to ``query`` (or its precomputed ``query_vector``)."""
+    if query_vector is None:
+        query_vector = embed_query(query)
+    if VECTOR_SEARCH_BACKEND == "numpy":
+        # Imported lazily: vector_index builds on this module's row types.
+        from .vector_index import get_vector_index
+
+        return get_vector_index(session).search(query_vector, filters, k=k)
+
+    shape, params = _filter_params(filters)
+    apply_ann_settings(session, ef_search=ef_search, probes=probes, k=_ann_depth(k))
+    rows = session.execute(
+        _vector_template(shape, PGVECTOR_STORAGE),
+        {"query_vector": query_vector.tolist(), "k": k, **params},
+    ).all()
+    results: List[Tuple[SliceCandidate, float]] = []
+    for slice_obj, measurement in _candidate_rows(rows):
         if measurement is None:
             continue
         score = _score_from_measure(float(measurement))
@@ -167,84 +494,224 @@ def vector_search(
     return results
 
 
-def keyword_search(
-    session: Session, query: str, filters: SearchFilters, k: int = 16
-) -> Sequence[Tuple[LegalSlice, float]]:
-    term_groups = _build_term_groups(query)
-    if not term_groups:
+def batch_vector_search(
+    session: Session,
+    queries: Sequence[str],
+    filters: SearchFilters,
+    k: int = 8,
+    ef_search: Optional[int] = None,
+    probes: Optional[int] = None,
+    vectors: Optional[np.ndarray] = None,
+) -> List[List[Tuple[SliceCandidate, float]]]:
+    """``vector_search`` for many queries sharing one filter set, in input order.
+
+    Queries are embedded in one ``embed_many`` pass (unless ``vectors`` are
+    given) and sent as a single ``vector[]`` parameter; ``unnest ... WITH
+    ORDINALITY`` feeds a ``LATERAL`` top-k per query, so the whole batch is
+    one statement and one round trip.
+    """
+    if not queries:
         return []
+    if vectors is None:
+        vectors = embed_many(queries)
+    if VECTOR_SEARCH_BACKEND == "numpy":
+        from .vector_index import get_vector_index
+
+        index = get_vector_index(session)
+        return [index.search(vector, filters, k=k) for vector in vectors]
+
+    array_literal = "{" + ",".join(f'"{to_db(vector, PGVECTOR_DIM)}"' for vector in vectors) + "}"
+    batch = (
+        func.unnest(cast(literal(array_literal, String()), postgresql.ARRAY(Vector(PGVECTOR_DIM))))
+        .table_valued(column("embedding", Vector(PGVECTOR_DIM)), with_ordinality="ord")
+        .render_derived("batch")
+    )
+    measure_column, _ = _metric_expression(batch.c.embedding)
+    if PGVECTOR_STORAGE == "halfvec":
+        order, depth = _halfvec_measure(batch.c.embedding), k * VECTOR_RESCORE_FACTOR
+    else:
+        order, depth = measure_column, k
+    hits = (
+        select(*_candidate_columns(), measure_column)
+        .where(LegalSlice.vector_embedding.is_not(None), *_build_filtered_query(filters))
+        .order_by(order.asc(), LegalSlice.id)
+        .limit(depth)
+        .lateral("hits")
+    )
+    stmt = select(batch.c.ord, hits).select_from(batch).join(hits, true())
+
+    apply_ann_settings(session, ef_search=ef_search, probes=probes, k=depth)
+    per_query: List[List[Tuple[SliceCandidate, float]]] = [[] for _ in queries]
+    for row in session.execute(stmt):
+        for slice_obj, measurement in _candidate_rows([row[1:]]):
+            if measurement is not None:
+                per_query[row[0] - 1].append((slice_obj, float(measurement)))
+
+    results: List[List[Tuple[SliceCandidate, float]]] = []
+    for hits_for_query in per_query:
+        # halfvec shortlists are rescored here on the float32 distances.
+        hits_for_query.sort(key=lambda item: (item[1], item[0].id))
+        results.append(
+            [(slice_obj, _score_from_measure(value)) for slice_obj, value in hits_for_query[:k]]
+        )
+    return results
 
-    score_expr = None
-    term_conditions = []
-    for group in term_groups:
-        group_conditions = []
-        group_score = None
-        for term in group:
-            pattern = f"%{term}%"
-            term_condition = or_(
-                LegalSlice.title.ilike(pattern),
-                LegalSlice.path.ilike(pattern),
-                LegalSlice.text_content.ilike(pattern),
-            )
-            group_conditions.append(term_condition)
-            term_score = (
-                case((LegalSlice.title.ilike(pattern), 3), else_=0)
-                + case((LegalSlice.path.ilike(pattern), 2), else_=0)
-                + case((LegalSlice.text_content.ilike(pattern), 1), else_=0)
-            )
-            group_score = term_score if group_score is None else group_score + term_score
 
-        if group_conditions:
-            term_conditions.append(or_(*group_conditions))
-        if group_score is not None:
-            score_expr = group_score if score_expr is None else score_expr + group_score
+def _ts_config():
+    return literal(PG_TS_CONFIG, postgresql.REGCONFIG())
 
-    stmt = select(LegalSlice, score_expr.label("score"))
-    if score_expr is None:
-        stmt = stmt.limit(0)
-        return []
 
-    stmt = stmt.where(and_(*term_conditions))
+def _term_tsquery(term, multiword: Optional[bool] = None):
+    """Translate a single search term (or multi-word synonym) into a tsquery."""
+    if multiword is None:
+        multiword = len(term.split()) > 1
+    if multiword:
+        return func.phraseto_tsquery(_ts_config(), term)
+    return func.websearch_to_tsquery(_ts_config(), term)
 
-    conditions = _build_filtered_query(filters)
-    if conditions:
-        stmt = stmt.where(and_(*conditions))
 
-    stmt = stmt.order_by(score_expr.desc(), LegalSlice.year.desc()).limit(k)
-    rows = session.execute(stmt).all()
-    return rows
+def _combine_tsqueries(groups: Sequence[Sequence]):
+    """AND together groups of tsqueries, OR-ing within each group."""
+    group_queries = []
+    for group in groups:
+        group_query = None
+        for term_query in group:
+            group_query = term_query if group_query is None else group_query.op("||")(term_query)
+        if group_query is not None:
+            group_queries.append(group_query)
 
+    combined = None
+    for group_query in group_queries:
+        combined = group_query if combined is None else combined.op("&&")(group_query)
+    return combined
 
-def _build_term_groups(query: str) -> List[List[str]]:
-    normalized = query.lower()
-    base_terms = [term for term in re.split(r"\s+", query.strip()) if term]
-    if not base_terms:
-        return []
 
-    groups: List[List[str]] = []
+def _keyword_tsquery(term_groups: Sequence[Sequence[str]]):
+    """AND together term groups, OR-ing each term with its synonyms."""
+    return _combine_tsqueries([[_term_tsquery(term) for term in group] for group in term_groups])
 
-    for term in base_terms:
-        key = term.lower()
-        group = [term]
-        group.extend(QUERY_SYNONYMS.get(key, []))
-        groups.append(group)
 
-    # Add phrase-level expansions if the phrase wasn't an explicit token
-    for phrase, additions in QUERY_SYNONYMS.items():
-        if phrase in normalized and all(phrase != term.lower() for term in base_terms):
-            groups.append(list(additions))
+def _ts_rank(tsquery, tsvector=None):
+    tsvector = LegalSlice.search_tsv if tsvector is None else tsvector
+    weights = literal(KEYWORD_RANK_WEIGHTS, postgresql.ARRAY(REAL()))
+    return func.ts_rank_cd(weights, tsvector, tsquery)
 
-    return groups
+
+# Keyword statements vary with the query's term groups; the signature (which
+# terms are multi-word, per group) is what shapes the SQL.
+KEYWORD_TEMPLATE_CACHE_SIZE = 256
+
+
+@lru_cache(maxsize=KEYWORD_TEMPLATE_CACHE_SIZE)
+def _keyword_template(shape: FilterShape, signature: Tuple[Tuple[bool, ...], ...]):
+    tsquery = _combine_tsqueries(
+        [
+            [
+                _term_tsquery(bindparam(f"term_{g}_{t}", type_=String()), multiword)
+                for t, multiword in enumerate(group)
+            ]
+            for g, group in enumerate(signature)
+        ]
+    )
+    score_expr = (_ts_rank(tsquery) * KEYWORD_SCORE_SCALE).label("score")
+    return (
+        select(*_candidate_columns(), score_expr)
+        .where(LegalSlice.search_tsv.op("@@")(tsquery), *_filter_conditions(shape))
+        .order_by(score_expr.desc(), LegalSlice.year.desc(), LegalSlice.id)
+        .limit(bindparam("k", type_=Integer()))
+    )
+
+
+def keyword_search(
+    session: Session, query: str, filters: SearchFilters, k: int = 16
+) -> Sequence[Tuple[SliceCandidate, float]]:
+    term_groups = analyze_query(query).term_groups
+    if not term_groups:
+        return []
+
+    shape, params = _filter_params(filters)
+    signature = tuple(tuple(len(term.split()) > 1 for term in group) for group in term_groups)
+    for g, group in enumerate(term_groups):
+        for t, term in enumerate(group):
+            params[f"term_{g}_{t}"] = term
+    rows = session.execute(_keyword_template(shape, signature), {"k": k, **params}).all()
+    return _candidate_rows(rows)
 
 
 def hybrid_search(
-    session: Session, query: str, filters: SearchFilters, limit: int = 10
-) -> List[Tuple[LegalSlice, float]]:
-    phrase_results = phrase_search(session, query, filters, k=min(limit, 6))
-    vector_results = vector_search(session, query, filters, k=min(limit, 8))
-    keyword_results = keyword_search(session, query, filters, k=min(limit * 2, 16))
+    session: Session,
+    query: str,
+    filters: SearchFilters,
+    limit: int = 10,
+    ef_search: Optional[int] = None,
+    probes: Optional[int] = None,
+    mode: Optional[str] = None,
+    vector_results: Optional[Sequence[Tuple[SliceCandidate, float]]] = None,
+    query_vector: Optional[np.ndarray] = None,
+) -> List[Tuple[SliceCandidate, float]]:
+    """Fuse phrase, vector and keyword ranking.
+
+    ``vector_results`` (``hybrid_stage_sizes(limit)[1]`` hits, e.g. from
+    ``batch_vector_search``) replaces the vector stage in the sequential and
+    concurrent modes; fused mode ranks everything in its own statement.
+    ``query_vector`` is the query embedding, if the caller already has it.
+    """
+    mode = (mode or HYBRID_SEARCH_MODE).lower()
+    if mode == "fused":
+        return fused_hybrid_search(
+            session,
+            query,
+            filters,
+            limit=limit,
+            ef_search=ef_search,
+            probes=probes,
+            query_vector=query_vector,
+        )
+    if mode == "concurrent":
+        return concurrent_hybrid_search(
+            session,
+            query,
+            filters,
+            limit=limit,
+            ef_search=ef_search,
+            probes=probes,
+            vector_results=vector_results,
+        )
 
-    combined: dict[str, Tuple[LegalSlice, float]] = {}
+    phrase_k, vector_k, keyword_k = hybrid_stage_sizes(limit)
+    phrase_results = phrase_search(session, query, filters, k=phrase_k)
+    if vector_results is None:
+        vector_results = vector_search(
+            session,
+            query,
+            filters,
+            k=vector_k,
+            ef_search=ef_search,
+            probes=probes,
+            query_vector=query_vector,
+        )
+    keyword_results = keyword_search(session, query, filters, k=keyword_k)
+    return _fuse_ranked_results(
+        phrase_results, vector_results, keyword_results, filters, limit
+    )
+
+
+def hybrid_stage_sizes(limit: int) -> Tuple[int, int, int]:
+    """Rows requested from the phrase, vector and keyword rankers."""
+    if limit <= HYBRID_STAGE_WINDOW:
+        return 6, 8, 16
+    depth = 1 << (limit - 1).bit_length()
+    return depth, depth, depth * 2
+
+
+def _fuse_ranked_results(
+    phrase_results: Sequence[Tuple[SliceCandidate, float]],
+    vector_results: Sequence[Tuple[SliceCandidate, float]],
+    keyword_results: Sequence[Tuple[SliceCandidate, float]],
+    filters: SearchFilters,
+    limit: int,
+) -> List[Tuple[SliceCandidate, float]]:
+    combined: dict[str, Tuple[SliceCandidate, float]] = {}
 
     for rank, (slice_obj, score) in enumerate(phrase_results):
         base_score = max(score, 0.0)
@@ -274,61 +741,472 @@ def hybrid_search(
         if filters.jurisdiction:
             combined[slice_id] = (slice_obj, score + 0.5)
 
-    ranked = sorted(combined.values(), key=lambda item: item[1], reverse=True)
+    # Ties break on id so the order is total, which keyset pagination relies on.
+    ranked = sorted(combined.values(), key=lambda item: (-item[1], item[0].id))
     return ranked[:limit]
 
 
-def phrase_search(
+def _get_stage_executor() -> ThreadPoolExecutor:
+    global _stage_executor
+    with _stage_executor_lock:
+        if _stage_executor is None:
+            _stage_executor = ThreadPoolExecutor(
+                max_workers=HYBRID_MAX_WORKERS, thread_name_prefix="hybrid-stage"
+            )
+        return _stage_executor
+
+
+def _is_statement_timeout(exc: BaseException) -> bool:
+    return isinstance(exc, DBAPIError) and getattr(exc.orig, "sqlstate", None) == "57014"
+
+
+def _set_stage_timeout(stage_session: Session) -> None:
+    timeout_ms = int(HYBRID_STAGE_TIMEOUT * 1000)
+    if timeout_ms > 0:
+        # Let Postgres cancel a stage we have already given up waiting for.
+        stage_session.execute(text(f"SET LOCAL statement_timeout = {timeout_ms}"))
+
+
+def _stage_results(stage_session: Session, ranker, query: str, filters: SearchFilters, **kwargs):
+    _set_stage_timeout(stage_session)
+    return list(ranker(stage_session, query, filters, **kwargs))
+
+
+def _run_stage(bind, ranker, query: str, filters: SearchFilters, **kwargs):
+    """Execute one ranker on its own pooled connection and transaction."""
+    with Session(bind=bind, autoflush=False) as stage_session:
+        return _stage_results(stage_session, ranker, query, filters, **kwargs)
+
+
+def concurrent_hybrid_search(
     session: Session,
     query: str,
     filters: SearchFilters,
-    k: int = 6,
-) -> Sequence[Tuple[LegalSlice, float]]:
-    if not query:
-        return []
-    phrase = " ".join(query.strip().split())
-    if len(phrase.split()) < 2:
+    limit: int = 10,
+    ef_search: Optional[int] = None,
+    probes: Optional[int] = None,
+    vector_results: Optional[Sequence[Tuple[SliceCandidate, float]]] = None,
+) -> List[Tuple[SliceCandidate, float]]:
+    """Dispatch the three rankers in parallel and fuse once all have finished.
+
+    Each ranker gets its own session on ``session``'s engine, so the
+    end-to-end latency is that of the slowest stage. A stage that exceeds
+    ``HYBRID_STAGE_TIMEOUT`` contributes no results instead of failing the
+    request.
+    """
+    bind = session.get_bind()
+    executor = _get_stage_executor()
+    phrase_k, vector_k, keyword_k = hybrid_stage_sizes(limit)
+    stages = {
+        "phrase": executor.submit(
+            _run_stage, bind, phrase_search, query, filters, k=phrase_k
+        ),
+        "keyword": executor.submit(
+            _run_stage, bind, keyword_search, query, filters, k=keyword_k
+        ),
+    }
+    if vector_results is None:
+        stages["vector"] = executor.submit(
+            _run_stage,
+            bind,
+            vector_search,
+            query,
+            filters,
+            k=vector_k,
+            ef_search=ef_search,
+            probes=probes,
+        )
+    timeout = HYBRID_STAGE_TIMEOUT if HYBRID_STAGE_TIMEOUT > 0 else None
+    wait(stages.values(), timeout=timeout)
+
+    results: dict[str, List[Tuple[SliceCandidate, float]]] = {}
+    if vector_results is not None:
+        results["vector"] = list(vector_results)
+    for name, future in stages.items():
+        if not future.done():
+            logger.warning("hybrid_search %s stage timed out after %.2fs", name, timeout)
+            future.cancel()
+            results[name] = []
+            continue
+        exc = future.exception()
+        if exc is not None:
+            if _is_statement_timeout(exc):
+                logger.warning("hybrid_search %s stage cancelled by statement_timeout", name)
+                results[name] = []
+                continue
+            raise exc
+        results[name] = future.result()
+
+    return _fuse_ranked_results(
+        results["phrase"], results["vector"], results["keyword"], filters, limit
+    )
+
+
+async def _run_stage_async(bind, ranker, query: str, filters: SearchFilters, **kwargs):
+    async with AsyncSession(bind=bind, autoflush=False) as stage_session:
+        return await stage_session.run_sync(_stage_results, ranker, query, filters, **kwargs)
+
+
+async def _run_vector_stage_async(bind, query: str, filters: SearchFilters, **kwargs):
+    """The vector stage with embedding and in-process index work off the loop."""
+    async with AsyncSession(bind=bind, autoflush=False) as stage_session:
+        await stage_session.run_sync(_set_stage_timeout)
+        return list(await vector_search_async(stage_session, query, filters, **kwargs))
+
+
+async def concurrent_hybrid_search_async(
+    session: AsyncSession,
+    query: str,
+    filters: SearchFilters,
+    limit: int = 10,
+    ef_search: Optional[int] = None,
+    probes: Optional[int] = None,
+    vector_results: Optional[Sequence[Tuple[SliceCandidate, float]]] = None,
+) -> List[Tuple[SliceCandidate, float]]:
+    """``concurrent_hybrid_search`` with the stages as tasks on the event loop.
+
+    Same timeout semantics; each stage holds its own pooled async connection.
+    Only the vector stage borrows a thread, to embed the query and, on the
+    numpy backend, to scan the in-process index.
+    """
+    bind = session.bind
+    phrase_k, vector_k, keyword_k = hybrid_stage_sizes(limit)
+    stages = {
+        "phrase": asyncio.ensure_future(
+            _run_stage_async(bind, phrase_search, query, filters, k=phrase_k)
+        ),
+        "keyword": asyncio.ensure_future(
+            _run_stage_async(bind, keyword_search, query, filters, k=keyword_k)
+        ),
+    }
+    if vector_results is None:
+        stages["vector"] = asyncio.ensure_future(
+            _run_vector_stage_async(
+                bind,
+                query,
+                filters,
+                k=vector_k,
+                ef_search=ef_search,
+                probes=probes,
+            )
+        )
+    timeout = HYBRID_STAGE_TIMEOUT if HYBRID_STAGE_TIMEOUT > 0 else None
+    await asyncio.wait(stages.values(), timeout=timeout)
+
+    results: dict[str, List[Tuple[SliceCandidate, float]]] = {}
+    if vector_results is not None:
+        results["vector"] = list(vector_results)
+    for name, task in stages.items():
+        if not task.done():
+            logger.warning("hybrid_search %s stage timed out after %.2fs", name, timeout)
+            task.cancel()
+            results[name] = []
+            continue
+        exc = task.exception()
+        if exc is not None:
+            if _is_statement_timeout(exc):
+                logger.warning("hybrid_search %s stage cancelled by statement_timeout", name)
+                results[name] = []
+                continue
+            raise exc
+        results[name] = task.result()
+
+    return _fuse_ranked_results(
+        results["phrase"], results["vector"], results["keyword"], filters, limit
+    )
+
+
+async def hybrid_search_async(
+    session: AsyncSession,
+    query: str,
+    filters: SearchFilters,
+    limit: int = 10,
+    ef_search: Optional[int] = None,
+    probes: Optional[int] = None,
+    mode: Optional[str] = None,
+    vector_results: Optional[Sequence[Tuple[SliceCandidate, float]]] = None,
+) -> List[Tuple[SliceCandidate, float]]:
+    """``hybrid_search`` on an ``AsyncSession``.
+
+    Sequential and fused modes reuse the sync rankers through ``run_sync``:
+    their statements are awaited on the async connection, so no thread is
+    held while Postgres works. Embedding and ``VectorIndex`` work run in a
+    worker thread first, so ``run_sync`` only ever waits on the database.
+    Concurrent mode fans out as asyncio tasks.
+    """
+    mode = (mode or HYBRID_SEARCH_MODE).lower()
+    if mode == "concurrent":
+        return await concurrent_hybrid_search_async(
+            session,
+            query,
+            filters,
+            limit=limit,
+            ef_search=ef_search,
+            probes=probes,
+            vector_results=vector_results,
+        )
+    query_vector = None
+    if mode == "fused":
+        query_vector = await asyncio.to_thread(embed_query, query)
+    elif vector_results is None:
+        vector_results = await vector_search_async(
+            session,
+            query,
+            filters,
+            k=hybrid_stage_sizes(limit)[1],
+            ef_search=ef_search,
+            probes=probes,
+        )
+    return await session.run_sync(
+        hybrid_search,
+        query,
+        filters,
+        limit=limit,
+        ef_search=ef_search,
+        probes=probes,
+        mode=mode,
+        vector_results=vector_results,
+        query_vector=query_vector,
+    )
+
+
+async def vector_search_async(
+    session: AsyncSession,
+    query: str,
+    filters: SearchFilters,
+    k: int = 8,
+    ef_search: Optional[int] = None,
+    probes: Optional[int] = None,
+) -> Sequence[Tuple[SliceCandidate, float]]:
+    query_vector = await asyncio.to_thread(embed_query, query)
+    if VECTOR_SEARCH_BACKEND == "numpy":
+        from .vector_index import get_vector_index_async
+
+        index = await get_vector_index_async(session)
+        return await asyncio.to_thread(index.search, query_vector, filters, k)
+    return await session.run_sync(
+        vector_search,
+        query,
+        filters,
+        k=k,
+        ef_search=ef_search,
+        probes=probes,
+        query_vector=query_vector,
+    )
+
+
+async def batch_vector_search_async(
+    session: AsyncSession,
+    queries: Sequence[str],
+    filters: SearchFilters,
+    k: int = 8,
+    ef_search: Optional[int] = None,
+    probes: Optional[int] = None,
+) -> List[List[Tuple[SliceCandidate, float]]]:
+    if not queries:
         return []
+    vectors = await asyncio.to_thread(embed_many, queries)
+    if VECTOR_SEARCH_BACKEND == "numpy":
+        from .vector_index import get_vector_index_async
 
-    pattern = f"%{phrase}%"
-    stmt = select(LegalSlice).where(
-        or_(
-            LegalSlice.title.ilike(pattern),
-            LegalSlice.path.ilike(pattern),
-            LegalSlice.text_content.ilike(pattern),
+        index = await get_vector_index_async(session)
+        return await asyncio.to_thread(
+            lambda: [index.search(vector, filters, k=k) for vector in vectors]
         )
+    return await session.run_sync(
+        batch_vector_search,
+        queries,
+        filters,
+        k=k,
+        ef_search=ef_search,
+        probes=probes,
+        vectors=vectors,
     )
 
+
+async def fetch_slices_async(
+    session: AsyncSession, ids: Sequence[str], with_versions: bool = False
+) -> List[LegalSlice]:
+    return await session.run_sync(fetch_slices, ids, with_versions)
+
+
+async def versions_in_force_async(
+    session: AsyncSession, slice_ids: Sequence[str], as_of: date
+) -> Dict[str, List[LegalSliceVersion]]:
+    return await session.run_sync(versions_in_force, slice_ids, as_of)
+
+
+async def slice_versions_async(
+    session: AsyncSession, slice_id: str, as_of: Optional[date] = None
+) -> List[LegalSliceVersion]:
+    return await session.run_sync(slice_versions, slice_id, as_of)
+
+
+def fused_hybrid_search(
+    session: Session,
+    query: str,
+    filters: SearchFilters,
+    limit: int = 10,
+    ef_search: Optional[int] = None,
+    probes: Optional[int] = None,
+    query_vector: Optional[np.ndarray] = None,
+) -> List[Tuple[SliceCandidate, float]]:
+    """Run phrase, vector and keyword ranking plus RRF fusion in one statement.
+
+    The filtered candidate set is computed once in a CTE that the full-text
+    rankers read from. The vector ranker is the ``build_vector_statement``
+    query of the sequential path, so it walks the ANN index (honouring
+    ``PGVECTOR_STORAGE``, ``ef_search`` and ``probes``) with the filters
+    applied inside the index scan instead of an exact scan over the CTE.
+    """
     conditions = _build_filtered_query(filters)
-    if conditions:
-        stmt = stmt.where(and_(*conditions))
+    phrase_k, vector_k, keyword_k = hybrid_stage_sizes(limit)
+    # Referenced by two rankers, so Postgres would materialize it by default:
+    # every in-force row copied and the ``@@`` predicates cut off from the
+    # GIN index. Inlined, each ranker scans ``idx_search_tsv`` itself.
+    candidates = (
+        select(LegalSlice.id, LegalSlice.year, LegalSlice.search_tsv)
+        .where(and_(*conditions))
+        .cte("candidates")
+        .prefix_with("NOT MATERIALIZED")
+    )
+
+    def ranked_cte(name, order_by, condition, k):
+        return (
+            select(
+                candidates.c.id,
+                func.row_number().over(order_by=order_by).label("rank"),
+            )
+            .where(condition)
+            .order_by(*order_by)
+            .limit(k)
+            .cte(name)
+        )
+
+    rankers = []
+    analyzed = analyze_query(query)
+    phrase = analyzed.phrase
+    if phrase:
+        tsquery = func.phraseto_tsquery(_ts_config(), phrase)
+        rank_expr = _ts_rank(tsquery, candidates.c.search_tsv)
+        rankers.append(
+            (
+                "phrase",
+                ranked_cte(
+                    "phrase_ranked",
+                    [rank_expr.desc(), candidates.c.year.desc(), candidates.c.id],
+                    candidates.c.search_tsv.op("@@")(tsquery),
+                    phrase_k,
+                ),
+            )
+        )
+
+    if query_vector is None:
+        query_vector = embed_query(query)
+    vector_hits = build_vector_statement(
+        query_vector.tolist(), conditions, vector_k
+    ).subquery("vector_hits")
+    rankers.append(
+        (
+            "vector",
+            select(
+                vector_hits.c.id,
+                func.row_number()
+                .over(order_by=[vector_hits.c.distance.asc(), vector_hits.c.id])
+                .label("rank"),
+            ).cte("vector_ranked"),
+        )
+    )
+
+    term_groups = analyzed.term_groups
+    if term_groups:
+        tsquery = _keyword_tsquery(term_groups)
+        rank_expr = _ts_rank(tsquery, candidates.c.search_tsv)
+        rankers.append(
+            (
+                "keyword",
+                ranked_cte(
+                    "keyword_ranked",
+                    [rank_expr.desc(), candidates.c.year.desc(), candidates.c.id],
+                    candidates.c.search_tsv.op("@@")(tsquery),
+                    keyword_k,
+                ),
+            )
+        )
+
+    contributions = union_all(
+        *[
+            select(
+                ranked.c.id,
+                (
+                    literal(FUSED_RANKER_WEIGHTS[name])
+                    / (literal(HYBRID_RRF_K) + cast(ranked.c.rank, Float()))
+                ).label("score"),
+            )
+            for name, ranked in rankers
+        ]
+    ).subquery("contributions")
+    fused = (
+        select(contributions.c.id, func.sum(contributions.c.score).label("score"))
+        .group_by(contributions.c.id)
+        .order_by(func.sum(contributions.c.score).desc(), contributions.c.id)
+        .limit(limit)
+        .subquery("fused")
+    )
+    stmt = (
+        select(*_candidate_columns(), fused.c.score)
+        .join(fused, LegalSlice.id == fused.c.id)
+        .order_by(fused.c.score.desc(), LegalSlice.id)
+    )
 
-    stmt = stmt.order_by(LegalSlice.year.desc()).limit(k)
+    apply_ann_settings(session, ef_search=ef_search, probes=probes, k=_ann_depth(vector_k))
     rows = session.execute(stmt).all()
-    ranked: List[Tuple[LegalSlice, float]] = []
-    for rank, (slice_obj,) in enumerate(rows):
+    return [(slice_obj, float(score)) for slice_obj, score in _candidate_rows(rows)]
+
+
+@lru_cache(maxsize=None)
+def _phrase_template(shape: FilterShape):
+    tsquery = func.phraseto_tsquery(_ts_config(), bindparam("phrase", type_=String()))
+    return (
+        select(*_candidate_columns())
+        .where(LegalSlice.search_tsv.op("@@")(tsquery), *_filter_conditions(shape))
+        .order_by(_ts_rank(tsquery).desc(), LegalSlice.year.desc(), LegalSlice.id)
+        .limit(bindparam("k", type_=Integer()))
+    )
+
+
+def phrase_search(
+    session: Session,
+    query: str,
+    filters: SearchFilters,
+    k: int = 6,
+) -> Sequence[Tuple[SliceCandidate, float]]:
+    phrase = analyze_query(query).phrase
+    if not phrase:
+        return []
+
+    shape, params = _filter_params(filters)
+    rows = session.execute(_phrase_template(shape), {"phrase": phrase, "k": k, **params}).all()
+    ranked: List[Tuple[SliceCandidate, float]] = []
+    for rank, row in enumerate(rows):
+        slice_obj = SliceCandidate._make(row)
         base_score = 3.0 / (1 + rank)
         ranked.append((slice_obj, base_score))
     return ranked
 
 
-def boost_ranked_results(
-    ranked_results: List[Tuple[LegalSlice, float]], query: str
-) -> List[Tuple[LegalSlice, float]]:
-    query_lower = (query or "").lower()
-    if not query_lower.strip():
-        return ranked_results
-
-    preferred_keyword = None
-    for key, aliases in JURISDICTION_KEYWORDS.items():
-        if any(alias in query_lower for alias in aliases):
-            preferred_keyword = key
-            break
-
-    if not preferred_keyword:
-        return ranked_results
-
-    def matches(record: LegalSlice) -> bool:
+def tiered_ranked_results(
+    ranked_results: List[Tuple[SliceCandidate, float]], query: str
+) -> List[Tuple[SliceCandidate, float, int]]:
+    """Apply the jurisdiction boost and return ``(slice, score, tier)`` rows.
+
+    Tier 0 holds slices matching the jurisdiction named in the query (all
+    slices when it names none) and is listed before tier 1. Rows are ordered
+    by ``(tier, -score, id)``, the key search cursors are built from.
+    """
+    preferred_keyword = analyze_query(query).jurisdiction if (query or "").strip() else None
+
+    def matches(record: SliceCandidate) -> bool:
         targets = [
             record.name or "",
             record.emirate or "",
@@ -340,19 +1218,23 @@ def boost_ranked_results(
             if target
         )
 
-    preferred_bucket: List[Tuple[LegalSlice, float]] = []
-    fallback_bucket: List[Tuple[LegalSlice, float]] = []
-
+    tiered: List[Tuple[SliceCandidate, float, int]] = []
     for slice_obj, score in ranked_results:
-        if matches(slice_obj):
-            preferred_bucket.append((slice_obj, score + 0.8))
+        if not preferred_keyword:
+            tiered.append((slice_obj, score, 0))
+        elif matches(slice_obj):
+            tiered.append((slice_obj, score + 0.8, 0))
         else:
-            fallback_bucket.append((slice_obj, score - 0.15))
+            tiered.append((slice_obj, score - 0.15, 1))
+
+    tiered.sort(key=lambda item: (item[2], -item[1], item[0].id))
+    return tiered
 
-    preferred_bucket.sort(key=lambda item: item[1], reverse=True)
-    fallback_bucket.sort(key=lambda item: item[1], reverse=True)
 
-    return preferred_bucket + fallback_bucket
+def boost_ranked_results(
+    ranked_results: List[Tuple[SliceCandidate, float]], query: str
+) -> List[Tuple[SliceCandidate, float]]:
+    return [(slice_obj, score) for slice_obj, score, _ in tiered_ranked_results(ranked_results, query)]
 
 
 def to_filters(
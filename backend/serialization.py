@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import json
+from datetime import date
+from typing import Any, Dict, Optional, Sequence
+
+from fastapi.responses import JSONResponse
+
+from .schema import Citation, SearchResponse, StructureLocators
+
+try:  # orjson is optional at import time; the stdlib fallback emits the same bytes.
+    import orjson
+except ImportError:  # pragma: no cover - exercised only without orjson installed
+    orjson = None
+
+# Field order of ``schema.StructureLocators``; payload dicts must follow the
+# schema's declaration order to stay byte-identical to FastAPI's output.
+LOCATOR_FIELDS = tuple(StructureLocators.__fields__)
+
+
+def dumps(content: Any) -> bytes:
+    """Compact UTF-8 JSON, byte-identical to ``fastapi.responses.JSONResponse``."""
+    if orjson is not None:
+        return orjson.dumps(content)
+    return json.dumps(
+        content, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")
+    ).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """JSON response for plain dict payloads, rendered with ``dumps``.
+
+    Returning it from an endpoint bypasses ``response_model`` validation and
+    ``jsonable_encoder``, so payloads must already match the schema.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def effective_to(record: Any) -> Optional[date]:
+    """``record.effective_to``, clamped to ``effective_from`` like the
+    generated ``effective_period`` column: rows stored before ``Effective``
+    rejected inverted ranges read back as an empty period."""
+    if record.effective_to is None:
+        return None
+    return max(record.effective_to, record.effective_from)
+
+
+def _locators(source: Any) -> Dict[str, Optional[str]]:
+    return {field: getattr(source, field) for field in LOCATOR_FIELDS}
+
+
+def citation_payload(citation: Citation) -> Dict[str, Any]:
+    """``Citation.dict()`` without pydantic's recursive model walk."""
+    locators = citation.structure_locators
+    return {
+        "id": citation.id,
+        "instrument_title": citation.instrument_title,
+        "structure_path": citation.structure_path,
+        "structure_locators": _locators(locators) if locators is not None else None,
+        "source_url": citation.source_url,
+        "gazette": citation.gazette,
+        "snippet": citation.snippet,
+    }
+
+
+def search_response_payload(response: SearchResponse) -> Dict[str, Any]:
+    return {
+        "query": response.query,
+        "items": [citation_payload(citation) for citation in response.items],
+        "next_cursor": response.next_cursor,
+    }
+
+
+def legal_slice_payload(record: Any, versions: Optional[Sequence[Any]] = None) -> Dict[str, Any]:
+    """``schema.LegalSlice`` as a plain dict, read straight off an ORM row.
+
+    Mirrors ``main.orm_to_schema`` field for field; values were validated by
+    the schema when the slice was ingested.
+    """
+    return {
+        "id": record.id,
+        "jurisdiction": {
+            "level": record.level,
+            "name": record.name,
+            "emirate": record.emirate,
+            "freezone": record.freezone,
+        },
+        "source": {
+            "portal": record.portal,
+            "url": record.url,
+            "gazette": record.gazette,
+        },
+        "instrument": {
+            "type": record.type,
+            "number": record.number,
+            "year": record.year,
+            "title": record.title,
+            "issuer": record.issuer,
+            "official_language": record.official_language,
+        },
+        "structure": {
+            "granularity": record.granularity,
+            "path": record.path,
+            "locators": _locators(record),
+        },
+        "text_content": record.text_content,
+        "text_hash": record.text_hash,
+        "primary_lang": record.primary_lang,
+        "topics": list(record.topics or []),
+        "state": record.state,
+        "effective": {
+            "from_date": record.effective_from.isoformat(),
+            "to_date": effective_to(record).isoformat() if record.effective_to else None,
+            "basis": None,
+        },
+        "versions": [
+            {
+                "version_id": version.version_id,
+                "event": version.event,
+                "date": version.event_date.isoformat(),
+                "by_instrument": version.by_instrument,
+                "by_url": version.by_url,
+            }
+            for version in (record.versions if versions is None else versions)
+        ],
+    }
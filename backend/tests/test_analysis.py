@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+import random
+import string
+
+from backend.analysis import PatternMatcher, analyze_query, build_analyzer
+
+
+def test_matcher_agrees_with_substring_checks():
+    rng = random.Random(3)
+    patterns = {"".join(rng.choices("abc ", k=rng.randint(1, 5))) for _ in range(300)}
+    matcher = PatternMatcher(patterns)
+    for _ in range(200):
+        text = "".join(rng.choices("abcd ", k=rng.randint(0, 30)))
+        assert matcher.find(text) == {pattern for pattern in patterns if pattern in text}
+
+
+def test_analysis_expands_synonyms_and_detects_jurisdiction():
+    analyzed = analyze_query("Anti Doping rules in RAK")
+
+    assert analyzed.phrase == "Anti Doping rules in RAK"
+    assert analyzed.base_terms == ("Anti", "Doping", "rules", "in", "RAK")
+    # "doping" expands per token; "anti doping" is a phrase-level expansion.
+    assert "banned substances" in analyzed.term_groups[1]
+    assert analyzed.term_groups[-1][0] == "prohibited substances"
+    assert analyzed.jurisdiction == "ras al khaimah"
+    assert analyze_query("Anti Doping rules in RAK") is analyzed
+    assert analyze_query("!!! ?").term_groups == ()
+
+
+def test_large_dictionaries_compile_into_one_matcher():
+    rng = random.Random(5)
+    synonyms = {
+        "".join(rng.choices(string.ascii_lowercase, k=12)): ["expansion"] for _ in range(5000)
+    }
+    analyzer = build_analyzer(
+        {**synonyms, "tenancy deposit": ["security deposit"]},
+        {"dubai": ["dubai"], "federal": ["federal", "uae"]},
+    )
+
+    analyzed = analyzer.analyze("UAE tenancy deposit refund")
+    assert analyzed.jurisdiction == "federal"
+    assert ("security deposit",) in analyzed.term_groups
+    assert len(analyzed.term_groups) == 5
@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+from backend import cache as cache_module
+from backend.cache import CorpusVersionTracker, TTLCache
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_lru_eviction_and_hit_counters():
+    store = TTLCache(maxsize=2, ttl=60)
+    store.set("a", 1)
+    store.set("b", 2)
+    assert store.get("a") == 1  # "a" becomes most recently used
+    store.set("c", 3)
+
+    assert store.get("b") is None
+    assert store.get("a") == 1
+    assert store.get("c") == 3
+
+    stats = store.stats()
+    assert stats["hits"] == 3
+    assert stats["misses"] == 1
+    assert stats["evictions"] == 1
+    assert stats["size"] == 2
+
+
+def test_entries_expire_after_ttl(monkeypatch):
+    clock = _Clock()
+    monkeypatch.setattr(cache_module.time, "monotonic", clock)
+    store = TTLCache(maxsize=8, ttl=10)
+    store.set("query", "response")
+
+    clock.now += 9
+    assert store.get("query") == "response"
+    clock.now += 2
+    assert store.get("query") is None
+    assert store.stats()["expirations"] == 1
+
+
+def test_corpus_version_change_invalidates_entries():
+    store = TTLCache(maxsize=8, ttl=60)
+    store.sync_version(1)
+    store.set("query", "stale")
+    store.sync_version(1)
+    assert store.get("query") == "stale"
+
+    store.sync_version(2)
+    assert store.get("query") is None
+    assert store.stats()["invalidations"] == 1
+
+
+def test_version_tracker_throttles_lookups(monkeypatch):
+    clock = _Clock()
+    monkeypatch.setattr(cache_module.time, "monotonic", clock)
+    calls = []
+
+    def loader(session):
+        calls.append(session)
+        return len(calls)
+
+    tracker = CorpusVersionTracker(loader, interval=5)
+    assert tracker.current("s") == 1
+    clock.now += 4
+    assert tracker.current("s") == 1
+    clock.now += 2
+    assert tracker.current("s") == 2
+    assert len(calls) == 2
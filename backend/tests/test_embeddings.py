@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from backend.embeddings import (
+    EmbeddingProvider,
+    HashEmbeddingProvider,
+    create_provider,
+    get_embedding_provider,
+)
+from backend.search import EMBED_DIM, embed, embed_many, embed_query
+
+
+def test_embed_many_matches_single_embeddings():
+    texts = ["Tenancy deposit procedures", "", "قانون العمل", "Tenancy deposit procedures"]
+    matrix = embed_many(texts)
+
+    assert matrix.shape == (len(texts), EMBED_DIM)
+    assert matrix.dtype == np.float32
+    for row, text in zip(matrix, texts):
+        np.testing.assert_array_equal(row, embed(text))
+    assert not matrix[1].any()
+    np.testing.assert_allclose(np.linalg.norm(matrix[[0, 2]], axis=1), 1.0, rtol=1e-5)
+
+
+def test_embed_query_is_memoised_and_read_only():
+    first = embed_query("labour contract termination")
+    second = embed_query("labour contract termination")
+
+    assert first is second
+    assert not first.flags.writeable
+    np.testing.assert_array_equal(first, embed("labour contract termination"))
+
+
+def test_hash_provider_is_default_and_batches_across_workers():
+    assert isinstance(get_embedding_provider(), HashEmbeddingProvider)
+    texts = [f"article {index} tenancy deposit" for index in range(50)]
+
+    pooled = HashEmbeddingProvider(dim=EMBED_DIM, batch_size=8, workers=2)
+    try:
+        np.testing.assert_array_equal(pooled.embed_many(texts), embed_many(texts))
+        np.testing.assert_array_equal(pooled.submit_many(texts).result(), embed_many(texts))
+        # Workers are never forked from a caller that may be running threads.
+        assert pooled._get_pool()._mp_context.get_start_method() in {"forkserver", "spawn"}
+    finally:
+        pooled.close()
+
+
+def test_unknown_provider_is_rejected():
+    with pytest.raises(RuntimeError):
+        create_provider("does-not-exist")
+
+
+def test_providers_must_implement_embed_batch():
+    with pytest.raises(TypeError):
+        EmbeddingProvider()
+
+    class Incomplete(EmbeddingProvider):
+        name = "incomplete"
+
+    with pytest.raises(TypeError):
+        Incomplete()
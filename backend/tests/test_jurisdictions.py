@@ -0,0 +1,17 @@
+from __future__ import annotations
+
+from backend.jurisdictions import canonical_jurisdiction, jurisdiction_keys
+
+
+def test_aliases_resolve_to_canonical_keys():
+    assert canonical_jurisdiction(" UAE ") == "federal"
+    assert canonical_jurisdiction("AbuDhabi") == "abu dhabi"
+    assert canonical_jurisdiction("Umm-Al-Quwain") == "umm al quwain"
+    assert canonical_jurisdiction("DIFC") == "difc"
+    assert canonical_jurisdiction("  ") is None
+
+
+def test_slice_keys_cover_raw_values_and_aliases():
+    assert jurisdiction_keys("federal", "UAE") == ["federal", "uae"]
+    assert jurisdiction_keys("emirate", "Abu  Dhabi", "Abu Dhabi") == ["emirate", "abu dhabi"]
+    assert jurisdiction_keys("freezone", "DIFC", "Dubai", "DIFC") == ["freezone", "difc", "dubai"]
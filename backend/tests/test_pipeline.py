@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import threading
+
+import pytest
+
+from backend.embeddings import create_provider
+from backend.utils.pipeline import Pipeline
+from backend.utils import seed_loader
+from backend.utils.seed_loader import _ParsedBatch, embed_batches, vector_literals
+
+
+def test_pipeline_preserves_order_and_reports_stage_metrics():
+    batches = [list(range(start, start + 10)) for start in range(0, 100, 10)]
+
+    def double(items):
+        for batch in items:
+            yield [value * 2 for value in batch]
+
+    pipeline = Pipeline("parse", batches, queue_depth=2, sink_name="write").add_stage("double", double)
+    assert [value for batch in pipeline for value in batch] == [value * 2 for value in range(100)]
+    assert [stage.name for stage in pipeline.metrics] == ["parse", "double", "write"]
+    assert all(stage.records == 100 and stage.items == 10 for stage in pipeline.metrics)
+    assert all(stage.busy >= 0 for stage in pipeline.metrics)
+
+
+def test_bounded_queues_hold_back_the_producer():
+    produced = []
+    release = threading.Event()
+
+    def source():
+        for index in range(50):
+            produced.append(index)
+            yield [index]
+
+    def gate(items):
+        release.wait(timeout=5)
+        yield from items
+
+    pipeline = Pipeline("parse", source(), queue_depth=2).add_stage("gate", gate)
+    consumed = iter(pipeline)
+    first = []
+    waiter = threading.Thread(target=lambda: first.append(next(consumed)))
+    waiter.start()
+    waiter.join(timeout=0.5)
+    # One item in hand plus a full queue; the source cannot run further ahead.
+    assert len(produced) <= 3
+    release.set()
+    waiter.join()
+    assert first == [[0]] and len(list(consumed)) == 49
+
+
+def test_stage_errors_stop_the_pipeline_and_reach_the_consumer():
+    def explode(items):
+        for batch in items:
+            if batch == [3]:
+                raise RuntimeError("embedding failed")
+            yield batch
+
+    pipeline = Pipeline("parse", ([index] for index in range(1000)), queue_depth=1)
+    pipeline.add_stage("embed", explode)
+    with pytest.raises(RuntimeError, match="embedding failed"):
+        list(pipeline)
+
+
+def test_embed_batches_only_embed_flagged_records():
+    class Record:
+        def __init__(self, text):
+            self.text_content = text
+
+    provider = create_provider(workers=1)
+    records = [Record("tenancy deposit"), Record("labour permit"), Record("visa rules")]
+    batches = [
+        _ParsedBatch(records, 3, embed=[True, False, True]),
+        _ParsedBatch(records[1:2], 4, embed=[False]),
+        _ParsedBatch(records[:1], 5),
+    ]
+    try:
+        results = list(embed_batches(provider, batches))
+    finally:
+        provider.close()
+
+    expected = vector_literals(provider.embed_many(["tenancy deposit", "visa rules"]))
+    assert results[0][1] == [expected[0], None, expected[1]]
+    assert results[1][1] == [None]
+    assert results[2][1] == expected[:1]
+
+
+def test_embed_workers_default_to_the_affinity_mask(monkeypatch):
+    monkeypatch.setattr(seed_loader.os, "sched_getaffinity", lambda pid: {0, 2}, raising=False)
+    monkeypatch.setattr(seed_loader.os, "cpu_count", lambda: 64)
+    assert seed_loader.available_cpus() == 2
+
+    monkeypatch.delattr(seed_loader.os, "sched_getaffinity")
+    assert seed_loader.available_cpus() == 64
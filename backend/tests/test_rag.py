@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import pytest
+
+from backend import rag
+from backend.rag import InvalidCursor, SearchCursor, decode_cursor, encode_cursor
+from backend.schema import SearchRequest
+from backend.search import SliceCandidate
+
+
+def test_cursor_round_trips_exact_scores():
+    cursor = SearchCursor(tier=1, score=0.1 + 0.2, id="federal#law-1#art3", offset=8, depth=16)
+    token = encode_cursor(cursor)
+
+    assert "=" not in token
+    assert decode_cursor(token) == cursor
+    assert decode_cursor(None) is None
+
+
+@pytest.mark.parametrize(
+    "token",
+    [
+        "not-base64!",
+        "WzEsMl0",
+        "e30",
+        encode_cursor(SearchCursor(0, 1.0, "a", offset=16, depth=16)),
+    ],
+)
+def test_malformed_cursor_is_rejected(token):
+    with pytest.raises(InvalidCursor):
+        decode_cursor(token)
+
+
+def _candidate(index: int) -> SliceCandidate:
+    name = "Dubai" if index % 3 else "Abu Dhabi"
+    return SliceCandidate(
+        id=f"slice-{index:03d}",
+        level="emirate",
+        name=name,
+        emirate=name,
+        freezone=None,
+        year=2020,
+        title="Tenancy Law",
+        path=f"Article {index}",
+        part=None,
+        chapter=None,
+        section=None,
+        article=str(index),
+        rule=None,
+        clause=None,
+        item=None,
+        url="https://example.com",
+        gazette=None,
+        snippet="",
+    )
+
+
+def test_pages_rank_as_deep_as_their_position_needs(monkeypatch):
+    depths = []
+
+    def hybrid_search(session, query, filters, limit, **kwargs):
+        # Like RRF over depth-limited rankers, the order depends on the depth.
+        depths.append(limit)
+        ranked = [(_candidate(index), ((index * 7919 + limit) % 101) / 101) for index in range(200)]
+        ranked.sort(key=lambda item: (-item[1], item[0].id))
+        return ranked[:limit]
+
+    monkeypatch.setattr(rag.search, "hybrid_search", hybrid_search)
+    query = "dubai tenancy deposit"
+
+    pages, cursor = [], None
+    while True:
+        page = rag._search(None, SearchRequest(query=query, page_size=7, cursor=cursor))
+        pages.append([item.id for item in page.items])
+        cursor = page.next_cursor
+        if cursor is None:
+            break
+
+    # The first page ranks one bucket, not a fixed deep prefix; later pages
+    # double the depth only as the offset needs it, and paging reaches the end.
+    assert depths[:3] == [16, 16, 32]
+    assert depths == sorted(depths) and depths[-1] == 256
+    assert sum(len(page) for page in pages) == 200
+
+    # Pages sharing a depth continue one order, exactly as a single fetch.
+    page_depths, offset = list(depths), 0
+    for depth in sorted(set(page_depths)):
+        count = page_depths.count(depth)
+        single = rag.search.tiered_ranked_results(hybrid_search(None, query, None, depth), query)
+        served = [slice_id for page in pages[:count] for slice_id in page]
+        assert served == [slice_obj.id for slice_obj, _, _ in single[offset : offset + len(served)]]
+        offset += len(served)
+        pages = pages[count:]
+
+
+def test_cache_key_keeps_the_exact_query_text():
+    keys = {
+        rag._cache_key("search", SearchRequest(query=query))
+        for query in ("Dubai tenancy", "dubai tenancy", "dubai  tenancy")
+    }
+    assert len(keys) == 3
@@ -3,11 +3,56 @@ from __future__ import annotations
 from datetime import date, timedelta
 
 import pytest
-from sqlalchemy import delete
+from sqlalchemy import delete, text
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import ClauseElement, Executable
 
 from backend.db import get_session, init_db
 from backend.models import LegalSlice as LegalSliceModel
-from backend.search import hybrid_search, to_filters, vector_search
+from backend.search import (
+    embed_query,
+    hybrid_search,
+    keyword_search,
+    phrase_search,
+    to_filters,
+    vector_search,
+)
+
+
+class _Explain(Executable, ClauseElement):
+    inherit_cache = False
+
+    def __init__(self, statement) -> None:
+        self.statement = statement
+
+
+@compiles(_Explain)
+def _compile_explain(element, compiler, **kw):
+    return "EXPLAIN " + compiler.process(element.statement, **kw)
+
+
+def _plan(session, statement) -> str:
+    """The plan of ``statement`` with sequential scans disabled, so the test
+    shows which indexes the planner *can* use on a tiny table."""
+    session.execute(text("SET LOCAL enable_seqscan = off"))
+    return "\n".join(session.execute(_Explain(statement)).scalars())
+
+
+class _CaptureStatement:
+    """Session stand-in that runs ``SET`` statements and keeps the query."""
+
+    def __init__(self, session) -> None:
+        self.session = session
+        self.statement = None
+
+    def execute(self, statement, params=None):
+        if str(statement).startswith("SET "):
+            return self.session.execute(statement, params)
+        self.statement = statement
+        return self
+
+    def all(self):
+        return []
 
 
 @pytest.fixture(autouse=True)
@@ -80,6 +125,68 @@ def test_vector_search_returns_result():
     assert "slice-1" in ids
 
 
+def test_vector_search_scopes_ann_settings_to_the_transaction():
+    from sqlalchemy import text
+
+    _create_slice(slice_id="slice-1", text="Tenancy deposit procedures", effective_from=date.today())
+
+    with get_session() as session:
+        vector_search(session, "tenancy deposit", to_filters(), k=5, ef_search=37, probes=3)
+        assert session.execute(text("SELECT current_setting('hnsw.ef_search')")).scalar() == "37"
+        assert session.execute(text("SELECT current_setting('ivfflat.probes')")).scalar() == "3"
+        session.rollback()
+        assert session.execute(text("SELECT current_setting('hnsw.ef_search', true)")).scalar() != "37"
+
+
+def test_vector_index_follows_config_and_ivfflat_waits_for_rows(monkeypatch):
+    from sqlalchemy import text
+
+    from backend import db
+
+    def vector_indexes():
+        with db.engine.connect() as conn:
+            return set(
+                conn.execute(
+                    text(
+                        "SELECT indexname FROM pg_indexes WHERE tablename = 'legal_slice' "
+                        "AND indexname LIKE 'idx_vector_embedding%'"
+                    )
+                ).scalars()
+            )
+
+    with db.engine.begin() as conn:
+        # Name used before the metric was part of it.
+        conn.execute(
+            text(
+                "CREATE INDEX IF NOT EXISTS idx_vector_embedding_hnsw ON legal_slice "
+                "USING hnsw (vector_embedding vector_l2_ops)"
+            )
+        )
+        db.ensure_vector_index(conn)
+    assert vector_indexes() == {db.vector_index_name()}
+
+    monkeypatch.setattr(db, "PGVECTOR_INDEX", "ivfflat")
+    with db.engine.begin() as conn:
+        db.ensure_vector_index(conn)
+    assert vector_indexes() == set()  # nothing to train centroids on yet
+
+    _create_slice(slice_id="slice-1", text="Tenancy deposit procedures", effective_from=date.today())
+    with db.engine.begin() as conn:
+        db.ensure_vector_index(conn, rebuild=True)
+    assert vector_indexes() == {db.vector_index_name("ivfflat")}
+
+    monkeypatch.undo()
+    db.init_db()
+    assert vector_indexes() == {db.vector_index_name()}
+
+    # New build parameters replace the index instead of keeping the old one.
+    monkeypatch.setattr(db, "PGVECTOR_HNSW_M", db.PGVECTOR_HNSW_M * 2)
+    with db.engine.begin() as conn:
+        db.ensure_vector_index(conn)
+    assert vector_indexes() == {db.vector_index_name()}
+    assert f"_m{db.PGVECTOR_HNSW_M}_" in db.vector_index_name()
+
+
 def test_as_of_filter_excludes_future_entries():
     today = date.today()
     _create_slice(slice_id="slice-active", text="Rules currently active", effective_from=today - timedelta(days=10))
@@ -96,3 +203,455 @@ def test_as_of_filter_excludes_future_entries():
     returned_ids = [row[0].id for row in ranked]
     assert "slice-active" in returned_ids
     assert "slice-future" not in returned_ids
+
+
+def test_keyword_and_phrase_search_use_full_text_index():
+    today = date.today()
+    _create_slice(slice_id="slice-deposit", text="Tenancy deposit procedures", effective_from=today)
+    _create_slice(slice_id="slice-labour", text="Employment contract termination", effective_from=today)
+
+    with get_session() as session:
+        filters = to_filters(jurisdiction="Dubai")
+        keyword_ids = [row[0].id for row in keyword_search(session, "deposit", filters, k=5)]
+        phrase_ids = [row[0].id for row in phrase_search(session, "tenancy deposit", filters, k=5)]
+        missing = phrase_search(session, "deposit tenancy", filters, k=5)
+
+    assert keyword_ids == ["slice-deposit"]
+    assert phrase_ids == ["slice-deposit"]
+    assert not missing
+
+
+def test_fused_mode_applies_filters_in_single_statement():
+    today = date.today()
+    _create_slice(slice_id="slice-active", text="Rules currently active", effective_from=today - timedelta(days=10))
+    _create_slice(
+        slice_id="slice-future",
+        text="Future rules",
+        effective_from=today + timedelta(days=10),
+    )
+
+    with get_session() as session:
+        filters = to_filters(jurisdiction="Dubai", as_of=today.isoformat())
+        ranked = hybrid_search(session, "rules", filters, limit=10, mode="fused")
+
+    returned_ids = [row[0].id for row in ranked]
+    assert returned_ids[0] == "slice-active"
+    assert "slice-future" not in returned_ids
+
+
+def test_concurrent_mode_matches_sequential_ranking():
+    today = date.today()
+    _create_slice(slice_id="slice-deposit", text="Tenancy deposit procedures", effective_from=today)
+    _create_slice(slice_id="slice-refund", text="Deposit refund rules", effective_from=today)
+
+    with get_session() as session:
+        filters = to_filters(jurisdiction="Dubai")
+        sequential = hybrid_search(session, "tenancy deposit", filters, limit=5)
+        concurrent = hybrid_search(session, "tenancy deposit", filters, limit=5, mode="concurrent")
+
+    assert [row[0].id for row in concurrent] == [row[0].id for row in sequential]
+
+
+def test_numpy_vector_index_matches_pgvector_ranking(tmp_path):
+    from backend.search import embed_query
+    from backend.vector_index import VectorIndex
+
+    today = date.today()
+    for index, text in enumerate(["Tenancy deposit procedures", "Deposit refund rules", "Labour permits"]):
+        _create_slice(slice_id=f"slice-{index}", text=text, effective_from=today)
+
+    with get_session() as session:
+        filters = to_filters(jurisdiction="Dubai")
+        expected = vector_search(session, "tenancy deposit", filters, k=3)
+        index = VectorIndex.load(session, path=str(tmp_path / "index.npy"))
+
+    actual = index.search(embed_query("tenancy deposit"), filters, k=3)
+    assert [row[0] for row in actual] == [row[0] for row in expected]
+    for (_, expected_score), (_, actual_score) in zip(expected, actual):
+        assert abs(expected_score - actual_score) < 1e-5
+
+
+def test_jurisdiction_filter_uses_canonical_keys():
+    today = date.today()
+    _create_slice(slice_id="slice-dubai", text="Tenancy deposit procedures", effective_from=today)
+
+    with get_session() as session:
+        stored = session.get(LegalSliceModel, "slice-dubai").jurisdiction_keys
+        matched = {
+            value: [row[0].id for row in vector_search(session, "deposit", to_filters(jurisdiction=value))]
+            for value in (" DUBAI ", "emirate", "federal")
+        }
+
+    assert stored == ["emirate", "dubai"]
+    assert matched == {" DUBAI ": ["slice-dubai"], "emirate": ["slice-dubai"], "federal": []}
+
+
+def test_init_db_data_migrations_run_once():
+    from sqlalchemy import text
+
+    from backend import db
+
+    calls = []
+    with db.engine.begin() as conn:
+        conn.execute(text("DELETE FROM schema_migration WHERE name = 'test_run_once'"))
+    for _ in range(2):
+        with db.engine.begin() as conn:
+            db.run_once(conn, "test_run_once", calls.append)
+    with db.engine.begin() as conn:
+        conn.execute(text("DELETE FROM schema_migration WHERE name = 'test_run_once'"))
+        applied = set(conn.execute(text("SELECT name FROM schema_migration")).scalars())
+
+    assert len(calls) == 1
+    assert {"backfill_jurisdiction_keys", "backfill_snippets"} <= applied
+
+
+def test_versions_resolve_point_in_time():
+    from sqlalchemy.dialects.postgresql import Range
+
+    from backend.models import LegalSliceVersion
+    from backend.search import slice_versions
+
+    _create_slice(
+        slice_id="slice-versioned",
+        text="Tenancy deposit procedures",
+        effective_from=date(2015, 1, 1),
+        effective_to=date(2030, 1, 1),
+    )
+    with get_session() as session:
+        for version_id, event, start, end in (
+            ("v1", "enacted", date(2015, 1, 1), date(2019, 1, 1)),
+            ("v2", "amended", date(2019, 1, 1), date(2022, 1, 1)),
+            ("v3", "amended", date(2022, 1, 1), date(2026, 1, 1)),
+            ("v4", "repealed", date(2026, 1, 1), date(2030, 1, 1)),
+        ):
+            session.add(
+                LegalSliceVersion(
+                    slice_id="slice-versioned",
+                    version_id=version_id,
+                    event=event,
+                    event_date=start,
+                    valid_period=Range(start, end, bounds="[)"),
+                )
+            )
+        session.commit()
+
+        in_force = slice_versions(session, "slice-versioned", date(2021, 6, 1))
+        history = slice_versions(session, "slice-versioned")
+        outside = vector_search(session, "deposit", to_filters(as_of="2031-01-01"))
+        amended = vector_search(session, "deposit", to_filters(as_of="2021-06-01"))
+        # Inside effective_from/effective_to, but the repeal version is in force.
+        repealed = vector_search(session, "deposit", to_filters(as_of="2027-01-01"))
+
+    assert [version.version_id for version in in_force] == ["v2"]
+    assert [version.version_id for version in history] == ["v1", "v2", "v3", "v4"]
+    assert outside == []
+    assert [candidate.id for candidate, _ in amended] == ["slice-versioned"]
+    assert repealed == []
+
+
+def test_numpy_index_orders_duplicate_embeddings_like_sql(tmp_path):
+    from backend.vector_index import VectorIndex
+
+    today = date.today()
+    for index in (3, 0, 4, 1, 2):
+        _create_slice(slice_id=f"s{index:03d}", text="Tenancy deposit rule", effective_from=today)
+
+    with get_session() as session:
+        expected = vector_search(session, "tenancy deposit", to_filters(), k=3)
+        index = VectorIndex.load(session, str(tmp_path / "vectors.npy"))
+
+    query = embed_query("tenancy deposit")
+    results = index.search(query, to_filters(), k=3)
+    assert [candidate.id for candidate, _ in expected] == ["s000", "s001", "s002"]
+    assert [candidate.id for candidate, _ in results] == ["s000", "s001", "s002"]
+
+
+def test_as_of_filter_is_driven_by_the_gist_indexes():
+    from sqlalchemy import select
+
+    from backend.search import _build_filtered_query
+
+    statement = select(LegalSliceModel.id).where(
+        *_build_filtered_query(to_filters(as_of="2021-06-01"))
+    )
+    with get_session() as session:
+        plan = _plan(session, statement)
+
+    assert "idx_slice_version_period" in plan
+    assert "idx_effective_period" in plan
+
+
+def test_search_pages_follow_cursor_without_gaps_or_repeats():
+    from backend.rag import run_search
+    from backend.schema import SearchRequest
+
+    today = date.today()
+    for index in range(7):
+        _create_slice(slice_id=f"slice-{index}", text=f"Tenancy deposit rule {index}", effective_from=today)
+
+    with get_session() as session:
+        # All pages fit the first ranking bucket, so they continue one order.
+        everything = run_search(session, SearchRequest(query="tenancy deposit", page_size=15))
+        paged, cursor = [], None
+        while True:
+            page = run_search(
+                session, SearchRequest(query="tenancy deposit", page_size=3, cursor=cursor)
+            )
+            paged.extend(item.id for item in page.items)
+            cursor = page.next_cursor
+            if cursor is None:
+                break
+
+    assert everything.next_cursor is None
+    assert paged == [item.id for item in everything.items]
+    assert len(paged) == 7
+
+
+def test_search_streams_ndjson_when_requested():
+    import json
+
+    from fastapi.testclient import TestClient
+
+    from backend.main import app
+
+    today = date.today()
+    for index in range(3):
+        _create_slice(slice_id=f"slice-{index}", text=f"Tenancy deposit rule {index}", effective_from=today)
+
+    with TestClient(app) as client:
+        response = client.post(
+            "/search",
+            json={"query": "tenancy deposit", "page_size": 2},
+            headers={"Accept": "application/x-ndjson"},
+        )
+
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert len(lines) == 3
+    assert all("snippet" in line for line in lines[:2])
+    assert lines[-1]["query"] == "tenancy deposit"
+    assert lines[-1]["next_cursor"]
+
+
+def test_batch_search_matches_single_requests_in_input_order():
+    from backend.rag import RESULT_CACHE, run_search, run_search_batch
+    from backend.schema import SearchRequest
+    from backend.search import batch_vector_search
+
+    today = date.today()
+    for index, text in enumerate(["Tenancy deposit procedures", "Deposit refund rules", "Labour permits"]):
+        _create_slice(slice_id=f"slice-{index}", text=text, effective_from=today)
+
+    requests = [
+        SearchRequest(query="tenancy deposit"),
+        SearchRequest(query="labour permits", jurisdiction="Dubai"),
+        SearchRequest(query="refund", page_size=1),
+        SearchRequest(query="tenancy deposit"),
+    ]
+    with get_session() as session:
+        filters = to_filters()
+        batched_vectors = batch_vector_search(session, ["tenancy deposit", "labour"], filters, k=3)
+        single_vectors = [vector_search(session, query, filters, k=3) for query in ("tenancy deposit", "labour")]
+
+        RESULT_CACHE.clear()
+        batched = run_search_batch(session, requests)
+        RESULT_CACHE.clear()
+        single = [run_search(session, request) for request in requests]
+
+    for batch_hits, single_hits in zip(batched_vectors, single_vectors):
+        assert [row[0].id for row in batch_hits] == [row[0].id for row in single_hits]
+        for (_, batch_score), (_, single_score) in zip(batch_hits, single_hits):
+            assert abs(batch_score - single_score) < 1e-6
+    assert [response.dict() for response in batched] == [response.dict() for response in single]
+
+
+def test_async_search_matches_sync_path():
+    import asyncio
+
+    from backend.db import async_engine, get_async_session
+    from backend.rag import RESULT_CACHE, run_search, run_search_async, run_search_batch_async
+    from backend.schema import SearchRequest
+
+    today = date.today()
+    _create_slice(slice_id="slice-a", text="Tenancy deposit procedures", effective_from=today)
+    _create_slice(slice_id="slice-b", text="Deposit refund rules", effective_from=today)
+    requests = [SearchRequest(query="tenancy deposit"), SearchRequest(query="refund", page_size=1)]
+
+    async def run_async():
+        try:
+            async with get_async_session() as session:
+                RESULT_CACHE.clear()
+                single = [await run_search_async(session, request) for request in requests]
+                RESULT_CACHE.clear()
+                return single, await run_search_batch_async(session, requests)
+        finally:
+            await async_engine.dispose()
+
+    single_async, batch_async = asyncio.run(run_async())
+    RESULT_CACHE.clear()
+    with get_session() as session:
+        expected = [run_search(session, request).dict() for request in requests]
+
+    assert [response.dict() for response in single_async] == expected
+    assert [response.dict() for response in batch_async] == expected
+
+
+def test_citations_use_snippet_stored_at_ingest():
+    from backend.rag import RESULT_CACHE, run_search
+    from backend.schema import SearchRequest
+    from backend.utils.text_clean import build_snippet
+
+    long_text = "Tenancy   deposit\n rules " + "landlord obligations " * 40
+    _create_slice(slice_id="slice-long", text=long_text, effective_from=date.today())
+
+    with get_session() as session:
+        stored = session.get(LegalSliceModel, "slice-long").snippet
+        RESULT_CACHE.clear()
+        response = run_search(session, SearchRequest(query="tenancy deposit"))
+
+    assert stored == build_snippet(long_text)
+    assert len(stored) <= 201 and stored.endswith("…")
+    assert response.items[0].snippet == stored
+
+
+def test_get_by_id_revalidates_with_etag_and_get_by_ids_batches():
+    from fastapi.testclient import TestClient
+
+    from backend.main import app
+
+    today = date.today()
+    _create_slice(slice_id="slice-a", text="Tenancy deposit procedures", effective_from=today)
+    _create_slice(slice_id="slice-b", text="Deposit refund rules", effective_from=today)
+
+    with TestClient(app) as client:
+        first = client.get("/get_by_id/slice-a")
+        etag = first.headers["etag"]
+        assert first.status_code == 200 and "max-age" in first.headers["cache-control"]
+
+        revalidated = client.get("/get_by_id/slice-a", headers={"If-None-Match": f"W/{etag}"})
+        assert revalidated.status_code == 304 and revalidated.content == b""
+        changed = client.get("/get_by_id/slice-a", headers={"If-None-Match": '"stale"'})
+        assert changed.status_code == 200 and changed.content == first.content
+
+        bulk = client.post("/get_by_ids", json={"ids": ["slice-b", "missing", "slice-a", "slice-b"]})
+
+    assert bulk.status_code == 200
+    body = bulk.json()
+    assert [item["id"] for item in body["items"]] == ["slice-b", "slice-a"]
+    assert body["missing"] == ["missing"]
+    assert body["items"][1] == first.json()
+
+
+def _seed_payload(slice_id: str, text: str, versions=()) -> dict:
+    return {
+        "id": slice_id,
+        "jurisdiction": {"level": "federal", "name": "UAE"},
+        "source": {"portal": "UAE Legislation", "url": "https://uaelegislation.gov.ae/en/legislations/1"},
+        "instrument": {
+            "type": "Federal Law",
+            "number": "1",
+            "year": 2020,
+            "title": "Test Law",
+            "official_language": "Arabic",
+        },
+        "structure": {"granularity": "article", "path": "Article 1", "locators": {"article": "1"}},
+        "text_content": text,
+        "text_hash": f"sha256:{abs(hash(text))}",
+        "primary_lang": "en",
+        "effective": {"from_date": "2020-01-01"},
+        "versions": list(versions),
+    }
+
+
+def test_seed_loader_copies_batches_and_upserts_last_occurrence():
+    from backend.models import LegalSliceVersion as LegalSliceVersionModel
+    from backend.utils.seed_loader import load_seed_records, upsert_records
+
+    enacted = {"version_id": "v1", "event": "enacted", "date": "2020-01-01"}
+    amended = {"version_id": "v2", "event": "amended", "date": "2022-01-01"}
+    payload = [
+        _seed_payload("seed-a", "Original   tenancy text", [enacted]),
+        _seed_payload("seed-b", "Labour permits"),
+        _seed_payload("seed-a", "Amended tenancy text", [enacted, amended]),
+    ]
+
+    result = upsert_records(load_seed_records(payload), batch_size=2, progress=None, full=True)
+    assert (result.added, result.changed) == (2, 0)
+    result = upsert_records(load_seed_records(payload[:1]), batch_size=2, progress=None)
+    assert (result.added, result.changed, result.unchanged) == (0, 1, 0)
+
+    with get_session() as session:
+        record = session.get(LegalSliceModel, "seed-a")
+        versions = session.query(LegalSliceVersionModel).filter_by(slice_id="seed-a").all()
+        assert record.text_content == "Original tenancy text"
+        assert record.snippet == "Original tenancy text"
+        assert record.jurisdiction_keys == ["federal", "uae"]
+        assert [version.version_id for version in versions] == ["v1"]
+        assert session.get(LegalSliceModel, "seed-b").vector_embedding is not None
+
+
+def test_seed_loader_skips_unchanged_hashes_and_prunes():
+    from backend.db import get_corpus_version
+    from backend.utils.seed_loader import load_seed_records, upsert_records
+
+    payload = [_seed_payload("seed-x", "Freezone licence text"), _seed_payload("seed-y", "Visa rules")]
+    upsert_records(load_seed_records(payload), progress=None)
+    with get_session() as session:
+        version = get_corpus_version(session)
+
+    result = upsert_records(load_seed_records(payload), progress=None)
+    assert tuple(result[:4]) == (0, 0, 2, 0)
+    with get_session() as session:
+        assert get_corpus_version(session) == version
+
+    changed = [_seed_payload("seed-x", "Freezone licence text, amended")]
+    result = upsert_records(load_seed_records(changed), progress=None, prune=True)
+    assert (result.changed, result.removed) == (1, 1)
+    with get_session() as session:
+        assert session.get(LegalSliceModel, "seed-x").text_content == "Freezone licence text, amended"
+        assert session.get(LegalSliceModel, "seed-y") is None
+        assert get_corpus_version(session) != version
+
+
+def test_seed_loader_writes_metadata_only_changes_without_reembedding(monkeypatch):
+    from backend.utils import seed_loader
+    from backend.utils.seed_loader import load_seed_records, upsert_records
+
+    enacted = {"version_id": "v1", "event": "enacted", "date": "2020-01-01"}
+    payload = _seed_payload("seed-m", "Free zone employment rules")
+    upsert_records(load_seed_records([payload]), progress=None)
+    with get_session() as session:
+        vector = list(session.get(LegalSliceModel, "seed-m").vector_embedding)
+
+    rebuilds = []
+    monkeypatch.setattr(seed_loader, "ensure_vector_index", lambda conn, rebuild=False: rebuilds.append(rebuild))
+    retitled = dict(payload, topics=["employment"], versions=[enacted])
+    retitled["instrument"] = dict(payload["instrument"], title="Employment Regulations")
+    result = upsert_records(load_seed_records([retitled]), progress=None)
+
+    assert (result.changed, result.unchanged) == (1, 0)
+    assert rebuilds == []
+    with get_session() as session:
+        record = session.get(LegalSliceModel, "seed-m")
+        assert record.title == "Employment Regulations"
+        assert record.topics == ["employment"]
+        assert [version.version_id for version in record.versions] == ["v1"]
+        assert list(record.vector_embedding) == vector
+    assert tuple(upsert_records(load_seed_records([retitled]), progress=None)[:4]) == (0, 0, 1, 0)
+
+
+def test_fused_full_text_rankers_use_the_tsvector_index():
+    from backend.search import fused_hybrid_search
+
+    today = date.today()
+    for index in range(3):
+        _create_slice(slice_id=f"slice-{index}", text=f"Tenancy deposit rule {index}", effective_from=today)
+
+    with get_session() as session:
+        capture = _CaptureStatement(session)
+        fused_hybrid_search(capture, "tenancy deposit refund", to_filters(jurisdiction="Dubai"))
+        plan = _plan(session, capture.statement)
+
+    assert "idx_search_tsv" in plan
+    assert "CTE Scan on candidates" not in plan
+
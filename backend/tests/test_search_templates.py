@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+from sqlalchemy.dialects import postgresql
+
+from backend import search
+
+
+def _sql(statement) -> str:
+    return str(statement.compile(dialect=postgresql.dialect()))
+
+
+def test_filters_bind_values_into_a_shared_template():
+    dubai = search.to_filters(jurisdiction="Dubai", as_of="2024-01-01")
+    federal = search.to_filters(jurisdiction="UAE", as_of="2020-06-30")
+
+    dubai_shape, dubai_params = search._filter_params(dubai)
+    federal_shape, federal_params = search._filter_params(federal)
+
+    assert dubai_shape == federal_shape == (True, False, True)
+    assert federal_params["filter_jurisdiction_keys"] == ["federal"]
+    template = search._vector_template(dubai_shape, "vector")
+    assert template is search._vector_template(federal_shape, "vector")
+    assert "dubai" not in _sql(template) and "federal" not in _sql(template)
+
+
+def test_keyword_template_depends_only_on_term_signature():
+    shape, _ = search._filter_params(search.to_filters())
+    one = search._keyword_template(shape, ((False,), (False, True)))
+    assert one is search._keyword_template(shape, ((False,), (False, True)))
+    assert one is not search._keyword_template(shape, ((False,), (False,)))
+    sql = _sql(one)
+    assert "phraseto_tsquery" in sql and "term_1_1" in sql
+
+
+class Recorder:
+    """Session stand-in that records statements and returns no rows."""
+
+    def __init__(self):
+        self.statements = []
+
+    def execute(self, statement, params=None):
+        self.statements.append(statement)
+        return self
+
+    def all(self):
+        return []
+
+
+def test_ann_settings_are_set_local_and_skipped_when_unset():
+    session = Recorder()
+    search.apply_ann_settings(session, ef_search=80, probes=12)
+    search.apply_ann_settings(session)
+    # Raised to the rows the scan must yield, never lowered.
+    search.apply_ann_settings(session, k=search.HNSW_DEFAULT_EF_SEARCH)
+    search.apply_ann_settings(session, k=128)
+    search.apply_ann_settings(session, ef_search=200, k=128)
+    assert [str(statement) for statement in session.statements] == [
+        "SET LOCAL hnsw.ef_search = 80",
+        "SET LOCAL ivfflat.probes = 12",
+        "SET LOCAL hnsw.ef_search = 128",
+        "SET LOCAL hnsw.ef_search = 200",
+    ]
+
+
+def test_fused_mode_uses_the_ann_vector_statement_and_recall_knobs(monkeypatch):
+    monkeypatch.setattr(search, "PGVECTOR_STORAGE", "halfvec")
+    session = Recorder()
+    filters = search.to_filters(jurisdiction="Dubai")
+    assert search.fused_hybrid_search(session, "tenancy deposit", filters, limit=8, ef_search=64) == []
+
+    settings, statement = session.statements
+    assert str(settings) == "SET LOCAL hnsw.ef_search = 64"
+    sql = _sql(statement)
+    vector_hits = sql[sql.index("vector_hits") :]
+    # Index-ordered shortlist over legal_slice, not a scan of the candidates CTE.
+    assert "halfvec" in vector_hits.lower() and "LIMIT" in vector_hits
+    assert "candidates.vector_embedding" not in sql
+    # Inlined into both full-text rankers so each can use idx_search_tsv.
+    assert "candidates AS NOT MATERIALIZED" in sql
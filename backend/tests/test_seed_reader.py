@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import io
+import json
+
+import pytest
+
+from backend.utils.seed_reader import iter_json_items, iter_seed_records
+
+
+def _record(index: int) -> dict:
+    text = f"يلتزم المؤجر بتسليم العقار رقم {index}. " * 20
+    return {
+        "id": f"seed-{index}",
+        "jurisdiction": {"level": "emirate", "name": "Dubai", "emirate": "Dubai"},
+        "source": {"portal": "Dubai Legislation Portal", "url": "https://example.com/law.pdf"},
+        "instrument": {"type": "Law", "number": str(index), "year": 2007, "title": "Tenancy Law", "official_language": "Arabic"},
+        "structure": {"granularity": "article", "path": f"Article {index}", "locators": {"article": str(index)}},
+        "text_content": text,
+        "text_hash": f"sha256:{index:064x}",
+        "primary_lang": "ar",
+        "effective": {"from_date": "2007-12-21"},
+    }
+
+
+@pytest.mark.parametrize("read_size", [7, 64, 1 << 16])
+def test_json_array_and_jsonl_stream_the_same_items(read_size):
+    records = [_record(index) for index in range(25)]
+    as_array = json.dumps(records, ensure_ascii=False, indent=2)
+    as_jsonl = "\n".join(json.dumps(record, ensure_ascii=False) for record in records) + "\n"
+
+    assert list(iter_json_items(io.StringIO(as_array), read_size=read_size)) == records
+    assert list(iter_json_items(io.StringIO(as_jsonl), read_size=read_size)) == records
+    assert list(iter_json_items(io.StringIO(" [ ] "), read_size=read_size)) == []
+
+
+def test_seed_records_are_validated_lazily_and_errors_surface():
+    payload = io.StringIO(json.dumps([_record(1), _record(2)]))
+    records = iter_seed_records(payload)
+    assert next(records).id == "seed-1"
+    assert payload.tell() > 0
+
+    with pytest.raises(ValueError):
+        list(iter_json_items(io.StringIO('[{"id": "a"} {"id": "b"}]')))
+    with pytest.raises(ValueError):
+        list(iter_json_items(io.StringIO('[{"id": "a"},')))
+    with pytest.raises(ValueError, match="#0"):
+        list(iter_seed_records(io.StringIO("[1]")))
+
+
+def test_effective_period_must_not_end_before_it_starts():
+    record = _record(1)
+    record["effective"] = {"from_date": "2020-01-01", "to_date": "2019-12-31"}
+    with pytest.raises(ValueError, match="to_date"):
+        list(iter_seed_records(io.StringIO(json.dumps([record]))))
+
+    record["effective"]["to_date"] = "2020-01-01"
+    assert next(iter_seed_records(io.StringIO(json.dumps([record])))).effective.to_date == "2020-01-01"
+
+
+class _CountingReader(io.StringIO):
+    def __init__(self, value: str) -> None:
+        super().__init__(value)
+        self.reads = 0
+
+    def read(self, size: int = -1) -> str:
+        self.reads += 1
+        return super().read(size)
+
+
+def test_tokens_split_across_reads_decode_at_every_boundary():
+    payload = '[{"a": true, "b": null, "c": -1.5e3, "d": "\\u00e9\\u0628"}, false]'
+    for read_size in range(1, len(payload) + 1):
+        items = list(iter_json_items(io.StringIO(payload), read_size=read_size))
+        assert items == [{"a": True, "b": None, "c": -1500.0, "d": "éب"}, False]
+
+
+def test_malformed_items_fail_without_reading_the_rest():
+    payload = _CountingReader('[{"id": "a"}, {"id": x}, ' + '{"id": "b"}, ' * 50000 + "]")
+    with pytest.raises(json.JSONDecodeError):
+        list(iter_json_items(payload, read_size=64))
+    assert payload.tell() < 1024
+
+
+def test_large_records_grow_reads_geometrically():
+    record = _record(1)
+    record["text_content"] = "x" * 200_000
+    payload = _CountingReader(json.dumps([record]))
+
+    assert list(iter_json_items(payload, read_size=16)) == [record]
+    assert payload.reads < 30
+
+
+@pytest.mark.parametrize("payload", ["[1,]", "[1, \n ]", '[{"id": "a"},]'])
+def test_trailing_commas_are_rejected(payload):
+    with pytest.raises(ValueError, match="Trailing"):
+        list(iter_json_items(io.StringIO(payload), read_size=2))
+
+
+def test_bare_objects_are_only_accepted_as_single_line_jsonl(tmp_path):
+    record = _record(1)
+    pretty = json.dumps(record, indent=2)
+    with pytest.raises(ValueError, match="spans several lines"):
+        list(iter_json_items(io.StringIO(pretty)))
+    with pytest.raises(ValueError, match="one JSON value per line"):
+        list(iter_json_items(io.StringIO('{"id": "a"} {"id": "b"}\n')))
+
+    as_json = tmp_path / "seed.json"
+    as_json.write_text(json.dumps(record), encoding="utf-8")
+    with pytest.raises(ValueError, match="JSON array"):
+        list(iter_seed_records(as_json))
+    as_jsonl = tmp_path / "seed.jsonl"
+    as_jsonl.write_text(json.dumps(record) + "\n", encoding="utf-8")
+    assert [item.id for item in iter_seed_records(as_jsonl)] == ["seed-1"]
@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import asyncio
+from datetime import date
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+
+from backend.main import orm_to_schema
+from backend.models import LegalSlice as LegalSliceModel
+from backend.models import LegalSliceVersion as LegalSliceVersionModel
+from backend.rag import build_citation
+from backend.schema import LegalSlice, SearchResponse
+from backend.search import SliceCandidate
+from backend.serialization import FastJSONResponse, legal_slice_payload, search_response_payload
+from backend.utils.text_clean import build_snippet
+
+
+def _fastapi_body(model, content) -> bytes:
+    """What FastAPI sends for ``content`` under ``response_model=model``."""
+    field = create_response_field(name="response", type_=model)
+    return JSONResponse(
+        asyncio.run(serialize_response(field=field, response_content=content))
+    ).body
+
+
+def _record() -> LegalSliceModel:
+    return LegalSliceModel(
+        id="dubai#law-26-2007#art-5",
+        level="emirate",
+        name="Dubai",
+        emirate="Dubai",
+        freezone=None,
+        portal="Dubai Legislation Portal",
+        url="https://dlp.dubai.gov.ae/Legislation%20Reference/2007/Law%20No.%20(26).pdf",
+        gazette="الجريدة الرسمية 324",
+        type="Law",
+        number="26",
+        year=2007,
+        title="Law No. (26) of 2007 — Landlord \"and\" Tenant",
+        issuer=None,
+        official_language="Arabic",
+        granularity="article",
+        path="Chapter 2 / Article 5",
+        chapter="2",
+        article="5",
+        text_content="يلتزم المؤجر\tبتسليم العقار\n“deposit”   ok",
+        text_hash="sha256:abc",
+        primary_lang="ar",
+        topics=["real_estate", "tenancy"],
+        state="in_force",
+        effective_from=date(2007, 12, 21),
+        effective_to=None,
+        versions=[
+            LegalSliceVersionModel(
+                version_id="v1", event="enacted", event_date=date(2007, 12, 21)
+            ),
+            LegalSliceVersionModel(
+                version_id="v2",
+                event="amended",
+                event_date=date(2008, 6, 1),
+                by_instrument="Law No. (33) of 2008",
+                by_url="https://dlp.dubai.gov.ae/law-33-2008",
+            ),
+        ],
+    )
+
+
+def test_legal_slice_payload_is_byte_identical_to_response_model():
+    record = _record()
+    expected = _fastapi_body(LegalSlice, orm_to_schema(record))
+
+    assert FastJSONResponse(legal_slice_payload(record)).body == expected
+    only_v2 = record.versions[1:]
+    assert FastJSONResponse(legal_slice_payload(record, only_v2)).body == _fastapi_body(
+        LegalSlice, orm_to_schema(record, only_v2)
+    )
+
+
+def test_inverted_stored_effective_range_reads_as_empty_period():
+    record = _record()
+    record.effective_to = date(2001, 1, 1)
+
+    schema = orm_to_schema(record)
+    assert schema.effective.to_date == schema.effective.from_date == "2007-12-21"
+    assert FastJSONResponse(legal_slice_payload(record)).body == _fastapi_body(LegalSlice, schema)
+
+
+def test_search_payload_is_byte_identical_to_response_model():
+    record = _record()
+    candidate = SliceCandidate(
+        **{field: getattr(record, field) for field in SliceCandidate._fields if field != "snippet"},
+        snippet=build_snippet(record.text_content),
+    )
+    response = SearchResponse.construct(
+        query="تأمين deposit", items=[build_citation(candidate)] * 2, next_cursor=None
+    )
+
+    assert FastJSONResponse(search_response_payload(response)).body == _fastapi_body(
+        SearchResponse, response
+    )
@@ -0,0 +1,206 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+from datetime import date
+
+import numpy as np
+
+from backend import search, vector_index
+from backend.search import SliceCandidate, embed_many, to_filters
+from backend.vector_index import VectorIndex
+
+
+def _candidate(slice_id: str, name: str = "Dubai", level: str = "emirate") -> SliceCandidate:
+    return SliceCandidate(
+        id=slice_id,
+        level=level,
+        name=name,
+        emirate=name if level == "emirate" else None,
+        freezone=None,
+        year=2020,
+        title="Test Law",
+        path="Article 1",
+        part=None,
+        chapter=None,
+        section=None,
+        article="1",
+        rule=None,
+        clause=None,
+        item=None,
+        url="https://example.com",
+        gazette=None,
+        snippet="",
+    )
+
+
+def _build_index() -> VectorIndex:
+    texts = ["tenancy deposit", "labour contract", "tenancy rules", "federal tax"]
+    candidates = [
+        _candidate("dubai-deposit"),
+        _candidate("dubai-labour"),
+        _candidate("abu-dhabi-rules", name="Abu Dhabi"),
+        _candidate("federal-tax", name="UAE", level="federal"),
+    ]
+    return VectorIndex(
+        candidates,
+        embed_many(texts),
+        topics=[["real_estate"], ["labour"], ["real_estate"], ["tax"]],
+        effective_from=np.array(
+            [date(2020, 1, 1), date(2020, 1, 1), date(2020, 1, 1), date(2030, 1, 1)],
+            dtype="datetime64[D]",
+        ),
+        effective_to=np.array([None, date(2021, 1, 1), None, None], dtype="datetime64[D]"),
+    )
+
+
+def test_exact_top_k_matches_brute_force_cosine():
+    index = _build_index()
+    query = embed_many(["tenancy deposit"])[0]
+    results = index.search(query, to_filters(), k=4)
+
+    matrix = index.matrix.astype(np.float64)
+    similarities = matrix @ query / (np.linalg.norm(matrix, axis=1) * np.linalg.norm(query))
+    expected = [index.candidates[i].id for i in np.argsort(-similarities)]
+    assert [candidate.id for candidate, _ in results] == expected
+    assert results[0][0].id == "dubai-deposit"
+    assert abs(results[0][1] - 1.0) < 1e-6
+
+
+def test_filters_match_sql_semantics():
+    index = _build_index()
+    query = embed_many(["tenancy"])[0]
+
+    def ids(**kwargs):
+        return {candidate.id for candidate, _ in index.search(query, to_filters(**kwargs), k=10)}
+
+    assert ids(jurisdiction="dubai") == {"dubai-deposit", "dubai-labour"}
+    assert ids(jurisdiction="Federal") == {"federal-tax"}
+    assert ids(topics=["real_estate"]) == {"dubai-deposit", "abu-dhabi-rules"}
+    assert ids(as_of="2022-06-01") == {"dubai-deposit", "abu-dhabi-rules"}
+    assert ids(jurisdiction="Sharjah") == set()
+
+
+def test_precomputed_masks_combine_filters():
+    index = _build_index()
+
+    assert set(index.jurisdiction_masks) >= {"dubai", "abu dhabi", "emirate", "federal", "uae"}
+    mask = index.filter_mask(to_filters(jurisdiction="emirate", topics=["real_estate"], as_of="2020-01-01"))
+    assert [index.candidates[i].id for i in np.flatnonzero(mask)] == ["dubai-deposit", "abu-dhabi-rules"]
+
+    # effective_to is exclusive and effective_from inclusive, as in SQL.
+    assert not index.as_of_mask(date(2021, 1, 1))[1]
+    assert index.as_of_mask(date(2030, 1, 1))[3]
+    assert not index.filter_mask(to_filters(topics=["unknown"])).any()
+
+
+def test_versioned_rows_resolve_as_of_through_their_versions():
+    base = _build_index()
+    days = lambda *values: np.array(values, dtype="datetime64[D]")  # noqa: E731
+    # dubai-deposit: enacted 2020, amended 2022, repealed 2024 (an empty period).
+    index = VectorIndex(
+        base.candidates,
+        base.matrix,
+        topics=[["real_estate"], ["labour"], ["real_estate"], ["tax"]],
+        effective_from=days("2020-01-01", "2020-01-01", "2020-01-01", "2030-01-01"),
+        effective_to=days(None, "2021-01-01", None, None),
+        version_periods=(
+            np.array([0, 0, 0]),
+            days("2020-01-01", "2022-01-01", "0001-01-01"),
+            days("2022-01-01", "2024-01-01", "0001-01-01"),
+        ),
+    )
+
+    assert index.as_of_mask(date(2023, 6, 1))[0]
+    # Still inside effective_from/effective_to, but the repeal is in force.
+    assert not index.as_of_mask(date(2025, 1, 1))[0]
+    assert index.as_of_mask(date(2025, 1, 1))[2]
+    assert not index.as_of_mask(date(2021, 1, 1))[1]
+
+
+def test_quantized_first_stage_rescores_to_float_ranking():
+    texts = [f"article {index} of the tenancy law" for index in range(400)]
+    matrix = embed_many(texts)
+    candidates = [_candidate(f"slice-{index}") for index in range(len(texts))]
+    dates = np.array([date(2020, 1, 1)] * len(texts), dtype="datetime64[D]")
+    open_ended = np.array([None] * len(texts), dtype="datetime64[D]")
+
+    def build(quantization):
+        return VectorIndex(
+            candidates,
+            matrix,
+            topics=[[] for _ in texts],
+            effective_from=dates,
+            effective_to=open_ended,
+            quantization=quantization,
+        )
+
+    exact = build("none")
+    query = embed_many(["article 7 of the tenancy law"])[0]
+    expected = exact.search(query, to_filters(), k=10)
+    for quantization, dtype in (("float16", np.float16), ("int8", np.int8)):
+        index = build(quantization)
+        assert index.quantized.dtype == dtype
+        assert index.quantized.nbytes < matrix.nbytes
+        results = index.search(query, to_filters(), k=10)
+        # Scores come from the float32 rescoring pass, not the quantized copy.
+        assert [candidate.id for candidate, _ in results] == [c.id for c, _ in expected]
+        np.testing.assert_allclose([s for _, s in results], [s for _, s in expected])
+
+
+def test_duplicate_embeddings_tie_break_on_id_like_sql():
+    # Rows load ``ORDER BY id``; equal distances must keep that order, as
+    # ``ORDER BY distance, id`` does, whatever argpartition picks.
+    size = 300
+    vector = embed_many(["tenancy deposit"])[0]
+    matrix = np.repeat(vector[None, :], size, axis=0)
+    matrix[-1] = embed_many(["federal tax"])[0]
+    dates = np.array([date(2020, 1, 1)] * size, dtype="datetime64[D]")
+    open_ended = np.array([None] * size, dtype="datetime64[D]")
+
+    for quantization in ("none", "int8"):
+        index = VectorIndex(
+            [_candidate(f"s{row:03d}") for row in range(size)],
+            matrix,
+            topics=[[] for _ in range(size)],
+            effective_from=dates,
+            effective_to=open_ended,
+            quantization=quantization,
+        )
+        results = index.search(vector, to_filters(), k=5)
+        assert [candidate.id for candidate, _ in results] == ["s000", "s001", "s002", "s003", "s004"]
+
+
+def test_async_vector_search_embeds_and_scans_off_the_event_loop(monkeypatch):
+    index = _build_index()
+    index.version = 3
+    threads = {}
+
+    class Tracker:
+        def current(self, session):
+            return 3
+
+    class Session:
+        async def run_sync(self, fn, *args, **kwargs):
+            return fn(None, *args, **kwargs)
+
+    def embed_query(query):
+        threads["embed"] = threading.get_ident()
+        return embed_many([query])[0]
+
+    def scan(query_vector, filters, k=8):
+        threads["scan"] = threading.get_ident()
+        return VectorIndex.search(index, query_vector, filters, k=k)
+
+    monkeypatch.setattr(search, "VECTOR_SEARCH_BACKEND", "numpy")
+    monkeypatch.setattr(search, "embed_query", embed_query)
+    monkeypatch.setattr(vector_index, "_version_tracker", Tracker())
+    monkeypatch.setattr(vector_index, "_index", index)
+    monkeypatch.setattr(index, "search", scan)
+
+    results = asyncio.run(search.vector_search_async(Session(), "tenancy deposit", to_filters(), k=2))
+
+    assert results[0][0].id == "dubai-deposit"
+    assert set(threads) == {"embed", "scan"}
+    assert threading.get_ident() not in threads.values()
+
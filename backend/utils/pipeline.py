@@ -0,0 +1,175 @@
+from __future__ import annotations
+
+import queue
+import threading
+import time
+from typing import Any, Callable, Iterable, Iterator, List, Optional
+
+# Marks the end of a stage's output; an upstream failure is re-raised by the consumer.
+_DONE = object()
+# How often blocked producers and consumers re-check for a shutdown.
+_POLL_SECONDS = 0.1
+
+
+class _Stopped(Exception):
+    """Raised inside a stage thread once the pipeline is shutting down."""
+
+
+class StageMetrics:
+    """Throughput of one pipeline stage.
+
+    ``busy`` is wall time spent working, excluding time blocked on an empty
+    input queue (``waiting``) or a full output queue (``blocked``). The stage
+    with the least idle time is the bottleneck.
+    """
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.items = 0
+        self.records = 0
+        self.busy = 0.0
+        self.waiting = 0.0
+        self.blocked = 0.0
+
+    @property
+    def rate(self) -> float:
+        """Records per busy second."""
+        return self.records / self.busy if self.busy > 0 else 0.0
+
+    def __repr__(self) -> str:
+        return (
+            f"StageMetrics({self.name!r}, records={self.records}, busy={self.busy:.3f}s, "
+            f"waiting={self.waiting:.3f}s, blocked={self.blocked:.3f}s)"
+        )
+
+
+class Pipeline:
+    """Generator stages chained by bounded queues, one thread per stage.
+
+    ``source`` is drained on its own thread; each stage added with
+    :meth:`add_stage` transforms the iterator of its predecessor's items on
+    another thread. Iterating the pipeline consumes the last stage on the
+    caller's thread, which makes the caller the final (``sink_name``) stage.
+    A full queue blocks its producer, so no stage runs more than
+    ``queue_depth`` items ahead of the next one. An exception in any stage
+    stops the others and is re-raised to the caller.
+    """
+
+    def __init__(
+        self,
+        source_name: str,
+        source: Iterable[Any],
+        queue_depth: int = 4,
+        size: Callable[[Any], int] = len,
+        sink_name: str = "sink",
+    ) -> None:
+        self.queue_depth = max(1, queue_depth)
+        self.sink_name = sink_name
+        self._stages: List[tuple] = [(source_name, lambda _: iter(source), size)]
+        self._stop = threading.Event()
+        self._error: Optional[BaseException] = None
+        self.metrics: List[StageMetrics] = []
+
+    def add_stage(
+        self,
+        name: str,
+        transform: Callable[[Iterator[Any]], Iterable[Any]],
+        size: Callable[[Any], int] = len,
+    ) -> "Pipeline":
+        self._stages.append((name, transform, size))
+        return self
+
+    def _get(self, inbox: "queue.Queue[Any]") -> Any:
+        while True:
+            try:
+                return inbox.get(timeout=_POLL_SECONDS)
+            except queue.Empty:
+                if self._stop.is_set():
+                    raise _Stopped()
+
+    def _put(self, outbox: "queue.Queue[Any]", item: Any) -> None:
+        while True:
+            try:
+                outbox.put(item, timeout=_POLL_SECONDS)
+                return
+            except queue.Full:
+                if self._stop.is_set():
+                    raise _Stopped()
+
+    def _inputs(self, inbox: "queue.Queue[Any]", metrics: StageMetrics) -> Iterator[Any]:
+        while True:
+            started = time.perf_counter()
+            item = self._get(inbox)
+            metrics.waiting += time.perf_counter() - started
+            if item is _DONE:
+                return
+            yield item
+
+    def _run(
+        self,
+        name: str,
+        transform: Callable[[Iterator[Any]], Iterable[Any]],
+        size: Callable[[Any], int],
+        inbox: Optional["queue.Queue[Any]"],
+        outbox: "queue.Queue[Any]",
+        metrics: StageMetrics,
+    ) -> None:
+        started = time.perf_counter()
+        try:
+            inputs = self._inputs(inbox, metrics) if inbox is not None else iter(())
+            for item in transform(inputs):
+                metrics.items += 1
+                metrics.records += size(item)
+                put_started = time.perf_counter()
+                self._put(outbox, item)
+                metrics.blocked += time.perf_counter() - put_started
+        except _Stopped:
+            pass
+        except BaseException as exc:  # handed to the consuming thread
+            if self._error is None:
+                self._error = exc
+            self._stop.set()
+        finally:
+            metrics.busy = time.perf_counter() - started - metrics.waiting - metrics.blocked
+            try:
+                self._put(outbox, _DONE)
+            except _Stopped:
+                pass
+
+    def __iter__(self) -> Iterator[Any]:
+        self.metrics = [StageMetrics(name) for name, _, _ in self._stages]
+        sink = StageMetrics(self.sink_name)
+        threads = []
+        inbox: Optional["queue.Queue[Any]"] = None
+        for (name, transform, size), metrics in zip(self._stages, self.metrics):
+            outbox: "queue.Queue[Any]" = queue.Queue(maxsize=self.queue_depth)
+            thread = threading.Thread(
+                target=self._run,
+                args=(name, transform, size, inbox, outbox, metrics),
+                name=f"pipeline-{name}",
+                daemon=True,
+            )
+            threads.append(thread)
+            inbox = outbox
+        last_size = self._stages[-1][2]
+
+        for thread in threads:
+            thread.start()
+        started = time.perf_counter()
+        try:
+            for item in self._inputs(inbox, sink):
+                if self._error is not None:
+                    break
+                sink.items += 1
+                sink.records += last_size(item)
+                yield item
+        except _Stopped:
+            pass  # an upstream stage failed; its error is raised below
+        finally:
+            self._stop.set()
+            for thread in threads:
+                thread.join()
+            sink.busy = time.perf_counter() - started - sink.waiting
+            self.metrics.append(sink)
+        if self._error is not None:
+            raise self._error
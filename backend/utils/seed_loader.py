@@ -1,23 +1,95 @@
 from __future__ import annotations
 
 import argparse
-import json
+import hashlib
+import os
+import sys
+import time
+import warnings
+from collections import deque
+from collections.abc import Sized
 from datetime import date
+from itertools import islice
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+)
+
+from pgvector.utils import to_db
+from sqlalchemy import text
 
 try:
-    from ..db import get_session, init_db  # type: ignore[import]
-    from ..models import LegalSlice as LegalSliceModel  # type: ignore[import]
-    from ..search import embed  # type: ignore[import]
-    from ..schema import LegalSlice  # type: ignore[import]
+    from ..db import (  # type: ignore[import]
+        PGVECTOR_DIM,
+        bump_corpus_version,
+        engine,
+        ensure_vector_index,
+        init_db,
+    )
+    from ..embeddings import (  # type: ignore[import]
+        EmbeddingProvider,
+        create_provider,
+    )
+    from ..jurisdictions import jurisdiction_keys  # type: ignore[import]
+    from ..schema import LegalSlice, VersionItem  # type: ignore[import]
 except ImportError:  # Fallback when executed as `python -m utils.seed_loader`
-    from db import get_session, init_db  # type: ignore[import]
-    from models import LegalSlice as LegalSliceModel  # type: ignore[import]
-    from search import embed  # type: ignore[import]
-    from schema import LegalSlice  # type: ignore[import]
+    from db import (  # type: ignore[import]
+        PGVECTOR_DIM,
+        bump_corpus_version,
+        engine,
+        ensure_vector_index,
+        init_db,
+    )
+    from embeddings import (  # type: ignore[import]
+        EmbeddingProvider,
+        create_provider,
+    )
+    from jurisdictions import jurisdiction_keys  # type: ignore[import]
+    from schema import LegalSlice, VersionItem  # type: ignore[import]
+
+from .pipeline import Pipeline, StageMetrics
+from .seed_reader import iter_seed_records
+from .text_clean import build_snippet, normalize_whitespace
+
+try:
+    SEED_BATCH_SIZE = max(1, int(os.getenv("SEED_BATCH_SIZE", "1000")))
+except ValueError:
+    warnings.warn("Invalid SEED_BATCH_SIZE provided; falling back to 1000.")
+    SEED_BATCH_SIZE = 1000
+
+
+def available_cpus() -> int:
+    """CPUs this process may run on.
 
-from .text_clean import normalize_whitespace
+    The affinity mask follows cpusets (``docker --cpuset-cpus``, taskset);
+    ``os.cpu_count()`` reports the host's cores and is only a fallback.
+    """
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+try:
+    SEED_EMBED_WORKERS = max(1, int(os.getenv("SEED_EMBED_WORKERS") or available_cpus()))
+except ValueError:
+    warnings.warn(f"Invalid SEED_EMBED_WORKERS provided; falling back to {available_cpus()}.")
+    SEED_EMBED_WORKERS = available_cpus()
+
+try:
+    SEED_QUEUE_DEPTH = max(1, int(os.getenv("SEED_QUEUE_DEPTH", "4")))
+except ValueError:
+    warnings.warn("Invalid SEED_QUEUE_DEPTH provided; falling back to 4.")
+    SEED_QUEUE_DEPTH = 4
 
 
 def _parse_date(value: Optional[str]) -> Optional[date]:
@@ -26,52 +98,405 @@ def _parse_date(value: Optional[str]) -> Optional[date]:
     return date.fromisoformat(value)
 
 
+# Columns written by the loader; generated columns are left to Postgres.
+SLICE_COLUMNS = (
+    "id",
+    "level",
+    "name",
+    "emirate",
+    "freezone",
+    "portal",
+    "url",
+    "gazette",
+    "type",
+    "number",
+    "year",
+    "title",
+    "issuer",
+    "official_language",
+    "granularity",
+    "path",
+    "part",
+    "chapter",
+    "section",
+    "article",
+    "rule",
+    "clause",
+    "item",
+    "text_content",
+    "text_hash",
+    "primary_lang",
+    "topics",
+    "jurisdiction_keys",
+    "state",
+    "effective_from",
+    "effective_to",
+    "vector_embedding",
+    "snippet",
+)
+# Staged version rows carry the end of their period; valid_period is built
+# from (event_date, valid_to) when they are applied.
+VERSION_STAGE_COLUMNS = (
+    "slice_id",
+    "version_id",
+    "event",
+    "event_date",
+    "by_instrument",
+    "by_url",
+    "valid_to",
+)
+
+
+def version_rows(
+    slice_id: str, versions: Sequence[VersionItem], effective_to: Optional[date]
+) -> List[tuple]:
+    """Version rows whose ``[date, next date)`` periods tile the slice history."""
+    ordered = sorted(versions, key=lambda version: version.date)
+    rows: List[tuple] = []
+    for index, version in enumerate(ordered):
+        start = _parse_date(version.date)
+        end = _parse_date(ordered[index + 1].date) if index + 1 < len(ordered) else effective_to
+        if end is not None and end < start:
+            end = start
+        rows.append(
+            (
+                slice_id,
+                version.version_id,
+                version.event,
+                start,
+                version.by_instrument,
+                version.by_url,
+                end,
+            )
+        )
+    return rows
+
+
+def vector_literals(matrix: Sequence[Sequence[float]]) -> List[str]:
+    """pgvector text input per row, so COPY needs no adapter.
+
+    Formatting costs more than hash embedding itself, so the loader runs it
+    inside the embedding workers.
+    """
+    return [to_db(row, PGVECTOR_DIM) for row in matrix]
+
+
+def slice_row(record: LegalSlice, vector_literal: Optional[str]) -> tuple:
+    """One ``SLICE_COLUMNS`` tuple, normalised the way search expects it."""
+    jurisdiction = record.jurisdiction
+    locators = record.structure.locators
+    text_content = normalize_whitespace(record.text_content)
+    return (
+        record.id,
+        jurisdiction.level,
+        jurisdiction.name,
+        jurisdiction.emirate,
+        jurisdiction.freezone,
+        record.source.portal,
+        str(record.source.url),
+        record.source.gazette,
+        record.instrument.type,
+        record.instrument.number,
+        record.instrument.year,
+        record.instrument.title,
+        record.instrument.issuer,
+        record.instrument.official_language,
+        record.structure.granularity,
+        record.structure.path,
+        locators.part,
+        locators.chapter,
+        locators.section,
+        locators.article,
+        locators.rule,
+        locators.clause,
+        locators.item,
+        text_content,
+        record.text_hash,
+        record.primary_lang,
+        list(record.topics or []),
+        jurisdiction_keys(
+            jurisdiction.level, jurisdiction.name, jurisdiction.emirate, jurisdiction.freezone
+        ),
+        record.state,
+        _parse_date(record.effective.from_date),
+        _parse_date(record.effective.to_date),
+        vector_literal,
+        build_snippet(text_content),
+    )
+
+
+def record_fingerprint(record: LegalSlice) -> str:
+    """Hash of the slice and version rows ``record`` stages, minus the vector.
+
+    Compared with ``legal_slice.row_fingerprint`` so edits that leave
+    ``text_hash`` alone (title, jurisdiction, topics, dates, versions) are
+    still written, without re-embedding.
+    """
+    effective_to = _parse_date(record.effective.to_date)
+    rows = (slice_row(record, None), version_rows(record.id, record.versions, effective_to))
+    return hashlib.sha256(repr(rows).encode("utf-8")).hexdigest()
+
+
+def _columns(names: Sequence[str], prefix: str = "") -> str:
+    return ", ".join(prefix + name for name in names)
+
+
+# Staged per slice: the ``slice_row`` columns plus its ``record_fingerprint``.
+STAGE_COLUMNS = SLICE_COLUMNS + ("row_fingerprint",)
+
+
+# Staging tables live for one transaction. ``stage_ord`` is the input position,
+# so a slice id that appears twice keeps its last occurrence (as merge did).
+STAGING_DDL = (
+    f"CREATE TEMP TABLE legal_slice_stage ON COMMIT DROP AS "
+    f"SELECT {_columns(STAGE_COLUMNS)}, 0::BIGINT AS stage_ord FROM legal_slice WITH NO DATA",
+    "CREATE TEMP TABLE legal_slice_version_stage (slice_id TEXT, version_id TEXT, event TEXT, "
+    "event_date DATE, by_instrument TEXT, by_url TEXT, valid_to DATE, stage_ord BIGINT) "
+    "ON COMMIT DROP",
+)
+
+# Metadata-only changes are staged without a vector and keep the stored one.
+APPLY_SLICES_SQL = (
+    f"INSERT INTO legal_slice ({_columns(STAGE_COLUMNS)}) "
+    f"SELECT DISTINCT ON (id) {_columns(STAGE_COLUMNS)} FROM legal_slice_stage "
+    f"ORDER BY id, stage_ord DESC "
+    f"ON CONFLICT (id) DO UPDATE SET "
+    + ", ".join(
+        "vector_embedding = COALESCE(EXCLUDED.vector_embedding, legal_slice.vector_embedding)"
+        if name == "vector_embedding"
+        else f"{name} = EXCLUDED.{name}"
+        for name in STAGE_COLUMNS
+        if name != "id"
+    )
+)
+
+# Versions are replaced wholesale for every staged slice, as the ORM's
+# delete-orphan cascade did.
+REPLACE_VERSIONS_SQL = (
+    "DELETE FROM legal_slice_version WHERE slice_id IN (SELECT id FROM legal_slice_stage)",
+    "INSERT INTO legal_slice_version "
+    "(slice_id, version_id, event, event_date, by_instrument, by_url, valid_period) "
+    "SELECT v.slice_id, v.version_id, v.event, v.event_date, v.by_instrument, v.by_url, "
+    "daterange(v.event_date, v.valid_to, '[)') "
+    "FROM legal_slice_version_stage v "
+    "JOIN (SELECT id, max(stage_ord) AS stage_ord FROM legal_slice_stage GROUP BY id) latest "
+    "ON latest.id = v.slice_id AND latest.stage_ord = v.stage_ord",
+)
+
+
+class LoadResult(NamedTuple):
+    """Slice counts of one ``upsert_records`` run, keyed by distinct id."""
+
+    added: int
+    changed: int
+    unchanged: int
+    removed: int
+    # Per-stage throughput of the ingest pipeline (parse, embed, write).
+    stages: Tuple[StageMetrics, ...] = ()
+
+    @property
+    def modified(self) -> bool:
+        return bool(self.added or self.changed or self.removed)
+
+
 def load_seed_records(payload: List[Dict[str, Any]]) -> List[LegalSlice]:
     return [LegalSlice(**item) for item in payload]
 
 
-def upsert_records(records: List[LegalSlice]) -> None:
+def _batches(records: Iterable[LegalSlice], size: int) -> Iterator[List[LegalSlice]]:
+    iterator = iter(records)
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+class _ParsedBatch(NamedTuple):
+    records: List[LegalSlice]  # new or changed records only
+    read: int  # records read from the payload so far
+    # Per record: whether its text changed and needs a new vector (None: all).
+    embed: Optional[List[bool]] = None
+    fingerprints: Optional[List[str]] = None
+
+
+def report_progress(done: int, total: Optional[int], elapsed: float) -> None:
+    rate = done / elapsed if elapsed > 0 else 0.0
+    of_total = f"/{total}" if total is not None else ""
+    print(f"\r  checked {done}{of_total} slices ({rate:,.0f}/s)", end="", file=sys.stderr, flush=True)
+
+
+def embed_batches(provider: EmbeddingProvider, batches: Iterable[Any]) -> Iterator[tuple]:
+    """``(batch, vector_literals)`` in input order, ``provider.workers`` batches in flight.
+
+    ``batches`` carry their new or changed slices in ``.records``; records
+    whose ``.embed`` flag is false get ``None`` instead of a vector.
+    """
+    in_flight: deque = deque()
+
+    def finished() -> tuple:
+        done, future = in_flight.popleft()
+        literals = iter(future.result() if future is not None else ())
+        if done.embed is None:
+            return done, list(literals)
+        return done, [next(literals) if flag else None for flag in done.embed]
+
+    for batch in batches:
+        flags = batch.embed if batch.embed is not None else [True] * len(batch.records)
+        texts = [record.text_content for record, flag in zip(batch.records, flags) if flag]
+        future = provider.submit_many(texts, finish=vector_literals) if texts else None
+        in_flight.append((batch, future))
+        if len(in_flight) >= provider.workers:
+            yield finished()
+    while in_flight:
+        yield finished()
+
+
+def report_stages(stages: Sequence[StageMetrics]) -> None:
+    for stage in stages:
+        print(
+            f"  {stage.name:<6} {stage.records:>8} slices  {stage.rate:>10,.0f}/s busy  "
+            f"busy {stage.busy:.2f}s  waiting {stage.waiting:.2f}s  blocked {stage.blocked:.2f}s"
+        )
+
+
+def upsert_records(
+    records: Iterable[LegalSlice],
+    batch_size: int = SEED_BATCH_SIZE,
+    progress: Optional[Callable[[int, Optional[int], float], None]] = report_progress,
+    prune: bool = False,
+    full: bool = False,
+    workers: int = SEED_EMBED_WORKERS,
+    queue_depth: int = SEED_QUEUE_DEPTH,
+) -> LoadResult:
+    """Bulk upsert new and changed ``records`` in one transaction.
+
+    The stored ``(id, text_hash, row_fingerprint)`` rows are read first;
+    records whose ``record_fingerprint`` matches are skipped, so reloading an
+    unchanged payload writes nothing. Only records whose ``text_hash``
+    changed are embedded; metadata-only changes keep the stored vector.
+    ``full`` re-embeds and stages every record regardless, and ``prune``
+    deletes stored slices whose id does not appear in ``records``.
+
+    Ingest runs as a three-stage ``Pipeline``: a parse thread validates and
+    filters ``records`` into batches, an embed thread keeps up to ``workers``
+    batches in flight on the provider's process pool, and this thread writes
+    each embedded batch into temporary staging tables with ``COPY``. Bounded
+    queues (``queue_depth`` batches) apply backpressure, so memory stays
+    proportional to the batch size. A single ``INSERT ... ON CONFLICT DO
+    UPDATE`` then applies every staged slice, and versions are replaced for
+    the staged ids.
+    """
     init_db()
-    with get_session() as session:
-        for record in records:
-            locators = record.structure.locators
-            effective = record.effective
-            topics = list(record.topics or [])
-            model = LegalSliceModel(
-                id=record.id,
-                level=record.jurisdiction.level,
-                name=record.jurisdiction.name,
-                emirate=record.jurisdiction.emirate,
-                freezone=record.jurisdiction.freezone,
-                portal=record.source.portal,
-                url=record.source.url,
-                gazette=record.source.gazette,
-                type=record.instrument.type,
-                number=record.instrument.number,
-                year=record.instrument.year,
-                title=record.instrument.title,
-                issuer=record.instrument.issuer,
-                official_language=record.instrument.official_language,
-                granularity=record.structure.granularity,
-                path=record.structure.path,
-                part=locators.part,
-                chapter=locators.chapter,
-                section=locators.section,
-                article=locators.article,
-                rule=locators.rule,
-                clause=locators.clause,
-                item=locators.item,
-                text_content=normalize_whitespace(record.text_content),
-                text_hash=record.text_hash,
-                primary_lang=record.primary_lang,
-                topics=topics,
-                state=record.state,
-                effective_from=_parse_date(effective.from_date),
-                effective_to=_parse_date(effective.to_date),
-                vector_embedding=embed(record.text_content).tolist(),
+    total = len(records) if isinstance(records, Sized) else None
+    started = time.perf_counter()
+    seen: Set[str] = set()
+    added: Set[str] = set()
+    changed: Set[str] = set()
+    staged = 0
+    embedded = 0
+    provider = create_provider(workers=max(1, workers))
+    with engine.begin() as conn:
+        stored: Dict[str, Tuple[str, Optional[str]]] = {
+            slice_id: (text_hash, fingerprint)
+            for slice_id, text_hash, fingerprint in conn.execute(
+                text("SELECT id, text_hash, row_fingerprint FROM legal_slice")
             )
-            session.merge(model)
-        session.commit()
+        }
+        # Fingerprint each id will hold once staged rows are applied; a
+        # repeated id is staged again only if it differs from the occurrence
+        # before it.
+        current = {slice_id: fingerprint for slice_id, (_, fingerprint) in stored.items()}
+
+        def parse() -> Iterator[_ParsedBatch]:
+            read = 0
+            for batch in _batches(records, batch_size):
+                pending: List[LegalSlice] = []
+                embed: List[bool] = []
+                fingerprints: List[str] = []
+                for record in batch:
+                    seen.add(record.id)
+                    fingerprint = record_fingerprint(record)
+                    if not full and record.id in current and current[record.id] == fingerprint:
+                        continue
+                    (changed if record.id in stored else added).add(record.id)
+                    # Unembedded rows fall back to the stored vector, so only
+                    # text matching the stored text_hash may skip embedding.
+                    embed.append(
+                        full or record.id not in stored or stored[record.id][0] != record.text_hash
+                    )
+                    current[record.id] = fingerprint
+                    pending.append(record)
+                    fingerprints.append(fingerprint)
+                read += len(batch)
+                yield _ParsedBatch(pending, read, embed, fingerprints)
+
+        pipeline = Pipeline(
+            "parse",
+            parse(),
+            queue_depth=queue_depth,
+            size=lambda batch: len(batch.records),
+            sink_name="write",
+        ).add_stage(
+            "embed",
+            lambda batches: embed_batches(provider, batches),
+            size=lambda item: len(item[0].records),
+        )
+
+        for statement in STAGING_DDL:
+            conn.execute(text(statement))
+        cursor = conn.connection.driver_connection.cursor()
+        try:
+            for batch, vectors in pipeline:
+                if batch.records:
+                    with cursor.copy(
+                        f"COPY legal_slice_stage ({_columns(STAGE_COLUMNS)}, stage_ord) FROM STDIN"
+                    ) as copy:
+                        for offset, (record, vector, fingerprint) in enumerate(
+                            zip(batch.records, vectors, batch.fingerprints)
+                        ):
+                            copy.write_row((*slice_row(record, vector), fingerprint, staged + offset))
+                    with cursor.copy(
+                        f"COPY legal_slice_version_stage ({_columns(VERSION_STAGE_COLUMNS)}, stage_ord) "
+                        f"FROM STDIN"
+                    ) as copy:
+                        for offset, record in enumerate(batch.records):
+                            effective_to = _parse_date(record.effective.to_date)
+                            for row in version_rows(record.id, record.versions, effective_to):
+                                copy.write_row((*row, staged + offset))
+                    staged += len(batch.records)
+                    embedded += sum(batch.embed)
+                if progress is not None:
+                    progress(batch.read, total, time.perf_counter() - started)
+        finally:
+            provider.close()
+
+        removed = sorted(set(stored) - seen) if prune else []
+        if removed:
+            # legal_slice_version rows go with them (ON DELETE CASCADE).
+            conn.execute(
+                text("DELETE FROM legal_slice WHERE id = ANY(:ids)"), {"ids": removed}
+            )
+        if staged:
+            conn.execute(text(APPLY_SLICES_SQL))
+            for statement in REPLACE_VERSIONS_SQL:
+                conn.execute(text(statement))
+        if embedded:
+            # IVFFlat centroids were trained on the previous vectors.
+            ensure_vector_index(conn, rebuild=True)
+        result = LoadResult(
+            added=len(added),
+            changed=len(changed),
+            unchanged=len(seen - added - changed),
+            removed=len(removed),
+            stages=tuple(pipeline.metrics),
+        )
+        if result.modified:
+            # Invalidates cached search results in every running API process.
+            bump_corpus_version(conn)
+    if progress is not None:
+        print(file=sys.stderr)
+    return result
 
 
 def main() -> None:
@@ -81,18 +506,50 @@ def main() -> None:
     parser.add_argument(
         "payload",
         type=Path,
-        help="Path to JSON payload matching schema.LegalSlice[]",
+        help="Path to a JSON array or JSON Lines payload of schema.LegalSlice records",
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=SEED_BATCH_SIZE,
+        help=f"Slices embedded and copied per batch (default: {SEED_BATCH_SIZE}).",
+    )
+    parser.add_argument(
+        "--prune",
+        action="store_true",
+        help="Delete stored slices whose id is missing from the payload.",
+    )
+    parser.add_argument(
+        "--full",
+        action="store_true",
+        help="Re-embed and upsert every slice, even unchanged ones.",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=SEED_EMBED_WORKERS,
+        help=f"Embedding processes (default: SEED_EMBED_WORKERS or the usable CPUs, {SEED_EMBED_WORKERS}).",
     )
+    parser.add_argument("--quiet", action="store_true", help="Do not report progress or stage metrics.")
     args = parser.parse_args()
 
-    with args.payload.open("r", encoding="utf-8") as fh:
-        raw_data = json.load(fh)
-
-    if not isinstance(raw_data, list):
-        raise ValueError("Expected list of legal slice objects.")
-
-    records = load_seed_records(raw_data)
-    upsert_records(records)
+    started = time.perf_counter()
+    # Records are parsed and validated lazily, one batch ahead of the loader.
+    result = upsert_records(
+        iter_seed_records(args.payload),
+        batch_size=max(1, args.batch_size),
+        progress=None if args.quiet else report_progress,
+        prune=args.prune,
+        full=args.full,
+        workers=args.workers,
+    )
+    print(
+        f"✅ Loaded legal slices in {time.perf_counter() - started:.1f}s: "
+        f"{result.added} added, {result.changed} changed, "
+        f"{result.unchanged} unchanged, {result.removed} removed"
+    )
+    if not args.quiet:
+        report_stages(result.stages)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import IO, Any, Iterator, Optional, Union
+
+try:
+    from ..schema import LegalSlice  # type: ignore[import]
+except ImportError:  # Fallback when executed as `python -m utils.seed_loader`
+    from schema import LegalSlice  # type: ignore[import]
+
+# Characters read from the payload per refill; one record never has to fit.
+READ_SIZE = 1 << 16
+
+_DECODER = json.JSONDecoder()
+_WHITESPACE = " \t\r\n"
+# A decode error this close to the end of the buffer may be a token cut by
+# the read (``tru``, ``-``, ``\u00``) rather than bad input.
+_TOKEN_TAIL = 6
+
+
+def _needs_more_input(exc: json.JSONDecodeError, size: int) -> bool:
+    # Unterminated strings are reported at their opening quote.
+    return exc.msg.startswith("Unterminated string") or exc.pos >= size - _TOKEN_TAIL
+
+
+def iter_json_items(
+    fh: IO[str], read_size: int = READ_SIZE, array: Optional[bool] = None
+) -> Iterator[Any]:
+    """Yield the items of a top-level JSON array, or the values of a JSONL stream.
+
+    The format is detected from the first non-blank character unless
+    ``array`` requires one. JSONL values must each sit on their own line.
+    Only the item being decoded (plus one read) is buffered, so memory does
+    not grow with the payload; reads double while one item stays incomplete.
+    """
+    buffer = ""
+    pos = 0
+    eof = False
+    in_array = None
+    expect_comma = False
+    after_comma = False
+    new_line = True
+
+    def refill(size: int = read_size) -> bool:
+        nonlocal buffer, pos, eof
+        chunk = fh.read(size)
+        if not chunk:
+            eof = True
+            return False
+        buffer = buffer[pos:] + chunk
+        pos = 0
+        return True
+
+    want = read_size
+    while True:
+        while pos < len(buffer) and buffer[pos] in _WHITESPACE:
+            new_line = new_line or buffer[pos] == "\n"
+            pos += 1
+        if pos == len(buffer):
+            if refill():
+                continue
+            if in_array:
+                raise ValueError("Unterminated JSON array in seed payload.")
+            return
+
+        char = buffer[pos]
+        if in_array is None:
+            in_array = char == "["
+            if array and not in_array:
+                raise ValueError("Seed payload must be a JSON array of records.")
+            if array is False and in_array:
+                raise ValueError("Seed payload must be JSON Lines, found a JSON array.")
+            if in_array:
+                pos += 1
+                continue
+        if in_array:
+            if char == "]":
+                if after_comma:
+                    raise ValueError("Trailing ',' after the last seed record.")
+                return
+            if expect_comma:
+                if char != ",":
+                    raise ValueError(f"Expected ',' between seed records, found {char!r}.")
+                pos += 1
+                expect_comma = False
+                after_comma = True
+                continue
+        elif not new_line:
+            raise ValueError("Expected one JSON value per line of a JSONL seed payload.")
+
+        try:
+            item, end = _DECODER.raw_decode(buffer, pos)
+        except json.JSONDecodeError as exc:
+            if not eof and _needs_more_input(exc, len(buffer)) and refill(want):
+                want *= 2
+                continue
+            raise
+        if end == len(buffer) and not eof and refill(want):
+            # A scalar may continue in the next read; decode it again whole.
+            want *= 2
+            continue
+        if not in_array and "\n" in buffer[pos:end]:
+            raise ValueError(
+                "A JSONL seed record spans several lines; "
+                "wrap a multi-line JSON document in a top-level array."
+            )
+        want = read_size
+        pos = end
+        expect_comma = bool(in_array)
+        after_comma = False
+        new_line = False
+        yield item
+
+
+def iter_seed_records(
+    source: Union[Path, str, IO[str]], array: Optional[bool] = None
+) -> Iterator[LegalSlice]:
+    """Validated ``LegalSlice`` records streamed from a JSON array or JSONL payload.
+
+    A ``.json`` path must hold an array and a ``.jsonl`` path JSON Lines.
+    """
+    if isinstance(source, (str, Path)):
+        suffix = Path(source).suffix.lower()
+        with open(source, "r", encoding="utf-8") as fh:
+            yield from iter_seed_records(fh, array={".json": True, ".jsonl": False}.get(suffix))
+        return
+    for index, item in enumerate(iter_json_items(source, array=array)):
+        if not isinstance(item, dict):
+            raise ValueError(f"Seed record #{index} is not a legal slice object.")
+        yield LegalSlice(**item)
+
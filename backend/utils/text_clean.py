@@ -4,6 +4,9 @@ import re
 
 WHITESPACE_RE = re.compile(r"\s+")
 
+# Length of the citation snippet stored in ``legal_slice.snippet`` at ingest.
+SNIPPET_MAX_CHARS = 200
+
 
 def normalize_whitespace(text: str) -> str:
     """Collapse whitespace to single spaces to stabilise matching/snippetting."""
@@ -19,3 +22,8 @@ def truncate_for_snippet(text: str, max_chars: int = 400) -> str:
     if cutoff == -1:
         cutoff = max_chars
     return normalized[:cutoff].rstrip() + "…"
+
+
+def build_snippet(text: str) -> str:
+    """Citation snippet stored alongside each slice, so search never re-cuts it."""
+    return truncate_for_snippet(text, max_chars=SNIPPET_MAX_CHARS)
@@ -0,0 +1,397 @@
+from __future__ import annotations
+
+import asyncio
+import os
+import tempfile
+import threading
+import warnings
+from datetime import date
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy import and_, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from .cache import CorpusVersionTracker
+from .db import PGVECTOR_DIM, PGVECTOR_METRIC, VECTOR_RESCORE_FACTOR, get_corpus_version
+from .jurisdictions import canonical_jurisdiction, jurisdiction_keys
+from .models import LegalSlice, LegalSliceVersion
+from .search import (
+    SEARCHABLE_STATES,
+    SearchFilters,
+    SliceCandidate,
+    _candidate_columns,
+    _score_from_measure,
+)
+
+VECTOR_INDEX_PATH = os.getenv(
+    "VECTOR_INDEX_PATH",
+    os.path.join(tempfile.gettempdir(), "uae_legal_vector_index.npy"),
+)
+
+try:
+    VECTOR_INDEX_VERSION_CHECK = float(os.getenv("VECTOR_INDEX_VERSION_CHECK", "5"))
+except ValueError:
+    warnings.warn("Invalid VECTOR_INDEX_VERSION_CHECK provided; falling back to 5.")
+    VECTOR_INDEX_VERSION_CHECK = 5.0
+
+# Resident copy used for the first stage; the float32 matrix stays memory
+# mapped and is only touched for the rows being rescored.
+SUPPORTED_QUANTIZATIONS = {"none", "float16", "int8"}
+VECTOR_INDEX_QUANTIZATION = os.getenv("VECTOR_INDEX_QUANTIZATION", "none").lower()
+if VECTOR_INDEX_QUANTIZATION not in SUPPORTED_QUANTIZATIONS:
+    warnings.warn(
+        f"Unsupported VECTOR_INDEX_QUANTIZATION '{VECTOR_INDEX_QUANTIZATION}', defaulting to 'none'."
+    )
+    VECTOR_INDEX_QUANTIZATION = "none"
+
+_LOAD_BATCH = 2000
+# Rows converted back to float32 at a time when scanning a quantized matrix.
+_SCAN_BLOCK = 8192
+_MAX_DAY = np.datetime64("9999-12-31", "D")
+
+
+class VectorIndex:
+    """Exact top-k over a memory-mapped float32 matrix of slice embeddings.
+
+    Rows are the searchable slices of ``legal_slice`` (state in
+    ``SEARCHABLE_STATES`` with an embedding). Distances follow pgvector's
+    operators for ``PGVECTOR_METRIC`` and are turned into scores with the
+    same formula as the SQL path, so both backends rank identically.
+    """
+
+    def __init__(
+        self,
+        candidates: Sequence[SliceCandidate],
+        matrix: np.ndarray,
+        topics: Sequence[Sequence[str]],
+        effective_from: np.ndarray,
+        effective_to: np.ndarray,
+        version: Optional[int] = None,
+        quantization: str = VECTOR_INDEX_QUANTIZATION,
+        version_periods: Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]] = None,
+        rescore_factor: int = VECTOR_RESCORE_FACTOR,
+    ) -> None:
+        self.candidates = list(candidates)
+        self.matrix = matrix
+        self.version = version
+        self.quantization = quantization
+        self.rescore_factor = rescore_factor
+        size = len(self.candidates)
+        self._all_rows = np.ones(size, dtype=bool)
+        self._no_rows = np.zeros(size, dtype=bool)
+
+        # One boolean mask per jurisdiction key (as in ``legal_slice.
+        # jurisdiction_keys``) and per topic, built once so filtering is pure AND-ing.
+        self.jurisdiction_masks: Dict[str, np.ndarray] = {}
+        self.topic_masks: Dict[str, np.ndarray] = {}
+        for row, candidate in enumerate(self.candidates):
+            for key in jurisdiction_keys(
+                candidate.level, candidate.name, candidate.emirate, candidate.freezone
+            ):
+                self._mask_for(self.jurisdiction_masks, key)[row] = True
+            for topic in topics[row] or ():
+                self._mask_for(self.topic_masks, topic)[row] = True
+
+        # Effective dates sorted once; an as_of lookup is two binary searches.
+        # Open-ended periods sort last via the maximum representable day.
+        self._from_order = np.argsort(effective_from, kind="stable")
+        self._from_sorted = effective_from[self._from_order]
+        open_ended = np.where(np.isnat(effective_to), _MAX_DAY, effective_to)
+        self._to_order = np.argsort(open_ended, kind="stable")
+        self._to_sorted = open_ended[self._to_order]
+
+        # ``(row, valid_from, valid_to)`` per version, repeals as empty periods;
+        # rows with any version resolve ``as_of`` through them, as in SQL.
+        if version_periods is None:
+            version_periods = (
+                np.zeros(0, dtype=np.int64),
+                np.zeros(0, dtype="datetime64[D]"),
+                np.zeros(0, dtype="datetime64[D]"),
+            )
+        self._version_rows, self._version_from, version_to = version_periods
+        self._version_to = np.where(np.isnat(version_to), _MAX_DAY, version_to)
+        self._versioned = np.zeros(size, dtype=bool)
+        self._versioned[self._version_rows] = True
+
+        # Squared norms in float64, reused by cosine and euclidean distances.
+        self._sq_norms = np.einsum("ij,ij->i", matrix, matrix, dtype=np.float64)
+        self.quantized, self.row_scale = quantize(matrix, quantization)
+
+    def _mask_for(self, masks: Dict[str, np.ndarray], key: str) -> np.ndarray:
+        mask = masks.get(key)
+        if mask is None:
+            mask = masks[key] = np.zeros(len(self.candidates), dtype=bool)
+        return mask
+
+    def __len__(self) -> int:
+        return len(self.candidates)
+
+    @classmethod
+    def load(
+        cls,
+        session: Session,
+        path: str = VECTOR_INDEX_PATH,
+        version: Optional[int] = None,
+    ) -> "VectorIndex":
+        """Stream embeddings out of Postgres into a memory-mapped ``.npy`` file."""
+        return cls(**cls.fetch(session, path), version=version)
+
+    @classmethod
+    def fetch(cls, session: Session, path: str = VECTOR_INDEX_PATH) -> Dict[str, Any]:
+        """The database half of ``load``: constructor arguments for the rows.
+
+        Masks, sort orders, norms and quantization are built by the
+        constructor, which async callers run off the event loop.
+        """
+        condition = and_(
+            LegalSlice.vector_embedding.is_not(None),
+            LegalSlice.state.in_(SEARCHABLE_STATES),
+        )
+        expected = session.execute(
+            select(func.count()).select_from(LegalSlice).where(condition)
+        ).scalar_one()
+
+        stmt = (
+            select(
+                *_candidate_columns(),
+                LegalSlice.topics,
+                LegalSlice.effective_from,
+                LegalSlice.effective_to,
+                LegalSlice.vector_embedding,
+            )
+            .where(condition)
+            .order_by(LegalSlice.id)
+            .execution_options(yield_per=_LOAD_BATCH)
+        )
+
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        writer = np.lib.format.open_memmap(
+            tmp_path, mode="w+", dtype=np.float32, shape=(max(expected, 1), PGVECTOR_DIM)
+        )
+        candidates: List[SliceCandidate] = []
+        topics: List[Sequence[str]] = []
+        effective_from: List[date] = []
+        effective_to: List[Optional[date]] = []
+        width = len(SliceCandidate._fields)
+        for row in session.execute(stmt):
+            # Rows committed after the count are picked up on the next reload.
+            if len(candidates) == expected:
+                break
+            writer[len(candidates)] = row[-1]
+            candidates.append(SliceCandidate._make(row[:width]))
+            topics.append(row[width])
+            effective_from.append(row[width + 1])
+            effective_to.append(row[width + 2])
+        writer.flush()
+        del writer
+        os.replace(tmp_path, path)
+
+        matrix = np.load(path, mmap_mode="r")[: len(candidates)]
+        return dict(
+            candidates=candidates,
+            matrix=matrix,
+            topics=topics,
+            effective_from=np.array(effective_from, dtype="datetime64[D]").reshape(-1),
+            effective_to=np.array(effective_to, dtype="datetime64[D]").reshape(-1),
+            version_periods=cls._load_version_periods(session, candidates, condition),
+        )
+
+    @staticmethod
+    def _load_version_periods(
+        session: Session, candidates: Sequence[SliceCandidate], condition
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        row_of = {candidate.id: row for row, candidate in enumerate(candidates)}
+        stmt = (
+            select(LegalSliceVersion.slice_id, LegalSliceVersion.event, LegalSliceVersion.valid_period)
+            .join(LegalSlice, LegalSlice.id == LegalSliceVersion.slice_id)
+            .where(condition)
+            .execution_options(yield_per=_LOAD_BATCH)
+        )
+        rows: List[int] = []
+        valid_from: List[date] = []
+        valid_to: List[Optional[date]] = []
+        for slice_id, event, period in session.execute(stmt):
+            row = row_of.get(slice_id)
+            if row is None:
+                continue
+            rows.append(row)
+            if event == "repealed" or period.isempty:
+                # Never in force, but still marks the row as versioned.
+                valid_from.append(date.min)
+                valid_to.append(date.min)
+            else:
+                valid_from.append(period.lower)
+                valid_to.append(period.upper)
+        return (
+            np.array(rows, dtype=np.int64),
+            np.array(valid_from, dtype="datetime64[D]").reshape(-1),
+            np.array(valid_to, dtype="datetime64[D]").reshape(-1),
+        )
+
+    def as_of_mask(self, as_of: date) -> np.ndarray:
+        """Rows in force on ``as_of``, like ``search._in_force_condition``.
+
+        Versioned rows need a non-repeal version covering the day; the others
+        need their ``[effective_from, effective_to)`` period to contain it.
+        """
+        day = np.datetime64(as_of, "D")
+        started = np.zeros(len(self.candidates), dtype=bool)
+        started[self._from_order[: np.searchsorted(self._from_sorted, day, side="right")]] = True
+        not_ended = np.zeros(len(self.candidates), dtype=bool)
+        not_ended[self._to_order[np.searchsorted(self._to_sorted, day, side="right") :]] = True
+        effective = started & not_ended
+        if not len(self._version_rows):
+            return effective
+        in_force = np.zeros(len(self.candidates), dtype=bool)
+        covering = (self._version_from <= day) & (day < self._version_to)
+        in_force[self._version_rows[covering]] = True
+        return np.where(self._versioned, in_force, effective)
+
+    def filter_mask(self, filters: SearchFilters) -> np.ndarray:
+        """Boolean row mask equivalent to ``search._build_filtered_query``."""
+        mask = self._all_rows
+
+        jurisdiction = canonical_jurisdiction(filters.jurisdiction)
+        if jurisdiction:
+            mask = mask & self.jurisdiction_masks.get(jurisdiction, self._no_rows)
+
+        for topic in filters.topics or ():
+            mask = mask & self.topic_masks.get(topic, self._no_rows)
+
+        if filters.as_of:
+            mask = mask & self.as_of_mask(filters.as_of)
+
+        return mask
+
+    def _dots(self, rows: np.ndarray, query: np.ndarray, quantized: bool = False) -> np.ndarray:
+        """Row·query products, exact or from the quantized copy."""
+        # Fancy indexing copies, so only gather rows when a filter excluded some.
+        full = len(rows) == len(self.candidates)
+        if not quantized or self.quantized is None:
+            subset = self.matrix if full else self.matrix[rows]
+            return (subset @ query).astype(np.float64)
+        subset = self.quantized if full else self.quantized[rows]
+        dots = np.empty(len(rows), dtype=np.float64)
+        # NumPy has no BLAS kernel for float16/int8, so widen block by block.
+        for start in range(0, len(rows), _SCAN_BLOCK):
+            block = subset[start : start + _SCAN_BLOCK].astype(np.float32)
+            dots[start : start + len(block)] = block @ query
+        if self.row_scale is not None:
+            dots *= self.row_scale[rows]
+        return dots
+
+    def _distances(
+        self, rows: np.ndarray, query_vector: np.ndarray, quantized: bool = False
+    ) -> np.ndarray:
+        """pgvector-compatible distance (``<=>``, ``<#>`` or ``<->``) per row."""
+        query = np.asarray(query_vector, dtype=np.float32)
+        dots = self._dots(rows, query, quantized=quantized)
+        if PGVECTOR_METRIC == "ip":
+            return -dots
+        query_sq = float(np.dot(query.astype(np.float64), query.astype(np.float64)))
+        row_sq = self._sq_norms[rows]
+        if PGVECTOR_METRIC == "euclidean":
+            return np.sqrt(np.maximum(row_sq - 2.0 * dots + query_sq, 0.0))
+        denominator = np.sqrt(row_sq * query_sq)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.where(denominator > 0, 1.0 - dots / denominator, np.nan)
+
+    def search(
+        self, query_vector: np.ndarray, filters: SearchFilters, k: int = 8
+    ) -> List[Tuple[SliceCandidate, float]]:
+        rows = np.flatnonzero(self.filter_mask(filters))
+        if not len(rows) or k <= 0:
+            return []
+        if self.quantized is not None:
+            # Shortlist on the quantized copy, then rescore at full precision.
+            rows = _valid_top_k(
+                rows,
+                self._distances(rows, query_vector, quantized=True),
+                k * self.rescore_factor,
+            )[0]
+        rows, distances = _valid_top_k(rows, self._distances(rows, query_vector), k)
+        return [
+            (self.candidates[row], _score_from_measure(distance))
+            for row, distance in zip(rows, distances)
+        ]
+
+
+def quantize(
+    matrix: np.ndarray, quantization: str
+) -> Tuple[Optional[np.ndarray], Optional[np.ndarray]]:
+    """Compact copy of ``matrix`` plus per-row scales (int8 only)."""
+    if quantization == "float16":
+        return matrix.astype(np.float16), None
+    if quantization != "int8":
+        return None, None
+    codes = np.empty(matrix.shape, dtype=np.int8)
+    scales = np.empty(len(matrix), dtype=np.float64)
+    for start in range(0, len(matrix), _SCAN_BLOCK):
+        block = np.asarray(matrix[start : start + _SCAN_BLOCK], dtype=np.float32)
+        # Symmetric per-row scaling: the largest component maps to ±127.
+        peak = np.abs(block).max(axis=1) if block.shape[1] else np.zeros(len(block))
+        scale = np.where(peak > 0, peak / 127.0, 1.0)
+        codes[start : start + len(block)] = np.rint(block / scale[:, None].astype(np.float32))
+        scales[start : start + len(block)] = scale
+    return codes, scales
+
+
+def _valid_top_k(
+    rows: np.ndarray, distances: np.ndarray, k: int
+) -> Tuple[np.ndarray, np.ndarray]:
+    """The ``k`` smallest non-NaN distances, ordered, with their rows.
+
+    Ties go to the lower row, and rows are loaded ``ORDER BY id``, so the
+    order matches SQL's ``ORDER BY distance, id``.
+    """
+    valid = ~np.isnan(distances)
+    rows, distances = rows[valid], distances[valid]
+    if not len(rows):
+        return rows, distances
+    k = min(k, len(rows))
+    kth = np.partition(distances, k - 1)[k - 1]
+    # Everything tied with the k-th distance competes for the last places.
+    top = np.flatnonzero(distances <= kth)
+    top = top[np.lexsort((rows[top], distances[top]))][:k]
+    return rows[top], distances[top]
+
+
+_index: Optional[VectorIndex] = None
+_index_lock = threading.Lock()
+# Serialises async reloads; the thread lock cannot be held across awaits.
+_async_reload_lock = asyncio.Lock()
+_version_tracker = CorpusVersionTracker(
+    get_corpus_version, interval=VECTOR_INDEX_VERSION_CHECK
+)
+
+
+def get_vector_index(session: Session) -> VectorIndex:
+    """Process-wide index, rebuilt whenever the corpus version moves on."""
+    global _index
+    version = _version_tracker.current(session)
+    with _index_lock:
+        if _index is None or _index.version != version:
+            _index = VectorIndex.load(session, version=version)
+        return _index
+
+
+async def get_vector_index_async(session: AsyncSession) -> VectorIndex:
+    """``get_vector_index`` for an ``AsyncSession``.
+
+    Only the queries run on the event loop; building the index happens in a
+    worker thread.
+    """
+    global _index
+    version = await session.run_sync(_version_tracker.current)
+    index = _index
+    if index is not None and index.version == version:
+        return index
+    async with _async_reload_lock:
+        if _index is None or _index.version != version:
+            arguments = await session.run_sync(VectorIndex.fetch)
+            index = await asyncio.to_thread(lambda: VectorIndex(**arguments, version=version))
+            with _index_lock:
+                _index = index
+        return _index
@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import argparse
+import random
+import string
+import sys
+import time
+from pathlib import Path
+from typing import Callable, List
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from backend.embeddings import EMBEDDING_PROVIDER, create_provider  # noqa: E402
+from backend.search import embed_query  # noqa: E402
+
+
+def make_texts(count: int, words: int, seed: int) -> List[str]:
+    rng = random.Random(seed)
+    vocabulary = [
+        "".join(rng.choices(string.ascii_lowercase, k=rng.randint(3, 10)))
+        for _ in range(2000)
+    ]
+    return [" ".join(rng.choices(vocabulary, k=words)) for _ in range(count)]
+
+
+def timed(label: str, count: int, fn: Callable[[], object], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    per_10k = best * 10_000 / count
+    print(
+        f"  {label:<28} {count / best:>12,.0f} texts/s   {per_10k * 1000:>10.1f} ms per 10k"
+    )
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Benchmark placeholder embedding throughput (per-text vs batched)."
+    )
+    parser.add_argument("--count", type=int, default=10_000, help="Texts per run (default: 10000).")
+    parser.add_argument("--words", type=int, default=120, help="Words per text (default: 120).")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per variant; best is reported.")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument(
+        "--provider",
+        default=EMBEDDING_PROVIDER,
+        help="Embedding provider to measure (default: EMBEDDING_PROVIDER or 'hash').",
+    )
+    parser.add_argument("--batch-size", type=int, help="Override EMBEDDING_BATCH_SIZE.")
+    parser.add_argument("--workers", type=int, help="Override EMBEDDING_WORKERS.")
+    args = parser.parse_args()
+
+    overrides = {}
+    if args.batch_size:
+        overrides["batch_size"] = args.batch_size
+    if args.workers:
+        overrides["workers"] = args.workers
+    provider = create_provider(args.provider, **overrides)
+
+    texts = make_texts(args.count, args.words, args.seed)
+    print(
+        f"Embedding {args.count} texts of {args.words} words with '{provider.name}' "
+        f"(batch_size={provider.batch_size}, workers={provider.workers}, best of {args.repeat}):"
+    )
+    # Warm the worker pool (and model load) outside the timed runs.
+    provider.embed_many(texts[: provider.batch_size * 2])
+    single = timed(
+        "embed() per text", args.count, lambda: [provider.embed(t) for t in texts], args.repeat
+    )
+    batched = timed("embed_many()", args.count, lambda: provider.embed_many(texts), args.repeat)
+    print(f"  speed-up: {single / batched:.1f}x")
+    provider.close()
+
+    queries = texts[: min(args.count, 500)]
+    for query in queries:
+        embed_query(query)
+    timed(
+        "embed_query() cache hits",
+        len(queries),
+        lambda: [embed_query(q) for q in queries],
+        args.repeat,
+    )
+
+
+if __name__ == "__main__":
+    main()
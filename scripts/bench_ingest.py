@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Iterator, List
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from backend.embeddings import create_provider  # noqa: E402
+from backend.utils.pipeline import Pipeline  # noqa: E402
+from backend.utils.seed_loader import (  # noqa: E402
+    _batches,
+    _ParsedBatch,
+    available_cpus,
+    embed_batches,
+    report_stages,
+    slice_row,
+)
+from backend.utils.seed_reader import iter_seed_records  # noqa: E402
+
+
+def synthetic_payload(path: Path, count: int) -> None:
+    text = "يلتزم المؤجر بتسليم العقار المؤجر بحالة صالحة. The landlord shall return the deposit. "
+    with path.open("w", encoding="utf-8") as fh:
+        for index in range(count):
+            record = {
+                "id": f"bench#law-{index}",
+                "jurisdiction": {"level": "emirate", "name": "Dubai", "emirate": "Dubai"},
+                "source": {"portal": "Dubai Legislation Portal", "url": "https://dlp.dubai.gov.ae/law.pdf"},
+                "instrument": {
+                    "type": "Law",
+                    "number": str(index),
+                    "year": 2007,
+                    "title": "Law Regulating Relationship between Landlords and Tenants",
+                    "official_language": "Arabic",
+                },
+                "structure": {
+                    "granularity": "article",
+                    "path": f"Article {index}",
+                    "locators": {"article": str(index)},
+                },
+                "text_content": f"Article {index}. " + text * 10,
+                "text_hash": f"sha256:{index:064x}",
+                "primary_lang": "ar",
+                "effective": {"from_date": "2007-12-21"},
+                "versions": [{"version_id": "v1", "event": "enacted", "date": "2007-12-21"}],
+            }
+            fh.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+
+def run(payload: Path, batch_size: int, workers: int, queue_depth: int) -> Pipeline:
+    """The loader's parse and embed stages; the sink builds COPY rows but writes nothing."""
+    provider = create_provider(workers=workers)
+
+    def parse() -> Iterator[_ParsedBatch]:
+        read = 0
+        for batch in _batches(iter_seed_records(payload), batch_size):
+            read += len(batch)
+            yield _ParsedBatch(batch, read)
+
+    pipeline = Pipeline(
+        "parse", parse(), queue_depth=queue_depth, size=lambda batch: len(batch.records), sink_name="write"
+    ).add_stage(
+        "embed",
+        lambda batches: embed_batches(provider, batches),
+        size=lambda item: len(item[0].records),
+    )
+    try:
+        for batch, vectors in pipeline:
+            rows: List[tuple] = [slice_row(r, v) for r, v in zip(batch.records, vectors)]
+            del rows
+    finally:
+        provider.close()
+    return pipeline
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Measure seed ingest pipeline throughput per embedding worker count (no database)."
+    )
+    parser.add_argument("--records", type=int, default=20000, help="Synthetic slices (default: 20000).")
+    parser.add_argument("--payload", type=Path, help="Use an existing JSON / JSONL payload instead.")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--queue-depth", type=int, default=4)
+    parser.add_argument(
+        "--workers",
+        type=int,
+        nargs="+",
+        default=sorted({1, 2, available_cpus()}),
+        help="Embedding process counts to compare (default: 1, 2 and the CPUs this process may use).",
+    )
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        payload = args.payload
+        if payload is None:
+            payload = Path(tmp) / "payload.jsonl"
+            synthetic_payload(payload, args.records)
+        for workers in args.workers:
+            started = time.perf_counter()
+            pipeline = run(payload, args.batch_size, workers, args.queue_depth)
+            elapsed = time.perf_counter() - started
+            records = pipeline.metrics[-1].records
+            print(f"workers={workers}: {records} slices in {elapsed:.2f}s ({records / elapsed:,.0f}/s)")
+            report_stages(pipeline.metrics)
+
+
+if __name__ == "__main__":
+    main()
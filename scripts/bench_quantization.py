@@ -0,0 +1,189 @@
+from __future__ import annotations
+
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import List, Sequence
+
+import numpy as np
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from backend.db import PGVECTOR_DIM, VECTOR_RESCORE_FACTOR, vector_index_ddl  # noqa: E402
+
+
+def recall_at_k(expected: Sequence, actual: Sequence) -> float:
+    if not expected:
+        return 1.0
+    return len(set(expected) & set(actual)) / len(expected)
+
+
+def synthetic_matrix(count: int, dim: int, seed: int) -> np.ndarray:
+    """Clustered unit vectors; uniform noise would make every neighbour a tie."""
+    rng = np.random.default_rng(seed)
+    centres = rng.standard_normal((max(count // 50, 1), dim))
+    matrix = centres[rng.integers(len(centres), size=count)]
+    matrix += 0.35 * rng.standard_normal((count, dim))
+    matrix /= np.linalg.norm(matrix, axis=1, keepdims=True)
+    return matrix.astype(np.float32)
+
+
+def bench_in_memory(args: argparse.Namespace) -> None:
+    from backend.search import SliceCandidate, to_filters
+    from backend.vector_index import VectorIndex
+
+    matrix = synthetic_matrix(args.count, PGVECTOR_DIM, args.seed)
+    rng = np.random.default_rng(args.seed + 1)
+    queries = matrix[rng.integers(len(matrix), size=args.queries)]
+    queries = queries + 0.1 * rng.standard_normal(queries.shape).astype(np.float32)
+    candidates = [
+        SliceCandidate(*([f"slice-{index}"] + [None] * (len(SliceCandidate._fields) - 1)))
+        for index in range(len(matrix))
+    ]
+    dates = np.full(len(matrix), np.datetime64("2020-01-01"), dtype="datetime64[D]")
+    open_ended = np.full(len(matrix), np.datetime64("NaT"), dtype="datetime64[D]")
+    filters = to_filters()
+
+    print(
+        f"In-memory VectorIndex: {args.count} x {PGVECTOR_DIM} vectors, {args.queries} queries, "
+        f"k={args.k}, rescore factor {args.rescore_factor}"
+    )
+    print(
+        f"  {'storage':<9} {'resident MB':>12} {'build s':>9} {'query ms':>10} "
+        f"{'recall@k 1st':>13} {'recall@k':>9}"
+    )
+    truth: List[List[str]] = []
+    for quantization in ("none", "float16", "int8"):
+        started = time.perf_counter()
+        index = VectorIndex(
+            candidates,
+            matrix,
+            topics=[()] * len(matrix),
+            effective_from=dates,
+            effective_to=open_ended,
+            quantization=quantization,
+            rescore_factor=args.rescore_factor,
+        )
+        build = time.perf_counter() - started
+        resident = index.quantized if index.quantized is not None else index.matrix
+
+        timings, first_stage, final = [], [], []
+        rows = np.arange(len(matrix))
+        for position, query in enumerate(queries):
+            started = time.perf_counter()
+            results = [candidate.id for candidate, _ in index.search(query, filters, k=args.k)]
+            timings.append(time.perf_counter() - started)
+            if quantization == "none":
+                truth.append(results)
+            approx = index._distances(rows, query, quantized=True)
+            first = [candidates[i].id for i in np.argsort(approx, kind="stable")[: args.k]]
+            first_stage.append(recall_at_k(truth[position], first))
+            final.append(recall_at_k(truth[position], results))
+
+        print(
+            f"  {quantization:<9} {resident.nbytes / 2**20:>12.1f} {build:>9.3f} "
+            f"{statistics.median(timings) * 1000:>10.2f} "
+            f"{statistics.mean(first_stage):>13.3f} {statistics.mean(final):>9.3f}"
+        )
+
+
+def bench_pgvector(args: argparse.Namespace) -> None:
+    """Build each ANN index inside a transaction that is rolled back afterwards."""
+    from sqlalchemy import text
+
+    from backend.db import SessionLocal
+    from backend.search import apply_ann_settings, build_vector_statement, embed_query
+
+    with SessionLocal() as session:
+        titles = session.execute(
+            text(
+                "SELECT title || ' ' || path FROM legal_slice "
+                "WHERE vector_embedding IS NOT NULL ORDER BY random() LIMIT :n"
+            ),
+            {"n": args.queries},
+        ).scalars().all()
+    if not titles:
+        print("\033[91m❌ legal_slice has no embeddings; seed the database first.\033[0m")
+        return
+    vectors = [embed_query(title).tolist() for title in titles]
+
+    print(
+        f"pgvector HNSW on legal_slice: {len(vectors)} queries, k={args.k}, "
+        f"rescore factor {args.rescore_factor}"
+    )
+    print(f"  {'storage':<9} {'index MB':>10} {'build s':>9} {'query ms':>10} {'recall@k':>9}")
+    for storage in ("vector", "halfvec"):
+        with SessionLocal() as session:
+            # Drop the live ANN indexes inside the transaction so the planner can
+            # only use the one being measured; the rollback restores them.
+            live = session.execute(
+                text(
+                    "SELECT indexname FROM pg_indexes WHERE tablename = 'legal_slice' "
+                    "AND indexname LIKE 'idx\\_vector\\_embedding\\_%'"
+                )
+            ).scalars().all()
+            for live_index in live:
+                session.execute(text(f"DROP INDEX IF EXISTS {live_index}"))
+            ddl = vector_index_ddl(index="hnsw", storage=storage).replace(
+                "idx_vector_embedding", "bench_vector_embedding"
+            )
+            name = ddl.split()[5]
+            started = time.perf_counter()
+            session.execute(text(ddl))
+            build = time.perf_counter() - started
+            size = session.execute(
+                text("SELECT pg_relation_size(CAST(:name AS regclass))"), {"name": name}
+            ).scalar_one()
+
+            timings, recalls = [], []
+            for vector in vectors:
+                session.execute(text("SET LOCAL enable_indexscan = off"))
+                exact = build_vector_statement(vector, [], args.k, storage="vector")
+                expected = [row.id for row in session.execute(exact)]
+                session.execute(text("SET LOCAL enable_indexscan = on"))
+                apply_ann_settings(session, ef_search=args.ef_search)
+                stmt = build_vector_statement(
+                    vector, [], args.k, storage=storage, rescore_factor=args.rescore_factor
+                )
+                started = time.perf_counter()
+                actual = [row.id for row in session.execute(stmt)]
+                timings.append(time.perf_counter() - started)
+                recalls.append(recall_at_k(expected, actual))
+            session.rollback()
+
+        print(
+            f"  {storage:<9} {size / 2**20:>10.1f} {build:>9.2f} "
+            f"{statistics.median(timings) * 1000:>10.2f} {statistics.mean(recalls):>9.3f}"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Measure size, build time and recall@k of quantized vs float32 vector search."
+    )
+    parser.add_argument(
+        "--pgvector",
+        action="store_true",
+        help="Benchmark HNSW vector vs halfvec indexes on the configured database "
+        "(takes an exclusive lock on legal_slice; use a development database).",
+    )
+    parser.add_argument("--count", type=int, default=50_000, help="Synthetic vectors (default: 50000).")
+    parser.add_argument("--queries", type=int, default=100, help="Queries per variant (default: 100).")
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--rescore-factor", type=int, default=VECTOR_RESCORE_FACTOR)
+    parser.add_argument("--ef-search", type=int, default=None, help="hnsw.ef_search for --pgvector.")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    if args.pgvector:
+        bench_pgvector(args)
+    else:
+        bench_in_memory(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Callable, List
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from sqlalchemy import text  # noqa: E402
+
+from backend.db import SessionLocal  # noqa: E402
+from backend.rag import RESULT_CACHE, run_search, run_search_batch  # noqa: E402
+from backend.schema import SearchRequest  # noqa: E402
+
+
+def sample_queries(count: int, seed: int) -> List[str]:
+    """Two- to four-word queries drawn from indexed titles, all distinct."""
+    with SessionLocal() as session:
+        titles = session.execute(text("SELECT DISTINCT title FROM legal_slice")).scalars().all()
+    words = sorted({word.lower() for title in titles for word in title.split() if len(word) > 3})
+    if not words:
+        raise SystemExit("\033[91m❌ legal_slice is empty; seed the database first.\033[0m")
+    rng = random.Random(seed)
+    queries = set()
+    while len(queries) < count:
+        queries.add(" ".join(rng.sample(words, k=min(len(words), rng.randint(2, 4)))))
+    return sorted(queries)
+
+
+def timed(label: str, count: int, fn: Callable[[], object]) -> float:
+    RESULT_CACHE.clear()  # every variant starts cold
+    started = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - started
+    print(f"  {label:<34} {elapsed:>8.2f} s   {count / elapsed:>8.1f} searches/s")
+    return elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Compare N single /search calls with /search/batch on the configured database."
+    )
+    parser.add_argument("--count", type=int, default=500, help="Distinct queries (default: 500).")
+    parser.add_argument("--batch-size", type=int, default=100, help="Requests per batch (max 256).")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument(
+        "--url",
+        help="Benchmark a running API over HTTP (e.g. http://localhost:8000) instead of in-process.",
+    )
+    args = parser.parse_args()
+
+    queries = sample_queries(args.count, args.seed)
+    requests = [SearchRequest(query=query) for query in queries]
+    chunks = [requests[i : i + args.batch_size] for i in range(0, len(requests), args.batch_size)]
+    print(f"{len(requests)} searches, batches of {args.batch_size}:")
+
+    if args.url:
+        import httpx
+
+        with httpx.Client(base_url=args.url, timeout=120) as client:
+
+            def singles() -> None:
+                for request in requests:
+                    client.post("/search", json=request.dict(exclude_none=True)).raise_for_status()
+
+            def batches() -> None:
+                for chunk in chunks:
+                    body = {"requests": [request.dict(exclude_none=True) for request in chunk]}
+                    client.post("/search/batch", json=body).raise_for_status()
+
+            # The server's own result cache is warm for the second variant, so
+            # query it with a different seed or restart it between runs.
+            single = timed("POST /search x N", len(requests), singles)
+            batched = timed("POST /search/batch", len(requests), batches)
+    else:
+        with SessionLocal() as session:
+            single = timed(
+                "run_search x N", len(requests), lambda: [run_search(session, r) for r in requests]
+            )
+            batched = timed(
+                "run_search_batch",
+                len(requests),
+                lambda: [run_search_batch(session, chunk) for chunk in chunks],
+            )
+    print(f"  speed-up: {single / batched:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+import argparse
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict, List
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from sqlalchemy import create_engine, text  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+
+from backend import search  # noqa: E402
+from backend.db import DB_PREPARE_THRESHOLD, DB_URL, SessionLocal, engine_options  # noqa: E402
+
+TEMPLATES = (search._vector_template, search._keyword_template, search._phrase_template)
+RANKERS: Dict[str, Callable] = {
+    "phrase": search.phrase_search,
+    "vector": search.vector_search,
+    "keyword": search.keyword_search,
+}
+
+
+def sample_queries(count: int, seed: int) -> List[str]:
+    with SessionLocal() as session:
+        titles = session.execute(text("SELECT DISTINCT title FROM legal_slice")).scalars().all()
+    words = sorted({word.lower() for title in titles for word in title.split() if len(word) > 3})
+    if not words:
+        raise SystemExit("\033[91m❌ legal_slice is empty; seed the database first.\033[0m")
+    rng = random.Random(seed)
+    return [" ".join(rng.sample(words, k=min(len(words), 2))) for _ in range(count)]
+
+
+def clear_templates() -> None:
+    for template in TEMPLATES:
+        template.cache_clear()
+
+
+def bench_build(queries: List[str]) -> None:
+    """Python-side cost per call: statement construction plus SQLAlchemy cache key."""
+    filters = search.to_filters(jurisdiction="Dubai")
+    shape, _ = search._filter_params(filters)
+    print("Statement build + cache key per call (no database):")
+    for name, build in (
+        ("vector", lambda query: search._vector_template(shape, search.PGVECTOR_STORAGE)),
+        ("phrase", lambda query: search._phrase_template(shape)),
+        (
+            "keyword",
+            lambda query: search._keyword_template(
+                shape,
+                tuple(
+                    tuple(len(term.split()) > 1 for term in group)
+                    for group in search.analyze_query(query).term_groups
+                ),
+            ),
+        ),
+    ):
+        timings = {}
+        for variant in ("rebuilt", "template"):
+            started = time.perf_counter()
+            for query in queries:
+                if variant == "rebuilt":
+                    clear_templates()
+                build(query)._generate_cache_key()
+            timings[variant] = (time.perf_counter() - started) / len(queries) * 1e6
+        print(
+            f"  {name:<8} rebuilt {timings['rebuilt']:>8.1f} µs   "
+            f"template {timings['template']:>8.1f} µs"
+        )
+
+
+def bench_database(queries: List[str], rounds: int) -> None:
+    """End-to-end ranker latency with and without templates and server-side prepare."""
+    filters = search.to_filters()
+    threshold = DB_PREPARE_THRESHOLD if DB_PREPARE_THRESHOLD is not None else 0
+    print(f"Ranker latency on the configured database ({len(queries)} queries x {rounds} rounds):")
+    print(f"  {'stage':<8} {'prepare':<10} {'statements':<10} {'median ms':>10} {'mean ms':>9}")
+    for prepare in (None, threshold):
+        bench_engine = create_engine(DB_URL, future=True, **engine_options(prepare_threshold=prepare))
+        for name, ranker in RANKERS.items():
+            for variant in ("rebuilt", "template"):
+                timings = []
+                with Session(bind=bench_engine) as session:
+                    for _ in range(rounds):
+                        for query in queries:
+                            if variant == "rebuilt":
+                                clear_templates()
+                            started = time.perf_counter()
+                            ranker(session, query, filters)
+                            timings.append(time.perf_counter() - started)
+                print(
+                    f"  {name:<8} {str(prepare):<10} {variant:<10} "
+                    f"{statistics.median(timings) * 1000:>10.3f} "
+                    f"{statistics.mean(timings) * 1000:>9.3f}"
+                )
+        bench_engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Measure statement-template reuse and psycopg prepared statements for search SQL."
+    )
+    parser.add_argument("--queries", type=int, default=200, help="Queries per variant (default: 200).")
+    parser.add_argument("--rounds", type=int, default=3, help="Passes over the queries (default: 3).")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument(
+        "--no-db", action="store_true", help="Only measure statement construction (no database needed)."
+    )
+    args = parser.parse_args()
+
+    if args.no_db:
+        rng = random.Random(args.seed)
+        words = ["tenancy", "deposit", "labour", "permit", "dubai", "real estate", "register", "fees"]
+        queries = [" ".join(rng.sample(words, k=2)) for _ in range(args.queries)]
+        bench_build(queries)
+        return
+
+    queries = sample_queries(args.queries, args.seed)
+    bench_build(queries)
+    bench_database(queries, args.rounds)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,190 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import inspect
+import json
+import statistics
+import sys
+import time
+from datetime import date
+from functools import lru_cache
+from pathlib import Path
+from typing import Awaitable, Callable, List
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from fastapi.responses import JSONResponse  # noqa: E402
+from fastapi.routing import serialize_response  # noqa: E402
+from fastapi.utils import create_response_field  # noqa: E402
+
+from backend import serialization  # noqa: E402
+from backend.main import orm_to_schema  # noqa: E402
+from backend.models import LegalSlice as LegalSliceModel  # noqa: E402
+from backend.models import LegalSliceVersion as LegalSliceVersionModel  # noqa: E402
+from backend.rag import build_citation  # noqa: E402
+from backend.schema import Citation, LegalSlice, SearchResponse, StructureLocators  # noqa: E402
+from backend.search import SliceCandidate  # noqa: E402
+from backend.utils.text_clean import build_snippet  # noqa: E402
+
+
+def synthetic_records(count: int) -> List[LegalSliceModel]:
+    text = "يلتزم المؤجر بتسليم العقار المؤجر بحالة صالحة. The landlord shall return the deposit. " * 12
+    return [
+        LegalSliceModel(
+            id=f"dubai#law-{index}#art-{index % 40}",
+            level="emirate",
+            name="Dubai",
+            emirate="Dubai",
+            portal="Dubai Legislation Portal",
+            url=f"https://dlp.dubai.gov.ae/Legislation/{index}.pdf",
+            gazette="324",
+            type="Law",
+            number=str(index),
+            year=2007,
+            title=f"Law No. ({index}) of 2007 Regulating Relationship between Landlords and Tenants",
+            official_language="Arabic",
+            granularity="article",
+            path=f"Chapter 2 / Article {index % 40}",
+            chapter="2",
+            article=str(index % 40),
+            text_content=text,
+            text_hash=f"sha256:{index:064x}",
+            primary_lang="ar",
+            topics=["real_estate", "tenancy"],
+            state="in_force",
+            effective_from=date(2007, 12, 21),
+            versions=[
+                LegalSliceVersionModel(version_id="v1", event="enacted", event_date=date(2007, 12, 21)),
+                LegalSliceVersionModel(version_id="v2", event="amended", event_date=date(2008, 6, 1)),
+            ],
+        )
+        for index in range(count)
+    ]
+
+
+def candidate_of(record: LegalSliceModel) -> SliceCandidate:
+    values = {field: getattr(record, field, None) for field in SliceCandidate._fields}
+    values["snippet"] = build_snippet(record.text_content)
+    return SliceCandidate(**values)
+
+
+def validated_citation(candidate: SliceCandidate) -> Citation:
+    """``rag.build_citation`` as it was: two validated models per hit."""
+    fast = build_citation(candidate)
+    return Citation(
+        **{**fast.__dict__, "structure_locators": StructureLocators(**fast.structure_locators.__dict__)}
+    )
+
+
+@lru_cache(maxsize=None)
+def response_field(model):
+    # FastAPI builds this once per route at startup.
+    return create_response_field(name="response", type_=model)
+
+
+async def fastapi_render(model, content) -> bytes:
+    field = response_field(model)
+    encoded = await serialize_response(field=field, response_content=content)
+    return JSONResponse(encoded).body
+
+
+def stdlib_dumps(content) -> bytes:
+    return json.dumps(
+        content, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")
+    ).encode("utf-8")
+
+
+def measure(label: str, repeat: int, fn: Callable[[], Awaitable[object]], per: int) -> None:
+    """Median time of ``fn`` run on one event loop (FastAPI serializes in async code)."""
+
+    async def run() -> List[float]:
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            await fn()
+            timings.append(time.perf_counter() - started)
+        return timings
+
+    timings = asyncio.run(run())
+    per_1k = statistics.median(timings) / per * 1000 * 1000
+    print(f"  {label:<44} {per_1k:>9.2f} ms / 1k records")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Compare pydantic response_model serialization with the orjson fast path."
+    )
+    parser.add_argument("--records", type=int, default=1000, help="Records per run (default: 1000).")
+    parser.add_argument("--page-size", type=int, default=8, help="Citations per /search page (default: 8).")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    records = synthetic_records(args.records)
+    candidates = [candidate_of(record) for record in records]
+    pages = [candidates[i : i + args.page_size] for i in range(0, len(candidates), args.page_size)]
+    print(f"orjson {'available' if serialization.orjson is not None else 'missing (stdlib fallback)'}")
+
+    # Every variant must produce the bytes FastAPI sends today.
+    for record in records[:20]:
+        expected = asyncio.run(fastapi_render(LegalSlice, orm_to_schema(record)))
+        assert serialization.dumps(serialization.legal_slice_payload(record)) == expected
+        assert stdlib_dumps(serialization.legal_slice_payload(record)) == expected
+
+    def each(items, render) -> Callable[[], Awaitable[object]]:
+        async def run() -> List[bytes]:
+            rendered = []
+            for item in items:
+                body = render(item)
+                rendered.append(await body if inspect.isawaitable(body) else body)
+            return rendered
+
+        return run
+
+    print("/get_by_id (LegalSlice):")
+    measure(
+        "orm_to_schema + response_model + JSONResponse",
+        args.repeat,
+        each(records, lambda record: fastapi_render(LegalSlice, orm_to_schema(record))),
+        len(records),
+    )
+    measure(
+        "legal_slice_payload + stdlib json",
+        args.repeat,
+        each(records, lambda record: stdlib_dumps(serialization.legal_slice_payload(record))),
+        len(records),
+    )
+    measure(
+        "legal_slice_payload + dumps",
+        args.repeat,
+        each(records, lambda record: serialization.dumps(serialization.legal_slice_payload(record))),
+        len(records),
+    )
+
+    print(f"/search (SearchResponse, {args.page_size} citations per page):")
+
+    def page_response(build, page) -> SearchResponse:
+        return SearchResponse.construct(query="tenancy deposit", items=[build(c) for c in page])
+
+    measure(
+        "validated citations + response_model",
+        args.repeat,
+        each(pages, lambda page: fastapi_render(SearchResponse, page_response(validated_citation, page))),
+        len(records),
+    )
+    measure(
+        "constructed citations + payload + dumps",
+        args.repeat,
+        each(
+            pages,
+            lambda page: serialization.dumps(
+                serialization.search_response_payload(page_response(build_citation, page))
+            ),
+        ),
+        len(records),
+    )
+
+if __name__ == "__main__":
+    main()